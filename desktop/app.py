@@ -5,6 +5,7 @@ This script starts the Flask application in a background thread and
 creates a native desktop window using the system's WebView.
 """
 import webview
+import multiprocessing
 import threading
 import time
 import sys
@@ -181,6 +182,10 @@ def main() -> None:
     4. Create PyWebView window
     5. Start PyWebView event loop
     """
+    # In the PyInstaller build, MIB upload worker processes start this executable
+    # again; freeze_support() runs the worker and exits instead of opening the app
+    multiprocessing.freeze_support()
+
     # Find available port dynamically
     logger.info('Finding available port...')
     try:
@@ -111,6 +111,40 @@ def get_mib_data(mib_name):
         }), 500
 
 
+@api_bp.route('/mibs/<mib_name>/nodes/<node_name>', methods=['GET'])
+def get_mib_node(mib_name, node_name):
+    """
+    Get a single node of a specific MIB.
+
+    Path Parameters:
+        - mib_name: Name of the MIB
+        - node_name: Name of the node
+
+    Returns:
+        JSON object with node data
+    """
+    try:
+        data = mib_service.get_mib_node(mib_name, node_name)
+
+        if data is None:
+            return jsonify({
+                'success': False,
+                'error': f'Node "{node_name}" not found in MIB "{mib_name}"'
+            }), 404
+
+        return jsonify({
+            'success': True,
+            'data': data
+        })
+
+    except Exception as e:
+        logger.error(f"Error getting node {node_name} of {mib_name}: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
 @api_bp.route('/mibs/<mib_name>/tree', methods=['GET'])
 def get_mib_tree(mib_name):
     """
@@ -189,6 +223,8 @@ def search_nodes():
         - mib: Limit search to specific MIB (optional)
         - limit: Maximum number of results (default: 50)
         - match_type: Filter by match type ('name', 'oid', 'description', 'all')
+        - case_sensitive: Match the query's case exactly (default: false)
+        - oid_subtree: Return the nodes at and below the OID given in q (default: false)
 
     Returns:
         JSON array of search results
@@ -204,8 +240,13 @@ def search_nodes():
         mib_name = request.args.get('mib')
         limit = int(request.args.get('limit', 50))
         match_type = request.args.get('match_type', 'all').lower()
+        case_sensitive = request.args.get('case_sensitive', 'false').lower() == 'true'
+        oid_subtree = request.args.get('oid_subtree', 'false').lower() == 'true'
 
-        results = mib_service.search_nodes(query, mib_name)
+        # Without a match type filter the search can stop at the limit
+        results = mib_service.search_nodes(query, mib_name, case_sensitive=case_sensitive,
+                                           oid_subtree=oid_subtree,
+                                           limit=limit if match_type == 'all' and limit >= 0 else None)
 
         # Filter by match type if specified
         if match_type != 'all':
@@ -134,7 +134,11 @@ def handle_file_upload(device_service):
                 current_app.logger.error(f"Error: success_count is not int: {success_count} (type: {type(success_count)})")
                 success_count = 0
 
-            device_service.update_device_metadata(device_name, success_count)
+            if action == 'replace' and result.get('success') is False:
+                # Nothing was replaced; the device keeps its MIBs and their count
+                device_service.update_device_metadata(device_name)
+            else:
+                device_service.update_device_metadata(device_name, success_count)
 
             # Set current device to the one we just uploaded to
             current_app.logger.info(f"Debug: Setting current device to {device_name}")
@@ -5,6 +5,9 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, asdict
 
+# Subdirectories created for every device
+DEVICE_SUBDIRS = ("compiled_mibs", "mibs_for_pysmi", "output")
+
 
 @dataclass
 class DeviceInfo:
@@ -111,11 +114,10 @@ class DeviceService:
             return False
 
         # Create device directories using user-friendly name
+        # (parents=True creates the device directory itself on the first pass)
         device_dir = self.devices_dir / device_name
-        device_dir.mkdir(parents=True, exist_ok=True)
-        (device_dir / "compiled_mibs").mkdir(exist_ok=True)
-        (device_dir / "mibs_for_pysmi").mkdir(exist_ok=True)
-        (device_dir / "output").mkdir(exist_ok=True)
+        for subdir in DEVICE_SUBDIRS:
+            (device_dir / subdir).mkdir(parents=True, exist_ok=True)
 
         # Add to registry
         if display_name is None:
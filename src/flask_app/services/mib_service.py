@@ -2,20 +2,607 @@
 Service layer for MIB data handling.
 """
 
+import bisect
+import functools
+import hashlib
+import itertools
 import json
+import mmap
+import multiprocessing
+import operator
 import os
+import re
+import shutil
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Tuple, Union
 import logging
 from datetime import datetime
 
+from src.mib_parser.serializer import json_loads, write_bytes
+
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=256)
+def _load_json_cached(path_str: str, mtime_ns: int, size: int) -> Any:
+    """
+    Load a JSON file, memoized process-wide.
+
+    The file's mtime and size are part of the key, so a rewritten file misses
+    the cache and is parsed again. The parsed object is shared between all
+    MibService instances and must be treated as read-only by callers.
+    """
+    with open(path_str, 'rb') as f:
+        return json_loads(f.read())
+
+
+# Syntax fixes applied by MibService._fix_mib_syntax, compiled once.
+# They operate on raw file bytes so MIB files are never decoded.
+_MAX_MIB_LINE_LENGTH = 1000
+_PROBLEM_IDENTIFIER = b'corrErrAftFecAver15m'
+_OBJECT_TYPE_SYNTAX_RE = re.compile(rb'OBJECT-TYPE\s*\n\s*SYNTAX\s*\n\s*([A-Za-z-0-9]+)')
+_OID_ASSIGNMENT_RE = re.compile(rb'OBJECT\s+IDENTIFIER\s*::=\s*{([^}]*)}([^\n]*)(?=\n|$)')
+_END_RE = re.compile(rb'\s*END\s*$')
+_EMPTY_IMPORTS_RE = re.compile(rb'IMPORTS\s*$')
+_INTEGER_SPACING_RE = re.compile(rb'(\w+)\s+INTEGER')
+
+# Name fragments marking auxiliary output files (_oids.json, all_mibs.json, ...)
+_AUXILIARY_MARKERS = ('_oids', '_tree', 'all_', 'statistics')
+
+
+def _iter_json_entries(dirpath: Path) -> Iterator[os.DirEntry]:
+    """Yield directory entries for the *.json files directly inside dirpath."""
+    try:
+        with os.scandir(dirpath) as it:
+            for entry in it:
+                if entry.name.endswith('.json') and entry.is_file():
+                    yield entry
+    except FileNotFoundError:
+        return
+
+
+def _unlink_files(dirpath: Path, suffix: Union[str, Tuple[str, ...]] = '') -> None:
+    """Delete the regular files directly inside dirpath whose names end with suffix."""
+    with os.scandir(dirpath) as it:
+        for entry in it:
+            if entry.name.endswith(suffix) and entry.is_file():
+                os.unlink(entry.path)
+
+
+def _move_files(source_dir: Path, target_dir: Path) -> None:
+    """Move the regular files directly inside source_dir into target_dir."""
+    with os.scandir(source_dir) as it:
+        for entry in it:
+            if entry.is_file():
+                os.replace(entry.path, target_dir / entry.name)
+
+
+def _as_path(value) -> Path:
+    """Return value as a concrete Path, reusing it when it already is one."""
+    return value if isinstance(value, Path) else Path(value)
+
+
+def _read_json_file(json_file: Path) -> Any:
+    """Load a JSON file through the process-wide cache."""
+    stat = os.stat(json_file)
+    return _load_json_cached(os.fspath(json_file), stat.st_mtime_ns, stat.st_size)
+
+
+def _load_json_entry(entry: os.DirEntry) -> Any:
+    """Load a scanned JSON file through the process-wide cache, None on error."""
+    try:
+        stat = entry.stat()
+        return _load_json_cached(entry.path, stat.st_mtime_ns, stat.st_size)
+    except Exception as e:
+        logger.warning(f"Could not load {entry.path}: {e}")
+        return None
+
+
+# Sidecar in each output directory mapping every MIB's OIDs to node names
+_OID_MAP_FILE = '_oids.json'
+# Serializes read-merge-replace updates of the sidecars across threads
+_OID_SIDECAR_LOCK = threading.Lock()
+
+
+def _first_oids(pairs: Iterable[Tuple[str, Any]]) -> Dict[str, str]:
+    """Map each OID to the first node name carrying it, from (node_name, oid) pairs."""
+    oids = {}
+    for node_name, oid in pairs:
+        if oid is not None:
+            oids.setdefault(oid, node_name)
+    return oids
+
+
+def _read_oid_sidecar(dirpath: Path) -> Dict[str, Any]:
+    """Return the per-MIB entries of the _oids.json sidecar in dirpath, {} if unavailable."""
+    try:
+        return _read_json_file(dirpath / _OID_MAP_FILE).get('mibs', {})
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f"Could not read {dirpath / _OID_MAP_FILE}: {e}")
+        return {}
+
+
+def _write_oid_sidecar(dirpath: Path, entries: Dict[str, Any]) -> None:
+    """
+    Merge per-MIB OID maps into the _oids.json sidecar in dirpath, replacing it atomically.
+
+    The read, merge and replace run under _OID_SIDECAR_LOCK, so concurrent
+    uploads into the same directory do not drop each other's entries.
+    """
+    with _OID_SIDECAR_LOCK:
+        mibs = dict(_read_oid_sidecar(dirpath))
+        mibs.update(entries)
+        write_bytes(dirpath / _OID_MAP_FILE, json.dumps({'mibs': mibs}, ensure_ascii=False).encode('utf-8'))
+
+
+# Parser reused by _parse_mib_worker within one worker process, keyed by its settings
+_worker_parser = None
+_worker_parser_key = None
+
+
+def _parse_mib_worker(mib_sources: List[str], device_type: str, file_path: str) -> Tuple[Any, float, Optional[str]]:
+    """
+    Parse one MIB file in a worker process for MibService.add_uploaded_files.
+
+    Errors are returned as strings because pysmi exceptions do not always
+    survive pickling back to the parent process.
+
+    Returns:
+        (MibData or None, parse time in seconds, error message or None)
+    """
+    global _worker_parser, _worker_parser_key
+    from src.mib_parser.parser import MibParser
+
+    key = (tuple(mib_sources), device_type)
+    start_time = time.time()
+    try:
+        if _worker_parser is None or _worker_parser_key != key:
+            _worker_parser = MibParser(mib_sources=mib_sources, debug_mode=True,
+                                       resolve_dependencies=True, device_type=device_type)
+            _worker_parser_key = key
+        result = _worker_parser.parse_file(file_path)
+        return result, time.time() - start_time, None
+    except Exception as e:
+        return None, time.time() - start_time, str(e)
+
+
+# Returned by _read_indexed_node when the node index cannot be used
+_NO_INDEX = object()
+
+
+def _read_indexed_node(json_file: Path, node_name: str) -> Any:
+    """
+    Read a single node through the ``.idx`` sidecar written next to a MIB JSON.
+
+    Only the node's byte span is sliced out of a memory map and parsed. The
+    index records the size and mtime of the JSON it describes, so a stale or
+    missing index yields _NO_INDEX and the caller falls back to a full load.
+    """
+    idx_file = json_file.with_suffix('.idx')
+    try:
+        idx_stat = os.stat(idx_file)
+    except FileNotFoundError:
+        return _NO_INDEX
+
+    stat = os.stat(json_file)
+    index = _load_json_cached(os.fspath(idx_file), idx_stat.st_mtime_ns, idx_stat.st_size)
+    if index.get('source_size') != stat.st_size or index.get('source_mtime_ns') != stat.st_mtime_ns:
+        return _NO_INDEX
+
+    span = index.get('nodes', {}).get(node_name)
+    if span is None:
+        return None
+
+    offset, length = span
+    with open(json_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return json_loads(mm[offset:offset + length])
+
+
+def _read_index_header(json_path: str, stat: os.stat_result) -> Optional[Dict[str, Any]]:
+    """
+    Return the listing header stored in a JSON file's .idx sidecar.
+
+    The header carries the description and node and import counts, so a MIB
+    can be listed without parsing its nodes. Returns None when the sidecar
+    is missing, unreadable, predates headers or describes another version of
+    the file.
+    """
+    idx_path = os.path.splitext(json_path)[0] + '.idx'
+    try:
+        idx_stat = os.stat(idx_path)
+        index = _load_json_cached(idx_path, idx_stat.st_mtime_ns, idx_stat.st_size)
+    except Exception:
+        return None
+
+    if index.get('source_size') != stat.st_size or index.get('source_mtime_ns') != stat.st_mtime_ns:
+        return None
+    return index.get('header')
+
+
+def _mib_header(mib_data: Any) -> Optional[Dict[str, Any]]:
+    """Build the listing header of parsed MIB data, None if it is unusable."""
+    if not mib_data:
+        return None
+    return {
+        'description': mib_data.get('description'),
+        'nodes_count': len(mib_data.get('nodes', {})),
+        'imports_count': len(mib_data.get('imports', []))
+    }
+
+
+class _LRUCache(OrderedDict):
+    """Dict-like cache that drops the least recently used entry beyond maxsize."""
+
+    def __init__(self, maxsize: int):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+
+    def get(self, key, default=None):
+        # A single lookup, so an entry evicted in between cannot raise KeyError
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
+class _SharedCache(_LRUCache):
+    """Thread-safe _LRUCache for caches used by several threads at once."""
+
+    def __init__(self, maxsize: int):
+        super().__init__(maxsize)
+        self._lock = threading.RLock()
+
+    def __getitem__(self, key):
+        with self._lock:
+            return super().__getitem__(key)
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            super().__setitem__(key, value)
+
+    def get(self, key, default=None):
+        with self._lock:
+            return super().get(key, default)
+
+    def pop(self, key, *default):
+        with self._lock:
+            return super().pop(key, *default)
+
+    def clear(self):
+        with self._lock:
+            super().clear()
+
+    def evict(self, predicate) -> None:
+        """Remove every entry whose value satisfies predicate."""
+        with self._lock:
+            for key in [key for key, value in self.items() if predicate(value)]:
+                super().pop(key, None)
+
+
+@dataclass
+class MibSummary:
+    """Metadata of one MIB file, as listed by MibService.list_mibs()."""
+
+    # Declared by hand rather than with slots=True, which needs Python 3.10
+    __slots__ = ('name', 'filename', 'file_path', 'size', 'last_modified',
+                 'description', 'nodes_count', 'imports_count')
+
+    name: str
+    filename: str
+    file_path: str
+    size: int
+    last_modified: str
+    description: Optional[str]
+    nodes_count: Optional[int]
+    imports_count: Optional[int]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the summary as a JSON-serializable dictionary."""
+        return {field: getattr(self, field) for field in self.__slots__}
+
+
+# Dotted-decimal OID accepted by search_nodes(oid_subtree=True)
+_OID_QUERY_RE = re.compile(r'\d+(?:\.\d+)*')
+
+
+# Indexes derived from MIB JSON files, shared by all MibService instances. The
+# routes create a MibService per request, so per-instance caches would be rebuilt
+# on every request. Entries are validated against the file they came from.
+# (json path, listing base) -> (mtime_ns, size, MibSummary)
+_SUMMARIES = _SharedCache(1024)
+# (json path, mtime_ns, size) -> (mib_name, _NodeSearchIndex)
+_SEARCH_INDEXES = _SharedCache(256)
+# json path -> (mib_name, mtime_ns, size, {oid: node_name})
+_OID_MAPS = _SharedCache(1024)
+# directory fingerprint -> get_statistics result
+_STATISTICS = _SharedCache(64)
+
+
+def _trigrams(text: str) -> set:
+    """Return the set of three-character substrings of text."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+# Search indexes being built in the background: (json path, mtime_ns, size) -> Future
+_PENDING_INDEXES: Dict[Tuple[str, int, int], Any] = {}
+_PENDING_INDEXES_LOCK = threading.Lock()
+# Single worker building search indexes, created on first use
+_index_builder: Optional[ThreadPoolExecutor] = None
+# Bumped when the shared caches are cleared; builds started earlier are discarded
+_index_generation = 0
+
+
+def _schedule_search_index(key: Tuple[str, int, int], mib_name: str, nodes: Dict[str, Any]) -> None:
+    """Build the search index of a MIB file on the background worker, once per key."""
+    global _index_builder
+    with _PENDING_INDEXES_LOCK:
+        if key in _PENDING_INDEXES or _SEARCH_INDEXES.get(key) is not None:
+            return
+        if _index_builder is None:
+            _index_builder = ThreadPoolExecutor(max_workers=1, thread_name_prefix='mib-search-index')
+        _PENDING_INDEXES[key] = _index_builder.submit(
+            _build_search_index, key, mib_name, nodes, _index_generation
+        )
+
+
+def _build_search_index(key: Tuple[str, int, int], mib_name: str, nodes: Dict[str, Any],
+                        generation: int) -> None:
+    """Index the nodes of a MIB file and publish the index in _SEARCH_INDEXES."""
+    try:
+        index = _NodeSearchIndex(nodes)
+    except Exception as e:
+        logger.warning(f"Error indexing {mib_name} for search: {e}")
+        index = None
+
+    with _PENDING_INDEXES_LOCK:
+        # A clear_cache() during the build may have been meant to drop this file's data
+        if index is not None and generation == _index_generation:
+            _SEARCH_INDEXES[key] = (mib_name, index)
+        _PENDING_INDEXES.pop(key, None)
+
+
+def _discard_pending_search_indexes() -> None:
+    """Keep the search index builds in progress from publishing their result."""
+    global _index_generation
+    with _PENDING_INDEXES_LOCK:
+        _index_generation += 1
+
+
+def _clear_shared_caches() -> None:
+    """Empty every cache shared by the MibService instances of this process."""
+    _discard_pending_search_indexes()
+    for shared in (_SUMMARIES, _SEARCH_INDEXES, _OID_MAPS, _STATISTICS):
+        shared.clear()
+    _load_json_cached.cache_clear()
+
+
+class _NodeSearchIndex:
+    """
+    Trigram index over the searchable text of one MIB's nodes.
+
+    Every substring of length three or more shares all of its trigrams with
+    the text containing it, so intersecting the postings of the query's
+    trigrams yields a small candidate set. Candidates are then confirmed with
+    a plain substring test, keeping the results identical to a linear scan.
+
+    The name, OID and description of each node are lowercased once when the
+    index is built, so queries never case-fold node fields.
+    """
+
+    # Match types in the order search_nodes reports them
+    MATCH_TYPES = ('name', 'oid', 'description')
+    # Joins the lowercased texts into one corpus; queries containing it are never scanned
+    SEPARATOR = '\0'
+    # Scan the corpus when the rarest query trigram occurs in over 1/SCAN_RATIO of the nodes
+    SCAN_RATIO = 4
+
+    def __init__(self, nodes: Dict[str, Any]):
+        self.entries = []
+        self.grams: Dict[str, List[int]] = {}
+        # Offset of each entry's text in the corpus
+        self.starts: List[int] = []
+        offset = 0
+        for node_name, node_data in nodes.items():
+            fields_lower = tuple(field.lower() for field in self._fields(node_name, node_data))
+            text = ' '.join(fields_lower)
+            position = len(self.entries)
+            self.entries.append((node_name, node_data, text, fields_lower))
+            self.starts.append(offset)
+            offset += len(text) + len(self.SEPARATOR)
+            for gram in _trigrams(text):
+                self.grams.setdefault(gram, []).append(position)
+        self.corpus = self.SEPARATOR.join(entry[2] for entry in self.entries)
+        # Sorted (oid, position) pairs, built on the first subtree query
+        self._oid_order: Optional[List[Tuple[str, int]]] = None
+
+    @staticmethod
+    def _fields(node_name: str, node_data: Dict[str, Any]) -> Tuple[str, str, str]:
+        """Return the searchable name, OID and description strings of a node."""
+        return str(node_name), str(node_data.get('oid', '')), str(node_data.get('description', ''))
+
+    @classmethod
+    def scan(cls, nodes: Dict[str, Any], query: str,
+             case_sensitive: bool = False) -> Iterator[Tuple[str, Dict[str, Any], str]]:
+        """
+        Find the nodes matching query without an index, with the same results as search().
+
+        Yields:
+            (node_name, node_data, match_type) tuples in node order
+        """
+        needle = query if case_sensitive else query.lower()
+        for node_name, node_data in nodes.items():
+            fields = cls._fields(node_name, node_data)
+            if not case_sensitive:
+                fields = tuple(field.lower() for field in fields)
+            at = ' '.join(fields).find(needle)
+            if at != -1:
+                yield node_name, node_data, cls._match_type(fields, needle, at)
+
+    @staticmethod
+    def scan_subtree(nodes: Dict[str, Any], oid: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Find the nodes at oid and below it without an index, like subtree().
+
+        Yields:
+            (node_name, node_data) tuples in node order
+        """
+        prefix = oid + '.'
+        for node_name, node_data in nodes.items():
+            node_oid = str(node_data.get('oid', ''))
+            if node_oid == oid or node_oid.startswith(prefix):
+                yield node_name, node_data
+
+    def _candidates(self, query_lower: str) -> Iterable[int]:
+        """Return the positions of entries that may contain query_lower, in node order."""
+        if not query_lower or self.SEPARATOR in query_lower:
+            return range(len(self.entries))
+        if len(query_lower) < 3:
+            return self._scan(query_lower)
+
+        postings = []
+        for gram in _trigrams(query_lower):
+            posting = self.grams.get(gram)
+            if posting is None:
+                return ()
+            postings.append(posting)
+        postings.sort(key=len)
+        if len(postings[0]) * self.SCAN_RATIO > len(self.entries):
+            # Every trigram is common; a corpus scan beats intersecting postings
+            return self._scan(query_lower)
+        matches = set(postings[0])
+        for posting in postings[1:]:
+            matches.intersection_update(posting)
+            if not matches:
+                return ()
+        return sorted(matches)
+
+    def _scan(self, query_lower: str) -> List[int]:
+        """
+        Find the entries containing query_lower with str.find over the corpus.
+
+        Trigrams cannot narrow queries shorter than three characters, so the
+        whole corpus is searched in C instead of testing entries one by one.
+        After a hit the scan resumes at the next entry's text.
+        """
+        positions = []
+        find = self.corpus.find
+        last = len(self.starts) - 1
+        hit = find(query_lower)
+        while hit != -1:
+            position = bisect.bisect_right(self.starts, hit) - 1
+            positions.append(position)
+            if position == last:
+                break
+            hit = find(query_lower, self.starts[position + 1])
+        return positions
+
+    def search(self, query: str, case_sensitive: bool = False) -> Iterator[Tuple[str, Dict[str, Any], str]]:
+        """
+        Find nodes whose name, OID or description text contains query.
+
+        Yields:
+            (node_name, node_data, match_type) tuples in node order
+        """
+        query_lower = query.lower()
+        for position in self._candidates(query_lower):
+            node_name, node_data, text, fields = self.entries[position]
+            if case_sensitive:
+                # Lowercase matches are a superset; confirm against the original text
+                fields = self._fields(node_name, node_data)
+                text = ' '.join(fields)
+                needle = query
+            else:
+                needle = query_lower
+            at = text.find(needle)
+            if at == -1:
+                continue
+            yield node_name, node_data, self._match_type(fields, needle, at)
+
+    def subtree(self, oid: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Find the nodes at oid and below it.
+
+        OIDs sharing a prefix are adjacent in sorted order, so the subtree is
+        the sorted run between "<oid>." and "<oid>/" ('/' follows '.'), located
+        with two binary searches, plus the nodes whose OID equals oid exactly.
+
+        Yields:
+            (node_name, node_data) tuples in node order
+        """
+        if self._oid_order is None:
+            self._oid_order = sorted(
+                (entry[3][1], position) for position, entry in enumerate(self.entries) if entry[3][1]
+            )
+        order = self._oid_order
+
+        positions = []
+        for low, high in ((oid, oid + '\0'), (oid + '.', oid + '/')):
+            start = bisect.bisect_left(order, (low,))
+            end = bisect.bisect_left(order, (high,), start)
+            positions.extend(position for _, position in order[start:end])
+
+        for position in sorted(positions):
+            node_name, node_data = self.entries[position][:2]
+            yield node_name, node_data
+
+    @classmethod
+    def _match_type(cls, fields: Tuple[str, str, str], needle: str, at: int) -> str:
+        """
+        Name the first field containing needle, given its first offset in the joined text.
+
+        A first occurrence lying wholly inside one field settles the answer:
+        no earlier field can contain needle, or the match would start sooner.
+        Only an occurrence that straddles a separator needs per-field checks.
+        """
+        end = at + len(needle)
+        field_start = 0
+        for index, (field, field_type) in enumerate(zip(fields, cls.MATCH_TYPES)):
+            field_end = field_start + len(field)
+            if at < field_start:
+                break
+            if end <= field_end:
+                return field_type
+            field_start = field_end + 1
+
+        for field, field_type in zip(fields[index:], cls.MATCH_TYPES[index:]):
+            if needle in field:
+                return field_type
+        return 'other'
+
+
 class MibService:
     """Service for reading and managing MIB data from JSON files."""
 
-    def __init__(self, output_dir: Path, compiled_mibs_dir: Path = None, device_type: str = None, global_output_dir: Path = None):
+    # Maximum number of MIBs kept in the per-instance cache
+    MIB_CACHE_SIZE = 128
+    # Seconds a MIB name found missing is remembered before probing again
+    MISSING_MIB_TTL = 5.0
+    # Below this many files, MIB listings and combined views load MIBs serially
+    PARALLEL_LOAD_MIN_FILES = 8
+    # Below this many uploaded files, MIBs are parsed in-process one by one
+    PARALLEL_PARSE_MIN_FILES = 4
+
+    def __init__(self, output_dir: Path, compiled_mibs_dir: Path = None, device_type: str = None,
+                 global_output_dir: Path = None, base_dir: Path = None):
         """
         Initialize MIB service.
 
@@ -24,27 +611,36 @@ class MibService:
             compiled_mibs_dir: Path to compiled MIBs directory (for device context)
             device_type: Device type name for context
             global_output_dir: Path to global output directory (optional)
+            base_dir: Base directory for the default global output directory
+                (defaults to the current working directory)
         """
-        self.output_dir = Path(output_dir)
-        self.compiled_mibs_dir = Path(compiled_mibs_dir) if compiled_mibs_dir else None
+        self._base_dir = _as_path(base_dir) if base_dir else Path.cwd()
+        self.output_dir = _as_path(output_dir)
+        self.compiled_mibs_dir = _as_path(compiled_mibs_dir) if compiled_mibs_dir else None
         self.device_type = device_type
-        self._mib_cache = {}  # Simple in-memory cache
-        self._last_cache_update = {}
+        # String forms for get_device_context; the directories never change
+        self._output_dir_str = str(self.output_dir)
+        self._compiled_mibs_dir_str = str(self.compiled_mibs_dir) if self.compiled_mibs_dir else None
+        # In-memory cache of mib_name -> ((file path, mtime_ns, size), data), bounded LRU.
+        # Locked, as the API routes share one instance across request threads.
+        self._mib_cache = _SharedCache(self.MIB_CACHE_SIZE)
+        # Negative cache of mib_name -> monotonic time it was found missing
+        self._missing = _SharedCache(self.MIB_CACHE_SIZE)
 
         # Add global output directory for standard MIBs
         if global_output_dir:
-            self.global_output_dir = Path(global_output_dir)
+            self.global_output_dir = _as_path(global_output_dir)
         else:
-            # Default: use Path.cwd() for backward compatibility
-            self.global_output_dir = Path.cwd() / "storage" / "global" / "output"
+            # Default: relative to the base directory for backward compatibility
+            self.global_output_dir = self._base_dir / "storage" / "global" / "output"
 
         # Store base storage directory for MIB sources (used in desktop app)
-        # This overrides Path.cwd() when set
+        # This overrides the base directory when set
         self._storage_dir = None
 
     def set_storage_dir(self, storage_dir: Path):
         """Set the storage directory for MIB sources."""
-        self._storage_dir = Path(storage_dir)
+        self._storage_dir = _as_path(storage_dir)
 
     def list_mibs(self) -> List[Dict[str, Any]]:
         """
@@ -53,81 +649,92 @@ class MibService:
         Returns:
             List of dictionaries containing MIB metadata
         """
-        mibs = []
-
-        try:
-            # Collect all output directories to scan
-            output_dirs = []
-
-            # Add global output directory first (standard MIBs)
-            if self.global_output_dir.exists():
-                output_dirs.append(self.global_output_dir)
+        return [summary.to_dict() for summary in self._list_summaries()]
 
-            # Add device-specific output directory
-            if self.output_dir.exists():
-                output_dirs.append(self.output_dir)
+    def _list_summaries(self) -> List[MibSummary]:
+        """
+        List all available MIB files as shared MibSummary objects.
 
-            # Track seen MIB names to avoid duplicates
-            seen_mibs = set()
+        The summaries are cached across instances and must not be modified;
+        list_mibs() hands out dictionary copies instead.
 
-            # Scan all output directories
-            for scan_dir in output_dirs:
-                for file_path in scan_dir.glob("*.json"):
-                    # Skip auxiliary files like _oids.json, _tree.json
-                    if any(suffix in file_path.name for suffix in ['_oids', '_tree', 'all_', 'statistics']):
-                        continue
+        Returns:
+            List of MibSummary objects sorted by MIB name
+        """
+        mibs = []
+        # (position in mibs, mib_name, directory entry, stat result, cache key)
+        pending = []
 
-                    mib_name = file_path.stem
-                    if mib_name in seen_mibs:
-                        continue  # Skip duplicates
+        try:
+            listing_base = str(self.output_dir.parent)
 
-                    seen_mibs.add(mib_name)
+            # Sorted by name; global MIBs shadow device MIBs and auxiliary files are skipped
+            for mib_name, entry in self._scan_mib_files():
+                try:
+                    # Get file metadata
+                    stat = entry.stat()
+                    key = (entry.path, listing_base)
+
+                    # Reuse the summary while the file is unchanged
+                    cached = _SUMMARIES.get(key)
+                    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                        mibs.append(cached[2])
+                    else:
+                        pending.append((len(mibs), mib_name, entry, stat, key))
+                        mibs.append(None)
+                except Exception as e:
+                    logger.warning(f"Error processing file {entry.path}: {e}")
+                    continue
 
+            # Take the listing fields from the .idx sidecars where they are
+            # current; the remaining files are read in one batch
+            headers = [_read_index_header(item[2].path, item[3]) for item in pending]
+            loaded = iter(self._load_entries([item[2] for item, header in zip(pending, headers)
+                                              if header is None]))
+            for (position, mib_name, entry, stat, key), header in zip(pending, headers):
+                if header is None:
                     try:
-                        # Get file metadata
-                        stat = file_path.stat()
-
-                        try:
-                            relative_path = str(file_path.relative_to(self.output_dir.parent))
-                        except ValueError:
-                            # If file is not in the expected subpath, use absolute path
-                            relative_path = str(file_path)
-
-                        mib_info = {
-                            'name': mib_name,
-                            'filename': file_path.name,
-                            'file_path': relative_path,
-                            'size': stat.st_size,
-                            'last_modified': datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                            'description': None,
-                            'nodes_count': None,
-                            'imports_count': None
-                        }
+                        header = _mib_header(next(loaded))
+                    except Exception as e:
+                        logger.warning(f"Could not read detailed info for {mib_name}: {e}")
 
-                        # Try to get more detailed info from the JSON content
-                        try:
-                            mib_data = self.get_mib_data(mib_name)
-                            if mib_data:
-                                mib_info.update({
-                                    'description': mib_data.get('description'),
-                                    'nodes_count': len(mib_data.get('nodes', {})),
-                                    'imports_count': len(mib_data.get('imports', []))
-                                })
-                        except Exception as e:
-                            logger.warning(f"Could not read detailed info for {mib_name}: {e}")
-
-                        mibs.append(mib_info)
+                try:
+                    file_path = Path(entry.path)
+                    try:
+                        relative_path = str(file_path.relative_to(self.output_dir.parent))
+                    except ValueError:
+                        # If file is not in the expected subpath, use absolute path
+                        relative_path = str(file_path)
+
+                    # Names repeat across devices and in every node lookup
+                    summary = MibSummary(
+                        name=sys.intern(mib_name),
+                        filename=entry.name,
+                        file_path=relative_path,
+                        size=stat.st_size,
+                        last_modified=datetime.fromtimestamp(stat.st_mtime).isoformat(),
+                        description=None,
+                        nodes_count=None,
+                        imports_count=None
+                    )
+
+                    # Fill in more detailed info from the JSON content
+                    if header:
+                        summary.description = header.get('description')
+                        summary.nodes_count = header.get('nodes_count')
+                        summary.imports_count = header.get('imports_count')
+
+                    _SUMMARIES[key] = (stat.st_mtime_ns, stat.st_size, summary)
+                    mibs[position] = summary
 
-                    except Exception as e:
-                        logger.warning(f"Error processing file {file_path}: {e}")
-                        continue
+                except Exception as e:
+                    logger.warning(f"Error processing file {entry.path}: {e}")
+                    continue
 
         except Exception as e:
             logger.error(f"Error listing MIB files: {e}")
 
-        # Sort by name
-        mibs.sort(key=lambda x: x['name'])
-        return mibs
+        return [summary for summary in mibs if summary is not None]
 
     def get_mib_data(self, mib_name: str, use_cache: bool = True) -> Optional[Dict[str, Any]]:
         """
@@ -146,41 +753,27 @@ class MibService:
             # Generate it dynamically instead of looking for a physical file
             return self._generate_all_mibs_data()
 
-        # Check cache first
-        if use_cache and mib_name in self._mib_cache:
-            cache_time = self._last_cache_update.get(mib_name, 0)
-            # Check both global and device-specific directories
-            for check_dir in [self.global_output_dir, self.output_dir]:
-                file_path = check_dir / f"{mib_name}.json"
-                if file_path.exists() and file_path.stat().st_mtime <= cache_time:
-                    return self._mib_cache[mib_name]
-
-        # Try to find the file in both directories
-        # First check global directory (standard MIBs)
-        json_file = self.global_output_dir / f"{mib_name}.json"
-        if not json_file.exists():
-            # Try with .mib.json extension
-            json_file = self.global_output_dir / f"{mib_name}.mib.json"
-
-        if not json_file.exists():
-            # Then check device-specific directory
-            json_file = self.output_dir / f"{mib_name}.json"
-            if not json_file.exists():
-                # Try with .mib.json extension
-                json_file = self.output_dir / f"{mib_name}.mib.json"
-
-        if not json_file.exists():
+        json_file = self._find_mib_json(mib_name, use_cache)
+        if json_file is None:
             logger.error(f"MIB file not found: {mib_name}")
             return None
 
         try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-            # Cache the data
             if use_cache:
-                self._mib_cache[mib_name] = data
-                self._last_cache_update[mib_name] = json_file.stat().st_mtime
+                stat = json_file.stat()
+                key = (str(json_file), stat.st_mtime_ns, stat.st_size)
+
+                # Check cache first; entries are valid while the same file is unchanged
+                cached = self._mib_cache.get(mib_name)
+                if cached is not None and cached[0] == key:
+                    return cached[1]
+
+                data = _load_json_cached(*key)
+
+                # Cache the data
+                self._mib_cache[mib_name] = (key, data)
+            else:
+                data = json_loads(json_file.read_bytes())
 
             return data
 
@@ -191,6 +784,62 @@ class MibService:
             logger.error(f"Error reading {json_file}: {e}")
             return None
 
+    def _find_mib_json(self, mib_name: str, use_cache: bool = True) -> Optional[Path]:
+        """
+        Locate the JSON file for a MIB.
+
+        Args:
+            mib_name: Name of the MIB
+            use_cache: Whether to trust a recent "not found" result
+
+        Returns:
+            Path to the JSON file or None if not found
+        """
+        # Names found missing recently are not probed again until they expire
+        missing_since = self._missing.get(mib_name) if use_cache else None
+        if missing_since is not None and time.monotonic() - missing_since < self.MISSING_MIB_TTL:
+            return None
+
+        # Global directory (standard MIBs) first, then the device directory
+        for check_dir in [self.global_output_dir, self.output_dir]:
+            for filename in (f"{mib_name}.json", f"{mib_name}.mib.json"):
+                json_file = check_dir / filename
+                if json_file.exists():
+                    self._missing.pop(mib_name, None)
+                    return json_file
+
+        self._missing[mib_name] = time.monotonic()
+        return None
+
+    def get_mib_node(self, mib_name: str, node_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a single node of a MIB.
+
+        Uses the node index written alongside the MIB JSON when it is present
+        and current, so only that node is parsed. Otherwise loads the whole MIB.
+
+        Args:
+            mib_name: Name of the MIB
+            node_name: Name of the node
+
+        Returns:
+            Node data dictionary or None if not found
+        """
+        json_file = self._find_mib_json(mib_name)
+        if json_file is not None:
+            try:
+                node = _read_indexed_node(json_file, node_name)
+            except Exception as e:
+                logger.warning(f"Error reading node index for {mib_name}: {e}")
+                node = _NO_INDEX
+            if node is not _NO_INDEX:
+                return node
+
+        mib_data = self.get_mib_data(mib_name)
+        if not mib_data:
+            return None
+        return mib_data.get('nodes', {}).get(node_name)
+
     def get_mib_tree_data(self, mib_name: str) -> Optional[Dict[str, Any]]:
         """
         Get tree-structured data for a MIB.
@@ -224,84 +873,165 @@ class MibService:
         from .tree_service import TreeService
         tree_service = TreeService()
 
-        # Get all MIB data
-        all_mibs = self.list_mibs()
-        combined_nodes = {}
-        all_imports = set()
+        # Create combined MIB data structure; nodes are streamed one MIB at a
+        # time so the combined copies are never held in memory all at once
+        combined_mib_data = {
+            'name': 'All MIBs',
+            'description': 'Combined view of all MIB modules',
+            'module': 'ALL_MIBS',
+            'nodes': self._iter_combined_nodes()
+        }
 
-        # Combine all nodes from all MIBs
-        for mib_info in all_mibs:
-            mib_name = mib_info['name']
-            mib_data = self.get_mib_data(mib_name)
+        # Build tree structure from combined data
+        return tree_service.build_tree_structure(combined_mib_data)
+
+    def _iter_combined_nodes(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Yield the nodes of all MIBs, named and tagged with their MIB of origin.
 
+        Returns:
+            Iterator of (unique node name, node data) tuples
+        """
+        files = self._scan_mib_files()
+        loaded = self._load_entries([entry for _, entry in files])
+
+        for (mib_name, _), mib_data in zip(files, loaded):
             if mib_data and 'nodes' in mib_data:
-                # Add nodes to combined structure
                 for node_name, node_data in mib_data['nodes'].items():
                     # Ensure node name includes MIB origin to avoid conflicts
-                    unique_name = f"{mib_name}.{node_name}"
-                    combined_nodes[unique_name] = {
+                    yield f"{mib_name}.{node_name}", {
                         **node_data,
                         'original_name': node_name,
                         'mib_origin': mib_name
                     }
 
-                # Collect all imports
-                if 'imports' in mib_data:
-                    all_imports.update(mib_data['imports'])
+    def _load_entries(self, entries: List[os.DirEntry]) -> Iterable[Any]:
+        """
+        Load scanned JSON files through the process-wide cache.
 
-        # Create combined MIB data structure
-        combined_mib_data = {
-            'name': 'All MIBs',
-            'description': 'Combined view of all MIB modules',
-            'module': 'ALL_MIBS',
-            'nodes': combined_nodes,
-            'imports': list(all_imports)
-        }
+        Small batches are read serially; larger ones in a thread pool so the
+        file reads overlap with parsing.
 
-        # Build tree structure from combined data
-        return tree_service.build_tree_structure(combined_mib_data)
+        Args:
+            entries: Directory entries of the JSON files
+
+        Returns:
+            Iterable of parsed data (None for unreadable files) in entry order
+        """
+        if len(entries) < self.PARALLEL_LOAD_MIN_FILES:
+            return map(_load_json_entry, entries)
+
+        # map() keeps the entry order
+        workers = min(16, (os.cpu_count() or 1) * 2)
+        executor = ThreadPoolExecutor(max_workers=workers)
+        loaded = executor.map(_load_json_entry, entries)
+        executor.shutdown(wait=False)
+        return loaded
+
+    def _scan_mib_files(self) -> List[Tuple[str, os.DirEntry]]:
+        """
+        Collect MIB JSON files from the global and device output directories.
+
+        Used by list_mibs() and the combined views: global files win over device
+        files with the same name, auxiliary files are skipped and the result is
+        sorted by MIB name.
+
+        Returns:
+            List of (mib_name, directory entry) tuples
+        """
+        found = {}
+        for scan_dir in (self.global_output_dir, self.output_dir):
+            for entry in _iter_json_entries(scan_dir):
+                if any(marker in entry.name for marker in _AUXILIARY_MARKERS):
+                    continue
+                found.setdefault(entry.name[:-len('.json')], entry)
+
+        return sorted(found.items(), key=lambda item: item[0])
 
-    def search_nodes(self, query: str, mib_name: Optional[str] = None) -> List[Dict[str, Any]]:
+    def search_nodes(self, query: str, mib_name: Optional[str] = None,
+                     case_sensitive: bool = False, oid_subtree: bool = False,
+                     limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Search for nodes matching the query.
 
         Args:
             query: Search query (matches name, OID, or description)
             mib_name: Optional MIB name to limit search to
+            case_sensitive: Match the query's case exactly (default: ignore case)
+            oid_subtree: Treat the query as an OID and return the nodes at and
+                below it instead of substring matches
+            limit: Stop after this many matches (default: no limit)
 
         Returns:
             List of matching nodes
         """
         results = []
-        query_lower = query.lower()
+
+        if oid_subtree:
+            oid = query.strip('.')
+            if not _OID_QUERY_RE.fullmatch(oid):
+                return results
 
         # Determine which MIBs to search
         if mib_name:
             mibs_to_search = [mib_name]
         else:
-            mib_list = self.list_mibs()
-            mibs_to_search = [mib['name'] for mib in mib_list]
+            mibs_to_search = [mib.name for mib in self._list_summaries()]
 
         for mib_name in mibs_to_search:
             mib_data = self.get_mib_data(mib_name)
             if not mib_data:
                 continue
 
+            index = self._get_search_index(mib_name, mib_data)
             nodes = mib_data.get('nodes', {})
-            for node_name, node_data in nodes.items():
+            if oid_subtree:
+                subtree = index.subtree(oid) if index else _NodeSearchIndex.scan_subtree(nodes, oid)
+                matches = ((node_name, node_data, 'oid') for node_name, node_data in subtree)
+            elif index:
                 # Search in name, OID, and description
-                searchable_text = f"{node_name} {node_data.get('oid', '')} {node_data.get('description', '')}"
-                if query_lower in searchable_text.lower():
-                    result = {
-                        'mib_name': mib_name,
-                        'node_name': node_name,
-                        'node_data': node_data,
-                        'match_type': self._get_match_type(node_name, node_data, query_lower)
-                    }
-                    results.append(result)
+                matches = index.search(query, case_sensitive)
+            else:
+                matches = _NodeSearchIndex.scan(nodes, query, case_sensitive)
+
+            if limit is not None:
+                matches = itertools.islice(matches, limit - len(results))
+
+            results.extend({
+                'mib_name': mib_name,
+                'node_name': node_name,
+                'node_data': node_data,
+                'match_type': match_type
+            } for node_name, node_data, match_type in matches)
+
+            if limit is not None and len(results) >= limit:
+                break
 
         return results
 
+    def _get_search_index(self, mib_name: str, mib_data: Dict[str, Any]) -> Optional[_NodeSearchIndex]:
+        """
+        Return the search index of a MIB, or None while it has none yet.
+
+        Indexing a MIB costs far more than scanning it once, so a missing
+        index is built on a background thread and callers scan the nodes
+        until it is ready. Indexes are keyed on the file's path, mtime and
+        size, which stay the same however often the loaded data is evicted
+        and reloaded.
+        """
+        cached = self._mib_cache.get(mib_name)
+        if cached is None or cached[1] is not mib_data:
+            # Not loaded from a file through the cache, e.g. ALL_MIBS
+            return None
+
+        key = cached[0]
+        entry = _SEARCH_INDEXES.get(key)
+        if entry is not None:
+            return entry[1]
+
+        _schedule_search_index(key, mib_name, mib_data.get('nodes', {}))
+        return None
+
     def get_node_by_oid(self, oid: str) -> Optional[Dict[str, Any]]:
         """
         Find a node by its OID across all MIBs.
@@ -312,25 +1042,59 @@ class MibService:
         Returns:
             Node data with MIB context or None if not found
         """
-        mib_list = self.list_mibs()
-
-        for mib_info in mib_list:
-            mib_data = self.get_mib_data(mib_info['name'])
-            if not mib_data:
+        for summary in self._list_summaries():
+            oids = self._get_oid_map(summary.name)
+            node_name = oids.get(oid) if oids else None
+            if node_name is None:
                 continue
 
-            nodes = mib_data.get('nodes', {})
-            for node_name, node_data in nodes.items():
-                if node_data.get('oid') == oid:
-                    return {
-                        'mib_name': mib_info['name'],
-                        'node_name': node_name,
-                        'node_data': node_data,
-                        'mib_info': mib_info
-                    }
+            node_data = self.get_mib_node(summary.name, node_name)
+            if node_data is not None:
+                return {
+                    'mib_name': summary.name,
+                    'node_name': node_name,
+                    'node_data': node_data,
+                    'mib_info': summary.to_dict()
+                }
 
         return None
 
+    def _get_oid_map(self, mib_name: str) -> Optional[Dict[str, str]]:
+        """
+        Get the OID -> node name map of a MIB.
+
+        The map comes from the _oids.json sidecar next to the MIB when the
+        sidecar entry matches the file's size and mtime, otherwise it is built
+        from the MIB data. Either way it is cached until the file changes.
+
+        Args:
+            mib_name: Name of the MIB
+
+        Returns:
+            Dictionary mapping OIDs to node names, or None if the MIB is missing
+        """
+        json_file = self._find_mib_json(mib_name)
+        if json_file is None:
+            return None
+
+        stat = os.stat(json_file)
+        cached = _OID_MAPS.get(str(json_file))
+        if cached is not None and cached[1] == stat.st_mtime_ns and cached[2] == stat.st_size:
+            return cached[3]
+
+        entry = _read_oid_sidecar(json_file.parent).get(mib_name)
+        if (entry and entry.get('source_size') == stat.st_size
+                and entry.get('source_mtime_ns') == stat.st_mtime_ns):
+            oids = entry.get('oids', {})
+        else:
+            mib_data = self.get_mib_data(mib_name)
+            if not mib_data:
+                return None
+            oids = _first_oids((name, data.get('oid')) for name, data in mib_data.get('nodes', {}).items())
+
+        _OID_MAPS[str(json_file)] = (mib_name, stat.st_mtime_ns, stat.st_size, oids)
+        return oids
+
     def get_statistics(self) -> Dict[str, Any]:
         """
         Get overall statistics about all MIBs.
@@ -338,87 +1102,75 @@ class MibService:
         Returns:
             Dictionary with statistics
         """
-        mibs = self.list_mibs()
+        # Reuse the last result while no JSON file was added, removed or rewritten
+        fingerprint = self._directory_fingerprint()
+        cached = _STATISTICS.get(fingerprint)
+        if cached is not None:
+            return dict(cached)
+
+        mibs = self._list_summaries()
+
+        nodes_counts = [mib.nodes_count for mib in mibs if mib.nodes_count]
 
         stats = {
             'total_mibs': len(mibs),
-            'total_nodes': 0,
-            'total_size': 0,
-            'mibs_with_data': 0,
+            'total_nodes': sum(nodes_counts),
+            'total_size': sum(mib.size for mib in mibs),
+            'mibs_with_data': len(nodes_counts),
             'largest_mib': None,
             'newest_mib': None,
             'oldest_mib': None
         }
 
-        largest_size = 0
-        newest_time = 0
-        oldest_time = float('inf')
-
-        for mib in mibs:
-            stats['total_size'] += mib.get('size', 0)
-            nodes_count = mib.get('nodes_count', 0)
-            if nodes_count:
-                stats['total_nodes'] += nodes_count
-                stats['mibs_with_data'] += 1
-
-            # Track extremes
-            size = mib.get('size', 0)
-            if size > largest_size:
-                largest_size = size
-                stats['largest_mib'] = mib['name']
-
-            mtime = mib.get('last_modified', '')
-            if mtime:
-                try:
-                    mtime_dt = datetime.fromisoformat(mtime.replace('Z', '+00:00') if mtime.endswith('Z') else mtime)
-                    mtime_ts = mtime_dt.timestamp()
+        # Track extremes; max() and min() keep the first MIB on ties
+        if mibs:
+            largest = max(mibs, key=operator.attrgetter('size'))
+            if largest.size > 0:
+                stats['largest_mib'] = largest.name
 
-                    if mtime_ts > newest_time:
-                        newest_time = mtime_ts
-                        stats['newest_mib'] = mib['name']
+        # last_modified is always a local datetime.isoformat() string, which
+        # sorts chronologically without parsing it back
+        dated = [mib for mib in mibs if mib.last_modified]
+        if dated:
+            by_mtime = operator.attrgetter('last_modified')
+            stats['newest_mib'] = max(dated, key=by_mtime).name
+            stats['oldest_mib'] = min(dated, key=by_mtime).name
 
-                    if mtime_ts < oldest_time:
-                        oldest_time = mtime_ts
-                        stats['oldest_mib'] = mib['name']
-                except:
-                    pass
+        _STATISTICS[fingerprint] = stats
+        return dict(stats)
+
+    def _directory_fingerprint(self) -> str:
+        """
+        Hash the path, mtime and size of every JSON file in the output directories.
 
-        return stats
+        Returns:
+            Hex digest that changes whenever a JSON file is added, removed or rewritten
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for scan_dir in (self.global_output_dir, self.output_dir):
+            for entry in sorted(_iter_json_entries(scan_dir), key=lambda e: e.name):
+                stat = entry.stat()
+                digest.update(f"{entry.path}:{stat.st_mtime_ns}:{stat.st_size}\0".encode())
+        return digest.hexdigest()
 
     def clear_cache(self, mib_name: Optional[str] = None):
         """
-        Clear cached data.
+        Clear cached data, including the indexes shared with other instances.
 
         Args:
             mib_name: Specific MIB to clear, or None to clear all
         """
         if mib_name:
             self._mib_cache.pop(mib_name, None)
-            self._last_cache_update.pop(mib_name, None)
+            self._missing.pop(mib_name, None)
+            _SUMMARIES.evict(lambda entry: entry[2].name == mib_name)
+            _discard_pending_search_indexes()
+            _SEARCH_INDEXES.evict(lambda entry: entry[0] == mib_name)
+            _OID_MAPS.evict(lambda entry: entry[0] == mib_name)
         else:
             self._mib_cache.clear()
-            self._last_cache_update.clear()
-
-    def _get_match_type(self, node_name: str, node_data: Dict, query_lower: str) -> str:
-        """
-        Determine what type of match this is.
-
-        Args:
-            node_name: Name of the node
-            node_data: Node data
-            query_lower: Lowercase search query
-
-        Returns:
-            String indicating match type
-        """
-        if query_lower in node_name.lower():
-            return 'name'
-        elif query_lower in node_data.get('oid', '').lower():
-            return 'oid'
-        elif query_lower in node_data.get('description', '').lower():
-            return 'description'
-        else:
-            return 'other'
+            self._missing.clear()
+            _clear_shared_caches()
 
     def get_device_context(self) -> Dict[str, Any]:
         """
@@ -429,11 +1181,12 @@ class MibService:
         """
         return {
             'device_type': self.device_type,
-            'output_dir': str(self.output_dir),
-            'compiled_mibs_dir': str(self.compiled_mibs_dir) if self.compiled_mibs_dir else None
+            'output_dir': self._output_dir_str,
+            'compiled_mibs_dir': self._compiled_mibs_dir_str
         }
 
-    def add_uploaded_files(self, mib_files: List[Path], device_type: str = None) -> Dict[str, Any]:
+    def add_uploaded_files(self, mib_files: List[Path], device_type: str = None,
+                           output_dir: Path = None) -> Dict[str, Any]:
         """
         Parse and add uploaded MIB files to this device.
         Enhanced with better error handling and dependency resolution.
@@ -441,13 +1194,15 @@ class MibService:
         Args:
             mib_files: List of MIB file paths
             device_type: Device type for context
+            output_dir: Directory to write the JSON output to (defaults to output_dir)
 
         Returns:
             Dictionary with parsing results
         """
         from src.mib_parser.parser import MibParser
         import tempfile
-        import shutil
+
+        output_dir = _as_path(output_dir) if output_dir else self.output_dir
         import time
         import logging
 
@@ -458,6 +1213,11 @@ class MibService:
             'total_processed': 0,
             'total_added': 0
         }
+        # OID maps of the saved MIBs, merged into the _oids.json sidecar at the end
+        oid_entries = {}
+        # Worker processes parsing large batches ahead of the loop below
+        executor = None
+        parse_futures = {}
 
         try:
             # Build comprehensive MIB source paths
@@ -512,6 +1272,20 @@ class MibService:
             # Initialize parser with debug mode enabled for better error reporting
             parser = MibParser(mib_sources=mib_sources, debug_mode=True, resolve_dependencies=True, device_type=self.device_type or "default")
 
+            # Parse large batches in worker processes; results are still handled in upload order.
+            # Workers are spawned, never forked: the server runs request threads, and a
+            # frozen desktop build relies on freeze_support() to run spawned workers.
+            if len(mib_files) >= self.PARALLEL_PARSE_MIN_FILES:
+                try:
+                    executor = ProcessPoolExecutor(max_workers=min(len(mib_files), os.cpu_count() or 1),
+                                                   mp_context=multiprocessing.get_context('spawn'))
+                    for mib_file in mib_files:
+                        parse_futures[mib_file] = executor.submit(
+                            _parse_mib_worker, mib_sources, self.device_type or "default", str(mib_file))
+                except Exception as e:
+                    logger.warning(f"Parallel parsing unavailable, parsing files one by one: {e}")
+                    parse_futures.clear()
+
             # Process each MIB file with enhanced error handling
             for mib_file in mib_files:
                 try:
@@ -524,8 +1298,22 @@ class MibService:
                     parse_error = None
 
                     try:
-                        result = parser.parse_file(str(mib_file))
-                        parse_time = time.time() - start_time
+                        outcome = None
+                        future = parse_futures.get(mib_file)
+                        if future is not None:
+                            try:
+                                outcome = future.result()
+                            except Exception as e:
+                                # e.g. a worker died; parse this file in-process instead
+                                logger.warning(f"Worker failed on {mib_file.name}, parsing in-process: {e}")
+
+                        if outcome is not None:
+                            result, parse_time, worker_error = outcome
+                            if worker_error is not None:
+                                raise Exception(worker_error)
+                        else:
+                            result = parser.parse_file(str(mib_file))
+                            parse_time = time.time() - start_time
                     except Exception as e:
                         parse_error = str(e)
 
@@ -561,10 +1349,11 @@ class MibService:
                         try:
                             from src.mib_parser.serializer import JsonSerializer
                             # Ensure output directory exists
-                            self.output_dir.mkdir(parents=True, exist_ok=True)
+                            output_dir.mkdir(parents=True, exist_ok=True)
                             serializer = JsonSerializer()
-                            output_file = self.output_dir / f"{result.name}.json"
-                            serializer.serialize(result, str(output_file))
+                            output_file = output_dir / f"{result.name}.json"
+                            serializer.serialize(result, str(output_file), node_index=True)
+                            self._missing.pop(result.name, None)
                             logger.info(f"Saved JSON output: {output_file}")
                         except Exception as save_error:
                             logger.error(f"Failed to save JSON for {result.name}: {save_error}")
@@ -573,6 +1362,18 @@ class MibService:
                                 'filename': mib_file.name,
                                 'error': f'Parsing successful but failed to save JSON: {str(save_error)}'
                             })
+                        else:
+                            # Only a saved JSON gets an entry; a stale file from an
+                            # earlier upload must not be paired with these OIDs
+                            try:
+                                stat = output_file.stat()
+                                oid_entries[result.name] = {
+                                    'source_size': stat.st_size,
+                                    'source_mtime_ns': stat.st_mtime_ns,
+                                    'oids': _first_oids((name, node.oid) for name, node in result.nodes.items())
+                                }
+                            except Exception as e:
+                                logger.warning(f"Could not record OIDs of {result.name}: {e}")
 
                         results['success'].append({
                             'filename': mib_file.name,
@@ -593,7 +1394,6 @@ class MibService:
                     # Enhance error messages for common dependency issues
                     if 'no module' in error_msg.lower() and 'in symbolTable' in error_msg:
                         # Extract missing module name for better error reporting
-                        import re
                         match = re.search(r'no module "([^"]+)"', error_msg)
                         if match:
                             missing_module = match.group(1)
@@ -615,6 +1415,15 @@ class MibService:
                     'error': error_msg
                 })
 
+        if executor is not None:
+            executor.shutdown()
+
+        if oid_entries:
+            try:
+                _write_oid_sidecar(output_dir, oid_entries)
+            except Exception as e:
+                logger.warning(f"Failed to update {output_dir / _OID_MAP_FILE}: {e}")
+
         # Clear cache to force reload
         self.clear_cache()
 
@@ -635,66 +1444,74 @@ class MibService:
             True if fixes were applied, False otherwise
         """
         try:
-            with open(mib_file, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
+            with open(mib_file, 'rb') as f:
+                raw_content = f.read()
 
-            original_content = content
+            # Normalize line endings like a text-mode read would
+            original_content = raw_content.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
             fixes_applied = []
 
-            # Fix common syntax issues
-            import re
-
             # 1. Fix problematic OBJECT IDENTIFIER patterns
             # Remove or comment out problematic lines with very long or malformed identifiers
-            lines = content.split('\n')
             fixed_lines = []
 
-            for i, line in enumerate(lines):
+            for i, line in enumerate(original_content.split(b'\n')):
                 # Check for extremely long lines that might cause issues
-                if len(line) > 1000:
-                    fixed_lines.append(f"-- FIXED: Truncated line {i+1} (was {len(line)} chars)")
+                if len(line) > _MAX_MIB_LINE_LENGTH:
+                    fixed_lines.append(b"-- FIXED: Truncated line %d (was %d chars)" % (i + 1, len(line)))
                     if len(fixes_applied) < 10:
                         fixes_applied.append(f"Truncated line {i+1}")
                     continue
 
-                # Fix malformed OBJECT-TYPE syntax
-                line = re.sub(r'OBJECT-TYPE\s*\n\s*SYNTAX\s*\n\s*([A-Za-z-0-9]+)', r'OBJECT-TYPE\n    SYNTAX     \1', line)
-
                 # Fix problematic identifiers with mixed formats
-                if 'corrErrAftFecAver15m' in line:
+                if _PROBLEM_IDENTIFIER in line:
                     # Comment out the problematic line
-                    if not line.strip().startswith('--'):
-                        fixed_lines.append(f"-- FIXED: {line}")
+                    if not line.strip().startswith(b'--'):
+                        fixed_lines.append(b"-- FIXED: " + line)
                         if len(fixes_applied) < 10:
                             fixes_applied.append("Commented out problematic identifier")
                         continue
 
                 # Fix malformed OIDs
-                line = re.sub(r'OBJECT\s+IDENTIFIER\s*::=\s*{([^}]*)}([^\n]*)(?=\n|$)',
-                            lambda m: f"OBJECT IDENTIFIER ::= {{ {m.group(1).strip()} }}", line)
+                if b'IDENTIFIER' in line:
+                    line = _OID_ASSIGNMENT_RE.sub(
+                        lambda m: b"OBJECT IDENTIFIER ::= { " + m.group(1).strip() + b" }", line)
 
                 fixed_lines.append(line)
 
-            content = '\n'.join(fixed_lines)
+            content = b'\n'.join(fixed_lines)
+
+            # 2. Fix malformed OBJECT-TYPE syntax split over several lines
+            content = _OBJECT_TYPE_SYNTAX_RE.sub(rb'OBJECT-TYPE\n    SYNTAX     \1', content)
 
-            # 2. Fix common END statement issues
-            content = re.sub(r'\s*END\s*$', '\nEND', content)
+            # 3. Fix common END statement issues
+            content = _END_RE.sub(b'\nEND\n', content)
 
-            # 3. Fix malformed imports
-            content = re.sub(r'IMPORTS\s*$', 'IMPORTS\n    -- No imports', content)
+            # 4. Fix malformed imports
+            content = _EMPTY_IMPORTS_RE.sub(b'IMPORTS\n    -- No imports', content)
 
-            # 4. Fix missing semicolons in SEQUENCE definitions
-            content = re.sub(r'(\w+)\s+INTEGER', r'\1 INTEGER', content)
+            # 5. Fix missing semicolons in SEQUENCE definitions
+            content = _INTEGER_SPACING_RE.sub(rb'\1 INTEGER', content)
 
             if content != original_content:
-                # Backup original file
+                # Backup original file by hard-linking it; the fixed content is
+                # swapped in with os.replace so the link keeps the old bytes
                 backup_path = mib_file.with_suffix(mib_file.suffix + '.backup')
-                with open(backup_path, 'w', encoding='utf-8') as f:
-                    f.write(original_content)
+                try:
+                    os.unlink(backup_path)
+                except FileNotFoundError:
+                    pass
+                try:
+                    os.link(mib_file, backup_path)
+                except OSError:
+                    with open(backup_path, 'wb') as f:
+                        f.write(raw_content)
 
                 # Write fixed content
-                with open(mib_file, 'w', encoding='utf-8') as f:
+                tmp_path = mib_file.with_suffix(mib_file.suffix + '.tmp')
+                with open(tmp_path, 'wb') as f:
                     f.write(content)
+                os.replace(tmp_path, mib_file)
 
                 logger.info(f"Applied {len(fixes_applied)} syntax fixes to {mib_file.name}")
                 for fix in fixes_applied[:5]:  # Log first 5 fixes
@@ -712,6 +1529,9 @@ class MibService:
         """
         Replace all MIB files for this device with new ones.
 
+        The existing MIBs are only replaced when at least one new file was
+        added; otherwise the previous output and compiled MIBs are kept.
+
         Args:
             mib_files: List of MIB file paths
             device_type: Device type for context
@@ -719,20 +1539,36 @@ class MibService:
         Returns:
             Dictionary with replacement results
         """
+        # New output is built in a sibling staging directory and swapped in
+        # with two renames, so readers never see a half-replaced output
+        staging_dir = self.output_dir.with_name(self.output_dir.name + '.new')
+        retired_dir = self.output_dir.with_name(self.output_dir.name + '.old')
+        # Compiled MIBs are set aside while parsing, so they cannot satisfy imports
+        # of the new files, and are put back if nothing could be added
+        retired_compiled_dir = None
+        if self.compiled_mibs_dir and self.compiled_mibs_dir.exists():
+            retired_compiled_dir = self.compiled_mibs_dir.with_name(self.compiled_mibs_dir.name + '.old')
+
         try:
             # Clear existing files (no timeout needed for file operations)
             try:
-                # Clear JSON output files
-                for json_file in self.output_dir.glob("*.json"):
-                    json_file.unlink()
+                # Anything besides JSON output and node indexes is carried over
+                carry_over = []
+                if self.output_dir.exists():
+                    with os.scandir(self.output_dir) as it:
+                        carry_over = [entry.name for entry in it
+                                      if not entry.name.endswith(('.json', '.idx'))]
 
-                # Clear compiled MIB files
-                if self.compiled_mibs_dir and self.compiled_mibs_dir.exists():
-                    for compiled_file in self.compiled_mibs_dir.glob("*"):
-                        if compiled_file.is_file():
-                            compiled_file.unlink()
+                if retired_compiled_dir:
+                    shutil.rmtree(retired_compiled_dir, ignore_errors=True)
+                    retired_compiled_dir.mkdir()
+                    _move_files(self.compiled_mibs_dir, retired_compiled_dir)
+
+                shutil.rmtree(staging_dir, ignore_errors=True)
+                staging_dir.mkdir(parents=True)
 
             except Exception as e:
+                self._finish_compiled_replacement(retired_compiled_dir, replaced=False)
                 return {
                     'success': False,
                     'error': f'Failed to clear existing files: {str(e)}',
@@ -741,8 +1577,41 @@ class MibService:
                     'errors': [{'filename': f.name, 'error': 'Clear operation failed'} for f in mib_files]
                 }
 
-            # Add new files (this already has timeout handling)
-            add_result = self.add_uploaded_files(mib_files, device_type)
+            replaced = False
+            try:
+                # Add new files (this already has timeout handling)
+                add_result = self.add_uploaded_files(mib_files, device_type, output_dir=staging_dir)
+
+                if add_result['total_added'] > 0:
+                    shutil.rmtree(retired_dir, ignore_errors=True)
+                    if self.output_dir.exists():
+                        os.rename(self.output_dir, retired_dir)
+                    try:
+                        os.rename(staging_dir, self.output_dir)
+                    except OSError:
+                        # Put the previous output back before giving up
+                        if retired_dir.exists():
+                            os.rename(retired_dir, self.output_dir)
+                        raise
+                    replaced = True
+
+                    for name in carry_over:
+                        os.replace(retired_dir / name, self.output_dir / name)
+                    shutil.rmtree(retired_dir, ignore_errors=True)
+            finally:
+                shutil.rmtree(staging_dir, ignore_errors=True)
+                self._finish_compiled_replacement(retired_compiled_dir, replaced)
+
+            if not replaced:
+                logger.warning("No uploaded MIB file could be added, keeping the existing MIBs")
+                return {
+                    'success': False,
+                    'error': 'No MIB files could be added; the existing MIBs were kept',
+                    'success_count': 0,
+                    'error_count': len(add_result['errors']),
+                    'errors': add_result['errors'],
+                    'success_files': []
+                }
 
             return {
                 'success': True,
@@ -761,6 +1630,26 @@ class MibService:
                 'errors': [{'filename': f.name, 'error': str(e)} for f in mib_files]
             }
 
+    def _finish_compiled_replacement(self, retired_compiled_dir: Optional[Path], replaced: bool) -> None:
+        """
+        Drop the compiled MIBs set aside by replace_device_mibs, or put them back.
+
+        Args:
+            retired_compiled_dir: Directory holding the previous compiled MIBs, if any
+            replaced: Whether the new MIBs were swapped in
+        """
+        if retired_compiled_dir is None or not retired_compiled_dir.exists():
+            return
+
+        if not replaced:
+            try:
+                _unlink_files(self.compiled_mibs_dir)
+                _move_files(retired_compiled_dir, self.compiled_mibs_dir)
+            except OSError as e:
+                logger.error(f"Failed to restore compiled MIBs from {retired_compiled_dir}: {e}")
+                return
+        shutil.rmtree(retired_compiled_dir, ignore_errors=True)
+
     def _generate_all_mibs_data(self) -> Dict[str, Any]:
         """
         Generate combined data for ALL_MIBS virtual MIB.
@@ -770,14 +1659,14 @@ class MibService:
         """
         try:
             # Get all MIBs from both device and global directories
-            all_mibs = self.list_mibs()
+            all_mibs = self._list_summaries()
             combined_nodes = {}
             all_imports = set()
             mib_descriptions = []
 
             # Collect all nodes from all MIBs
-            for mib_info in all_mibs:
-                mib_name = mib_info['name']
+            for summary in all_mibs:
+                mib_name = summary.name
                 # Skip ALL_MIBS to avoid recursion
                 if mib_name == 'ALL_MIBS':
                     continue
@@ -850,26 +1739,12 @@ class MibService:
         Returns:
             MIB data dictionary or None if not found
         """
-        # Try to find the file in both directories
-        # First check global directory (standard MIBs)
-        json_file = self.global_output_dir / f"{mib_name}.json"
-        if not json_file.exists():
-            # Try with .mib.json extension
-            json_file = self.global_output_dir / f"{mib_name}.mib.json"
-
-        if not json_file.exists():
-            # Then check device-specific directory
-            json_file = self.output_dir / f"{mib_name}.json"
-            if not json_file.exists():
-                # Try with .mib.json extension
-                json_file = self.output_dir / f"{mib_name}.mib.json"
-
-        if not json_file.exists():
+        json_file = self._find_mib_json(mib_name)
+        if json_file is None:
             return None
 
         try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return _read_json_file(json_file)
         except Exception as e:
             logger.warning(f"Error loading MIB data from {json_file}: {e}")
             return None
\ No newline at end of file
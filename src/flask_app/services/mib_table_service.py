@@ -79,6 +79,7 @@ class MibTableService:
         self.device_service = device_service
         self._oid_cache = {}  # Cache for OID lookups
         self._table_structure_cache = {}  # Cache for table structures
+        self._table_oid_index = None  # Table OID -> (mib name, node name, node data)
 
         logger.info(f"Initialized MibTableService with device_type: {mib_service.device_type}")
 
@@ -497,33 +498,48 @@ class MibTableService:
         """Clear all internal caches."""
         self._oid_cache.clear()
         self._table_structure_cache.clear()
+        self._table_oid_index = None
         logger.info("MibTableService caches cleared")
 
     # Private helper methods
 
     def _find_exact_table_match(self, oid: str, device_type: str) -> Optional[TableMatchResult]:
         """Find exact table OID match."""
-        # Search through all MIBs for table nodes with matching OID
-        mibs = self.mib_service.list_mibs()
+        match = self._get_table_oid_index().get(oid)
+        if match is None:
+            return None
 
-        for mib_info in mibs:
-            mib_data = self.mib_service.get_mib_data(mib_info['name'])
-            if not mib_data or 'nodes' not in mib_data:
-                continue
+        mib_name, node_name, node_data = match
+        return TableMatchResult(
+            table_name=node_name,
+            table_oid=oid,
+            match_type="exact",
+            confidence=1.0,
+            mib_name=mib_name,
+            description=node_data.get('description')
+        )
 
-            for node_name, node_data in mib_data['nodes'].items():
-                if (node_data.get('is_table', False) and
-                    node_data.get('oid') == oid):
-                    return TableMatchResult(
-                        table_name=node_name,
-                        table_oid=oid,
-                        match_type="exact",
-                        confidence=1.0,
-                        mib_name=mib_info['name'],
-                        description=node_data.get('description')
-                    )
+    def _get_table_oid_index(self) -> Dict[str, Tuple[str, str, Dict[str, Any]]]:
+        """
+        Map the OID of every table node to its MIB, name and data.
 
-        return None
+        A single OID lookup probes many candidate OIDs (nearby and parent
+        tables), so all MIBs are scanned once and the index is kept until
+        clear_cache(). The first table carrying an OID wins, in list_mibs()
+        and node order.
+        """
+        if self._table_oid_index is None:
+            index = {}
+            for mib_info in self.mib_service.list_mibs():
+                mib_data = self.mib_service.get_mib_data(mib_info['name'])
+                if not mib_data or 'nodes' not in mib_data:
+                    continue
+
+                for node_name, node_data in mib_data['nodes'].items():
+                    if node_data.get('is_table', False):
+                        index.setdefault(node_data.get('oid'), (mib_info['name'], node_name, node_data))
+            self._table_oid_index = index
+        return self._table_oid_index
 
     def _find_table_from_entry(self, oid: str, device_type: str) -> Optional[TableMatchResult]:
         """Find table from entry OID."""
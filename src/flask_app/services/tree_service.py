@@ -2,6 +2,7 @@
 Service for building and managing tree structures from MIB data.
 """
 
+from collections.abc import Mapping
 from typing import Dict, List, Any, Optional
 import logging
 
@@ -16,19 +17,23 @@ class TreeService:
         Build a hierarchical tree structure from flat MIB node data.
 
         Args:
-            mib_data: MIB data dictionary with nodes
+            mib_data: MIB data dictionary with nodes. ``nodes`` may be a dict or
+                an iterable of ``(name, data)`` pairs, which is consumed once
 
         Returns:
             Tree-structured data suitable for D3.js visualization
         """
         nodes = mib_data.get('nodes', {})
-        if not nodes:
-            return {'name': mib_data.get('name', 'Unknown'), 'children': []}
+        if isinstance(nodes, Mapping):
+            nodes = nodes.items()
 
-        # Create a mapping from node name to node data, filtering out TC nodes
+        # Create a mapping from node name to node data, filtering out TC nodes.
+        # Only the OID is kept from the source data so it can be released early.
         node_map = {}
-        original_nodes = {}  # Store reference to original data
-        for name, data in nodes.items():
+        node_oids = []
+        has_nodes = False
+        for name, data in nodes:
+            has_nodes = True
             # Skip Textual Convention (TC) nodes - they shouldn't appear in the tree
             if data.get('class') == 'textualconvention':
                 continue
@@ -55,42 +60,34 @@ class TreeService:
                 'mib_origin': mib_origin,
                 'children': []
             }
-            original_nodes[name] = data  # Keep reference to original data
+            node_oids.append((name, data.get('oid', '')))
+
+        if not has_nodes:
+            return {'name': mib_data.get('name', 'Unknown'), 'children': []}
 
         # Build parent-child relationships based on OID hierarchy
         root_nodes = []
         processed_nodes = set()
 
-        # First, sort nodes by OID length to process parents before children
-        # Note: We need to filter out TC nodes here as well
-        filtered_nodes = {name: data for name, data in nodes.items()
-                         if data.get('class') != 'textualconvention'}
+        oid_index = self._build_oid_index(node_map)
 
+        # First, sort nodes by OID length to process parents before children
         sorted_nodes = sorted(
-            filtered_nodes.items(),
-            key=lambda x: len(x[1].get('oid', '').split('.')) if x[1].get('oid') else 0
+            node_oids,
+            key=lambda x: x[1].count('.') + 1 if x[1] else 0
         )
 
-        for node_name, node_data in sorted_nodes:
+        # Every node is attached exactly once, either to its closest ancestor
+        # found through the OID index or to the root list
+        for node_name, oid in sorted_nodes:
             if node_name in processed_nodes:
                 continue
+            processed_nodes.add(node_name)
 
-            # Try to find parent by OID
-            oid = node_data.get('oid', '')
-            parent_node = self._find_parent_by_oid(oid, node_map) if oid else None
-
+            parent_node = self._find_parent_by_oid(oid, node_map, oid_index) if oid else None
             if parent_node:
-                # Add this node as child of parent
                 parent_node['children'].append(node_map[node_name])
-                processed_nodes.add(node_name)
             else:
-                # No parent found, treat as root
-                root_nodes.append(node_map[node_name])
-                processed_nodes.add(node_name)
-
-        # Process any remaining nodes
-        for node_name in node_map:
-            if node_name not in processed_nodes:
                 root_nodes.append(node_map[node_name])
 
         # Build the tree structure
@@ -160,14 +157,12 @@ class TreeService:
         if not nodes:
             return []
 
-        # Filter out TC nodes first
-        filtered_nodes = {name: data for name, data in nodes.items()
-                         if data.get('class') != 'textualconvention'}
-
-        # Sort nodes by OID length (shorter OIDs are likely closer to root)
+        # Filter out TC nodes and sort the rest by OID length (shorter OIDs are
+        # likely closer to root)
         sorted_nodes = sorted(
-            filtered_nodes.items(),
-            key=lambda x: len(x[1].get('oid', '').split('.')) if x[1].get('oid') else 0
+            ((name, data) for name, data in nodes.items()
+             if data.get('class') != 'textualconvention'),
+            key=lambda x: x[1]['oid'].count('.') + 1 if x[1].get('oid') else 0
         )
 
         node_map = {}
@@ -191,6 +186,7 @@ class TreeService:
 
         # Build relationships based on OID hierarchy
         root_nodes = []
+        oid_index = self._build_oid_index(node_map)
 
         for node_name, node_data in sorted_nodes:
             node = node_map[node_name]
@@ -202,7 +198,7 @@ class TreeService:
                 continue
 
             # Try to find parent by OID
-            parent_node = self._find_parent_by_oid(oid, node_map)
+            parent_node = self._find_parent_by_oid(oid, node_map, oid_index)
 
             if parent_node:
                 parent_node['children'].append(node)
@@ -212,39 +208,47 @@ class TreeService:
 
         return root_nodes
 
-    def _find_parent_by_oid(self, child_oid: str, node_map: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def _find_parent_by_oid(self, child_oid: str, node_map: Dict[str, Any],
+                            oid_index: Optional[Dict[str, Dict[str, Any]]] = None) -> Optional[Dict[str, Any]]:
         """
         Find parent node based on OID hierarchy.
 
         Args:
             child_oid: OID of the child node
             node_map: Mapping of all nodes
+            oid_index: OID to node mapping from _build_oid_index(node_map); built
+                on the fly when omitted, so callers looking up many nodes should
+                pass it in
 
         Returns:
             Parent node if found, None otherwise
         """
-        child_parts = child_oid.split('.')
-        if len(child_parts) <= 2:  # Need at least 2 parts to have a meaningful parent
+        if child_oid.count('.') < 2:  # Need at least 2 parts to have a meaningful parent
             return None
 
-        # Try to find a parent with OID that's exactly one level higher
-        # For child like 1.3.6.1.4.1.2011.2.25.3.40.50.20, look for 1.3.6.1.4.1.2011.2.25.3.40.50
-        parent_oid = '.'.join(child_parts[:-1])  # Remove last part
-
-        # Look for exact OID match first
-        for node in node_map.values():
-            if node['oid'] == parent_oid:
+        if oid_index is None:
+            oid_index = self._build_oid_index(node_map)
+
+        # Look for the parent exactly one level higher first, then the closest
+        # ancestor. For child 1.3.6.1.4.1.2011.2.25.3.40.50.20, try
+        # 1.3.6.1.4.1.2011.2.25.3.40.50, then 1.3.6.1.4.1.2011.2.25.3.40, ...
+        prefix = child_oid
+        while True:
+            cut = prefix.rfind('.')
+            if cut == -1:
+                return None
+            prefix = prefix[:cut]
+            node = oid_index.get(prefix)
+            if node is not None:
                 return node
 
-        # If no exact match, try to find the closest parent by checking prefixes
-        for i in range(len(child_parts) - 2, 0, -1):
-            potential_parent_oid = '.'.join(child_parts[:i])
-
-            for node in node_map.values():
-                if node['oid'] == potential_parent_oid:
-                    return node
-
-        return None
+    @staticmethod
+    def _build_oid_index(node_map: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Map each OID to the first node in node_map carrying it."""
+        oid_index = {}
+        for node in node_map.values():
+            oid_index.setdefault(node['oid'], node)
+        return oid_index
 
     def _calculate_tree_statistics(self, node_map: Dict[str, Any], root_nodes: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -284,29 +288,37 @@ class TreeService:
 
     def _calculate_depth(self, node: Dict[str, Any], current_depth: int = 0) -> int:
         """
-        Recursively calculate the maximum depth from a given node.
+        Calculate the maximum depth from a given node.
+
+        The tree is walked with an explicit stack, so deep MIB trees cannot
+        hit the recursion limit.
 
         Args:
             node: Node to calculate depth from
-            current_depth: Current depth in the recursion
+            current_depth: Depth of the given node
 
         Returns:
-            Maximum depth from this node
+            Depth of the deepest leaf below this node, counting the leaf itself
         """
-        if not node['children']:
-            return current_depth + 1
-
-        max_child_depth = 0
-        for child in node['children']:
-            child_depth = self._calculate_depth(child, current_depth + 1)
-            max_child_depth = max(max_child_depth, child_depth)
+        max_depth = 0
+        stack = [(node, current_depth + 1)]
+        while stack:
+            node, depth = stack.pop()
+            children = node['children']
+            if children:
+                stack.extend((child, depth + 1) for child in children)
+            elif depth > max_depth:
+                max_depth = depth
 
-        return max_child_depth
+        return max_depth
 
     def flatten_tree(self, node: Dict[str, Any], include_paths: bool = True) -> List[Dict[str, Any]]:
         """
         Flatten a tree structure into a list of nodes with optional path information.
 
+        Nodes are listed in depth-first pre-order, walked with an explicit
+        stack so deep trees cannot hit the recursion limit.
+
         Args:
             node: Root node of the tree
             include_paths: Whether to include full OID paths for each node
@@ -315,32 +327,26 @@ class TreeService:
             List of flattened node data
         """
         flat_list = []
-        self._flatten_node(node, flat_list, path=[] if include_paths else None)
-        return flat_list
+        # (node, path of its parent); the path is None without include_paths
+        stack = [(node, [] if include_paths else None)]
 
-    def _flatten_node(self, node: Dict[str, Any], flat_list: List[Dict[str, Any]], path: Optional[List[str]] = None):
-        """
-        Recursively flatten a node and its children.
+        while stack:
+            node, path = stack.pop()
+            node_data = dict(node)
 
-        Args:
-            node: Node to flatten
-            flat_list: List to add flattened nodes to
-            path: Current path for this node (if include_paths is True)
-        """
-        node_data = dict(node)
+            if path is not None:
+                path = path + [node['name']]
+                node_data['path'] = path
+                node_data['path_string'] = ' -> '.join(path)
+            else:
+                node_data.pop('children', None)  # Remove children from flattened version
 
-        if path is not None:
-            current_path = path + [node['name']]
-            node_data['path'] = current_path
-            node_data['path_string'] = ' -> '.join(current_path)
-        else:
-            del node_data['children']  # Remove children from flattened version
+            flat_list.append(node_data)
 
-        flat_list.append(node_data)
+            # Push children in reverse so they are visited in order; leaves,
+            # the bulk of a MIB tree, skip this entirely
+            children = node.get('children')
+            if children:
+                stack.extend((child, path) for child in reversed(children))
 
-        # Process children
-        for child in node.get('children', []):
-            if path is not None:
-                self._flatten_node(child, flat_list, current_path)
-            else:
-                self._flatten_node(child, flat_list, None)
\ No newline at end of file
+        return flat_list
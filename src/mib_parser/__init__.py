@@ -4,11 +4,31 @@ MIB Parser Library
 A Python library for parsing MIB files using pysmi and exporting to JSON format.
 """
 
-from .parser import MibParser
-from .serializer import JsonSerializer
-from .tree import MibTree
-from .models import MibNode, MibData
-from .dependency_resolver import MibDependencyResolver
+import importlib
 
 __version__ = "0.1.0"
-__all__ = ["MibParser", "JsonSerializer", "MibTree", "MibNode", "MibData", "MibDependencyResolver"]
\ No newline at end of file
+__all__ = ["MibParser", "JsonSerializer", "MibTree", "MibNode", "MibData", "MibDependencyResolver"]
+
+# Public names and the submodules defining them. They are imported on first
+# access, so loading the serializer or models does not pull in pysmi.
+_EXPORTS = {
+    "MibParser": ".parser",
+    "JsonSerializer": ".serializer",
+    "MibTree": ".tree",
+    "MibNode": ".models",
+    "MibData": ".models",
+    "MibDependencyResolver": ".dependency_resolver",
+}
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
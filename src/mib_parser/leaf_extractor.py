@@ -9,7 +9,11 @@ from typing import Dict, List, Optional, Set, Tuple
 from datetime import datetime
 
 from src.mib_parser.models import MibNode, MibData
-from src.mib_parser.parser import MibParser
+from src.mib_parser.serializer import json_loads
+
+# 输出目录中不是 MIB 的辅助 JSON 文件（与 DeviceService 统计 MIB 数量时的规则一致）
+_AUXILIARY_SUFFIXES = ("_oids.json", "_tree.json")
+_AUXILIARY_FILES = {"all_mibs.json", "all_oids_mapping.json", "statistics_report.json"}
 
 
 class LeafNodeExtractor:
@@ -71,9 +75,11 @@ class LeafNodeExtractor:
 
         # 遍历所有MIB文件
         for mib_file in output_path.glob("*.json"):
+            if mib_file.name.endswith(_AUXILIARY_SUFFIXES) or mib_file.name in _AUXILIARY_FILES:
+                continue
+
             try:
-                with open(mib_file, 'r', encoding='utf-8') as f:
-                    mib_data = json.load(f)
+                mib_data = json_loads(mib_file.read_bytes())
 
                 # 提取叶子节点
                 extracted_nodes = self._extract_leaf_nodes_from_mib(mib_data, device_name, mib_file.stem)
@@ -112,20 +118,15 @@ class LeafNodeExtractor:
         # 基于OID结构构建父子关系
         parent_to_children = {}
         for oid, node in oid_to_node.items():
-            # 查找父节点：去掉最后一个OID段
-            oid_parts = oid.split('.')
-            if len(oid_parts) > 1:
-                parent_oid = '.'.join(oid_parts[:-1])
-                # 查找父节点
-                for potential_parent_oid, potential_parent_node in oid_to_node.items():
-                    if potential_parent_oid == parent_oid:
-                        # 找到父节点，建立关系
-                        if potential_parent_node.name not in parent_to_children:
-                            parent_to_children[potential_parent_node.name] = []
-                        parent_to_children[potential_parent_node.name].append(node)
-                        # 设置节点的父节点名称
-                        node.parent_name = potential_parent_node.name
-                        break
+            # 查找父节点：去掉最后一个OID段，直接按OID字典查找
+            parent_oid, sep, _ = oid.rpartition('.')
+            if sep:
+                parent_node = oid_to_node.get(parent_oid)
+                if parent_node is not None:
+                    # 找到父节点，建立关系
+                    parent_to_children.setdefault(parent_node.name, []).append(node)
+                    # 设置节点的父节点名称
+                    node.parent_name = parent_node.name
 
         # 查找符合条件的叶子节点
         for node_name, node_info in nodes.items():
@@ -219,9 +220,8 @@ class LeafNodeExtractor:
         current_node = name_to_node.get(node_name)
         if current_node and current_node.oid:
             # 获取当前节点的OID前缀（去掉最后一个数字）
-            oid_parts = current_node.oid.split('.')
-            if len(oid_parts) > 1:
-                base_oid = '.'.join(oid_parts[:-1])
+            base_oid, sep, _ = current_node.oid.rpartition('.')
+            if sep:
 
                 # 查找所有具有相同前缀的节点
                 for sibling_name, sibling_node in name_to_node.items():
@@ -3,12 +3,60 @@ JSON serialization utilities for MIB data.
 """
 
 import json
+import os
+import threading
 from pathlib import Path
-from typing import List, Dict, Any, Union
+from typing import List, Dict, Any, Tuple, Union
 from datetime import datetime
 
 from src.mib_parser.models import MibData, MibNode
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup, fall back to stdlib json
+    orjson = None
+
+
+def json_loads(raw: bytes) -> Any:
+    """
+    Parse JSON from raw file bytes.
+
+    Uses orjson when it is installed, otherwise the stdlib parser. Both raise a
+    json.JSONDecodeError subclass on malformed input.
+    """
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def write_bytes(path: Path, data: bytes) -> None:
+    """
+    Atomically replace path with an encoded document.
+
+    The bytes go to a temporary file in the same directory with unbuffered
+    os.write calls, which is then renamed over path. Readers see either the
+    old or the new file, never a partly written one. The temporary name
+    carries the process and thread id, so concurrent writers of the same
+    path never share a temporary file.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o666)
+    try:
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
 
 class JsonSerializer:
     """Handles serialization and deserialization of MIB data to/from JSON."""
@@ -24,13 +72,18 @@ class JsonSerializer:
         self.indent = indent
         self.ensure_ascii = ensure_ascii
 
-    def serialize(self, mib_data: Union[MibData, List[MibData]], file_path: str) -> None:
+    def serialize(self, mib_data: Union[MibData, List[MibData]], file_path: str,
+                  node_index: bool = False) -> None:
         """
         Serialize MIB data to JSON file.
 
         Args:
             mib_data: Single MibData or list of MibData objects
             file_path: Output JSON file path
+            node_index: Also write a ``.idx`` sidecar with the byte span of
+                every node and the listing header, so single nodes and MIB
+                summaries can be read without parsing the whole file (single
+                MIBs only)
         """
         if isinstance(mib_data, MibData):
             data = mib_data.to_dict()
@@ -58,8 +111,72 @@ class JsonSerializer:
         output_path = Path(file_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=self.indent, ensure_ascii=self.ensure_ascii)
+        if node_index and isinstance(mib_data, MibData) and self.indent is not None:
+            encoded, spans = self._encode_with_node_spans(data)
+            write_bytes(output_path, encoded)
+
+            stat = output_path.stat()
+            write_bytes(output_path.with_suffix('.idx'), json.dumps({
+                "source_size": stat.st_size,
+                "source_mtime_ns": stat.st_mtime_ns,
+                "nodes": spans,
+                # Listing fields, so MIB listings need not parse the whole file
+                "header": {
+                    "description": data.get("description"),
+                    "nodes_count": len(data.get("nodes") or {}),
+                    "imports_count": len(data.get("imports") or [])
+                }
+            }, ensure_ascii=self.ensure_ascii).encode('utf-8'))
+            return
+
+        write_bytes(output_path, self._encode(data))
+
+    def _encode(self, data: Any) -> bytes:
+        """Encode data to UTF-8 JSON in one pass with the C encoder."""
+        if orjson is not None and self.indent == 2 and not self.ensure_ascii:
+            # orjson's two-space layout matches json.dumps(indent=2)
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        return json.dumps(data, indent=self.indent, ensure_ascii=self.ensure_ascii).encode('utf-8')
+
+    def _encode_with_node_spans(self, data: Dict[str, Any]) -> Tuple[bytes, Dict[str, List[int]]]:
+        """
+        Encode data exactly like ``_encode`` would, recording node positions.
+
+        Args:
+            data: Single MIB dictionary with a ``nodes`` mapping
+
+        Returns:
+            Tuple of the UTF-8 encoded JSON and a mapping of node name to
+            ``[byte_offset, byte_length]`` of that node's object
+        """
+        pad = ' ' * self.indent
+
+        def dumps(value: Any, depth: int) -> bytes:
+            text = json.dumps(value, indent=self.indent, ensure_ascii=self.ensure_ascii)
+            # Nested values are indented one level per depth; raw newlines
+            # only ever appear between JSON tokens, never inside strings
+            return text.replace('\n', '\n' + pad * depth).encode('utf-8')
+
+        out = bytearray(b'{')
+        spans = {}
+        for i, (key, value) in enumerate(data.items()):
+            out += b',\n' if i else b'\n'
+            out += pad.encode('utf-8') + dumps(key, 0) + b': '
+            if key != 'nodes' or not value:
+                out += dumps(value, 1)
+                continue
+
+            out += b'{'
+            for j, (name, node) in enumerate(value.items()):
+                out += b',\n' if j else b'\n'
+                out += (pad * 2).encode('utf-8') + dumps(name, 0) + b': '
+                encoded = dumps(node, 2)
+                spans[name] = [len(out), len(encoded)]
+                out += encoded
+            out += b'\n' + pad.encode('utf-8') + b'}'
+        out += b'\n}' if data else b'}'
+
+        return bytes(out), spans
 
     def serialize_to_string(self, mib_data: Union[MibData, List[MibData]]) -> str:
         """
@@ -114,8 +231,7 @@ class JsonSerializer:
         if not input_path.exists():
             raise FileNotFoundError(f"JSON file not found: {file_path}")
 
-        with open(input_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = json_loads(input_path.read_bytes())
 
         return self._deserialize_data(data)
 
@@ -166,8 +282,7 @@ class JsonSerializer:
         output_path = Path(file_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(tree_data, f, indent=self.indent, ensure_ascii=self.ensure_ascii)
+        write_bytes(output_path, self._encode(tree_data))
 
     def _build_tree_structure(self, mib_data: MibData) -> Dict[str, Any]:
         """Build hierarchical tree structure from MIB data."""
@@ -239,5 +354,4 @@ class JsonSerializer:
         output_path = Path(file_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(mapping_data, f, indent=self.indent, ensure_ascii=self.ensure_ascii)
\ No newline at end of file
+        write_bytes(output_path, self._encode(mapping_data))
\ No newline at end of file
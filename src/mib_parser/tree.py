@@ -19,11 +19,27 @@ class MibTree:
             mib_data: MibData object containing the MIB structure
         """
         self.mib_data = mib_data
-        self._build_oid_cache()
-
-    def _build_oid_cache(self) -> None:
-        """Build a cache for fast OID lookups."""
-        self._oid_cache = {node.oid: node for node in self.mib_data.nodes.values()}
+        # OID -> node map for fast lookups, built by the first OID lookup
+        self._oid_cache: Optional[Dict[str, MibNode]] = None
+        # (node, lowercased name, lowercased description), built by the first pattern search
+        self._pattern_cache: Optional[List[Tuple[MibNode, str, str]]] = None
+        # Node name -> nodes from that node to the root, filled by path lookups
+        self._path_cache: Dict[str, Tuple[MibNode, ...]] = {}
+
+    def _build_oid_cache(self) -> Dict[str, MibNode]:
+        """Return the cache for fast OID lookups, building it on first use."""
+        if self._oid_cache is None:
+            self._oid_cache = {node.oid: node for node in self.mib_data.nodes.values()}
+        return self._oid_cache
+
+    def _build_pattern_cache(self) -> List[Tuple[MibNode, str, str]]:
+        """Return the lowercased search texts of all nodes, building them on first use."""
+        if self._pattern_cache is None:
+            self._pattern_cache = [
+                (node, node.name.lower(), node.description.lower() if node.description else '')
+                for node in self.mib_data.nodes.values()
+            ]
+        return self._pattern_cache
 
     def find_node_by_oid(self, oid: str) -> Optional[MibNode]:
         """
@@ -36,8 +52,9 @@ class MibTree:
             MibNode if found, None otherwise
         """
         # Exact match
-        if oid in self._oid_cache:
-            return self._oid_cache[oid]
+        node = self._build_oid_cache().get(oid)
+        if node is not None:
+            return node
 
         # Partial match (check if any node starts with this OID)
         for node in self.mib_data.nodes.values():
@@ -74,12 +91,12 @@ class MibTree:
         matching_nodes = []
         pattern_lower = pattern.lower()
 
-        for node in self.mib_data.nodes.values():
-            if search_names and pattern_lower in node.name.lower():
+        for node, name_lower, description_lower in self._build_pattern_cache():
+            if search_names and pattern_lower in name_lower:
                 matching_nodes.append(node)
                 continue
 
-            if search_descriptions and node.description and pattern_lower in node.description.lower():
+            if search_descriptions and description_lower and pattern_lower in description_lower:
                 matching_nodes.append(node)
 
         return matching_nodes
@@ -94,17 +111,29 @@ class MibTree:
         Returns:
             List of nodes from the starting node to the root
         """
-        path = []
-        current_node = self.mib_data.get_node_by_name(node_name)
+        # Walk up until the root or an ancestor whose path is already known
+        walked = []
+        path: Tuple[MibNode, ...] = ()
+        current_name = node_name
+        current_node = self.mib_data.get_node_by_name(current_name)
 
         while current_node:
-            path.append(current_node)
-            if current_node.parent_name:
-                current_node = self.mib_data.get_node_by_name(current_node.parent_name)
-            else:
+            cached = self._path_cache.get(current_name)
+            if cached is not None:
+                path = cached
                 break
+            walked.append((current_name, current_node))
+            if not current_node.parent_name:
+                break
+            current_name = current_node.parent_name
+            current_node = self.mib_data.get_node_by_name(current_name)
+
+        # Remember the path of every node passed on the way, nearest the root first
+        for name, node in reversed(walked):
+            path = (node,) + path
+            self._path_cache[name] = path
 
-        return path  # Path is from node to root
+        return list(path)  # Path is from node to root
 
     def get_path_from_root(self, node_name: str) -> List[MibNode]:
         """
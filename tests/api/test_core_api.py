@@ -67,6 +67,33 @@ class TestCoreAPI:
             data = json.loads(response.data)
             assert data['success'] is False
 
+    def test_get_mib_node_success(self, client):
+        """Test GET /api/mibs/<name>/nodes/<node> with valid node."""
+        with patch('src.flask_app.routes.api.mib_service') as mock_service:
+            mock_service.get_mib_node.return_value = {
+                'name': 'sysDescr',
+                'oid': '1.3.6.1.2.1.1.1'
+            }
+
+            response = client.get('/api/mibs/TEST-MIB/nodes/sysDescr')
+
+            assert response.status_code == 200
+            data = json.loads(response.data)
+            assert data['success'] is True
+            assert data['data']['oid'] == '1.3.6.1.2.1.1.1'
+            mock_service.get_mib_node.assert_called_once_with('TEST-MIB', 'sysDescr')
+
+    def test_get_mib_node_not_found(self, client):
+        """Test GET /api/mibs/<name>/nodes/<node> with non-existent node."""
+        with patch('src.flask_app.routes.api.mib_service') as mock_service:
+            mock_service.get_mib_node.return_value = None
+
+            response = client.get('/api/mibs/TEST-MIB/nodes/missing')
+
+            assert response.status_code == 404
+            data = json.loads(response.data)
+            assert data['success'] is False
+
     def test_list_mibs_minimal(self, client):
         """Test GET /api/mibs returns minimal info by default."""
         with patch('src.flask_app.routes.api.mib_service') as mock_service:
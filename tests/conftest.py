@@ -44,6 +44,30 @@ def temp_directory() -> Generator[Path, None, None]:
             shutil.rmtree(temp_dir)
 
 
+@pytest.fixture
+def fast_tmp(tmp_path_factory, request) -> Generator[Path, None, None]:
+    """
+    提供轻量临时目录的 fixture
+
+    以测试名（非编号）在会话基础目录下创建目录，测试结束后立即删除，
+    避免 tmp_path 的编号目录扫描和历史目录保留开销。
+
+    Yields:
+        Path: 临时目录路径对象
+
+    Example:
+        def test_something(fast_tmp):
+            (fast_tmp / "test.txt").write_text("content")
+    """
+    import shutil
+
+    path = tmp_path_factory.mktemp(request.node.name, numbered=False)
+    try:
+        yield path
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+
 @pytest.fixture
 def sample_mib_node():
     """
@@ -91,12 +115,13 @@ def sample_index_field():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_mib_data():
     """
     提供示例 MIB 数据的 fixture
 
-    返回一个包含示例节点的 MIB 数据容器。
+    返回一个包含示例节点的 MIB 数据容器。整个测试会话共享同一个实例，
+    使用方不得修改它。
 
     Returns:
         MibData: 包含示例节点的 MIB 数据
@@ -138,7 +163,7 @@ def sample_mib_data():
     return mib_data
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def fixtures_dir() -> Path:
     """
     返回测试夹具目录的路径
@@ -95,3 +95,20 @@ class TestLeafNodeExtractor:
         result = extractor._extract_device_leaf_nodes("test-device")
 
         assert isinstance(result, list)
+
+    def test_extract_device_leaf_nodes_skips_auxiliary_files(self, tmp_path, monkeypatch):
+        """Test that sidecar files such as _oids.json are not read as MIBs."""
+        device_path = tmp_path / "devices" / "test-device" / "output"
+        device_path.mkdir(parents=True)
+        (device_path / "TEST-MIB.json").write_text(json.dumps({"name": "TEST-MIB", "nodes": {}}))
+        (device_path / "_oids.json").write_text(json.dumps({"TEST-MIB": {}}))
+        (device_path / "statistics_report.json").write_text("{}")
+
+        extractor = LeafNodeExtractor(storage_path=str(tmp_path))
+        seen = []
+        monkeypatch.setattr(extractor, "_extract_leaf_nodes_from_mib",
+                            lambda mib_data, device_name, mib_name: seen.append(mib_name) or [])
+
+        extractor._extract_device_leaf_nodes("test-device")
+
+        assert seen == ["TEST-MIB"]
@@ -0,0 +1,147 @@
+"""
+Shared setup for the service layer tests.
+
+The services import pysmi (through the parser) and the bare ``mib_parser``
+package at module level. Stub modules are installed here, when pytest loads
+this conftest and before it imports the test modules in this directory, so
+the services can be imported without the real parsing stack. Real modules
+that are already imported are left alone.
+"""
+
+import json
+import os
+import shutil
+import sys
+import types
+from unittest.mock import MagicMock
+
+import pytest
+
+# One shared mock backs every stubbed name the services actually import
+_SHARED_MOCK = MagicMock()
+
+_STUB_MODULES = {
+    'pysmi': ('debug',),
+    'pysmi.compiler': ('MibCompiler',),
+    'pysmi.parser': ('SmiStarParser',),
+    'pysmi.writer': ('FileWriter',),
+    'pysmi.codegen': ('JsonCodeGen',),
+    'pysmi.reader': ('FileReader',),
+    'pysmi.error': (),
+    'pysmi.borrower': ('AnyFileBorrower',),
+    'mib_parser': (),
+    'mib_parser.leaf_extractor': ('LeafNodeExtractor',),
+}
+
+
+class _StubPySmiError(Exception):
+    """Stand-in for pysmi.error.PySmiError, usable in except clauses."""
+
+
+def _install_stub_modules():
+    """Register lightweight stub modules for names not imported yet."""
+    for name, attributes in _STUB_MODULES.items():
+        if name in sys.modules:
+            continue
+
+        module = types.ModuleType(name)
+        for attribute in attributes:
+            setattr(module, attribute, _SHARED_MOCK)
+        sys.modules[name] = module
+
+        # Link submodules to their package like a real import would
+        package, _, child = name.rpartition('.')
+        if package and isinstance(sys.modules.get(package), types.ModuleType):
+            setattr(sys.modules[package], child, module)
+
+    error_module = sys.modules['pysmi.error']
+    if not hasattr(error_module, 'PySmiError'):
+        error_module.PySmiError = _StubPySmiError
+
+
+_install_stub_modules()
+
+
+@pytest.fixture(autouse=True)
+def clear_shared_mib_caches():
+    """Empty the process-wide MibService caches after each test."""
+    yield
+    mib_service = sys.modules.get('src.flask_app.services.mib_service')
+    if mib_service is not None:
+        mib_service._clear_shared_caches()
+
+
+@pytest.fixture(scope='module')
+def mib_service_cls():
+    """MibService class, imported when the first test needing it runs."""
+    from src.flask_app.services.mib_service import MibService
+    return MibService
+
+
+# Read-only MIB JSON files shared by the loading tests, by file name
+_CANONICAL_MIB_FILES = {
+    "TEST-MIB.json": json.dumps({
+        "name": "TEST-MIB",
+        "module": "TEST",
+        "description": "Test MIB",
+        "nodes": {
+            "sysDescr": {
+                "oid": "1.3.6.1.2.1.1.1",
+                "name": "sysDescr",
+                "syntax": "DisplayString"
+            }
+        },
+        "imports": ["SNMPv2-TC"]
+    }),
+    "CACHE-MIB.json": json.dumps({"name": "CACHE-MIB", "module": "CACHE", "nodes": {}}),
+    "EXT-MIB.mib.json": json.dumps({"name": "EXT-MIB", "module": "EXT", "nodes": {}}),
+    "DIRECT-MIB.json": json.dumps({"name": "DIRECT-MIB", "module": "DIRECT", "nodes": {}}),
+    "INVALID-MIB.json": "{invalid json content",
+    "MIB1.json": json.dumps({"name": "MIB1", "nodes": {}}),
+    "MIB2.json": json.dumps({"name": "MIB2", "nodes": {}}),
+    "MIB3.json": json.dumps({"name": "MIB3", "nodes": {}}),
+}
+
+
+@pytest.fixture(scope='session')
+def canonical_mibs(tmp_path_factory):
+    """Directory with the canonical MIB JSON files, written once per session."""
+    base = tmp_path_factory.mktemp('mibs_base')
+    for name, content in _CANONICAL_MIB_FILES.items():
+        (base / name).write_text(content)
+    return base
+
+
+@pytest.fixture
+def mib_dir(canonical_mibs, tmp_path):
+    """
+    tmp_path populated with the canonical MIB files as hard links.
+
+    The files are shared with other tests and must not be written to; tests
+    that modify a MIB should create their own file instead.
+    """
+    for entry in os.scandir(canonical_mibs):
+        try:
+            os.link(entry.path, tmp_path / entry.name)
+        except OSError:
+            shutil.copy2(entry.path, tmp_path / entry.name)
+    return tmp_path
+
+
+class _FakeTreeService:
+    """TreeService stand-in that records build_tree_structure calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def build_tree_structure(self, mib_data):
+        self.calls += 1
+        return {"name": mib_data.get("name"), "children": []}
+
+
+@pytest.fixture
+def fake_tree_service(monkeypatch):
+    """Patch TreeService with a call-counting stub and return the instance."""
+    tree_service = _FakeTreeService()
+    monkeypatch.setattr("src.flask_app.services.tree_service.TreeService", lambda: tree_service)
+    return tree_service
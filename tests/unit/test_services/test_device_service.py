@@ -9,27 +9,27 @@ from src.flask_app.services.device_service import DeviceService, DeviceInfo
 class TestDeviceService:
     """Test DeviceService class."""
 
-    def test_service_initialization(self, tmp_path):
+    def test_service_initialization(self, fast_tmp):
         """Test DeviceService initialization."""
-        service = DeviceService(storage_root=tmp_path)
+        service = DeviceService(storage_root=fast_tmp)
 
-        assert service.storage_root == tmp_path
-        assert service.devices_dir == tmp_path / "devices"
-        assert service.uploads_dir == tmp_path / "uploads"
-        assert service.temp_dir == tmp_path / "uploads" / "temp"
-        assert service.registry_file == tmp_path / "device_registry.json"
+        assert service.storage_root == fast_tmp
+        assert service.devices_dir == fast_tmp / "devices"
+        assert service.uploads_dir == fast_tmp / "uploads"
+        assert service.temp_dir == fast_tmp / "uploads" / "temp"
+        assert service.registry_file == fast_tmp / "device_registry.json"
 
-    def test_directories_created_on_init(self, tmp_path):
+    def test_directories_created_on_init(self, fast_tmp):
         """Test that required directories are created."""
-        service = DeviceService(storage_root=tmp_path)
+        service = DeviceService(storage_root=fast_tmp)
 
         assert service.devices_dir.exists()
         assert service.uploads_dir.exists()
         assert service.temp_dir.exists()
 
-    def test_registry_file_created(self, tmp_path):
+    def test_registry_file_created(self, fast_tmp):
         """Test that registry file is created if it doesn't exist."""
-        service = DeviceService(storage_root=tmp_path)
+        service = DeviceService(storage_root=fast_tmp)
 
         assert service.registry_file.exists()
 
@@ -39,24 +39,24 @@ class TestDeviceService:
         assert registry["current_device"] == "default"
         assert registry["version"] == "1.0"
 
-    def test_list_devices_empty(self, tmp_path):
+    def test_list_devices_empty(self, fast_tmp):
         """Test list_devices with no devices."""
-        service = DeviceService(storage_root=tmp_path)
+        service = DeviceService(storage_root=fast_tmp)
 
         devices = service.list_devices()
 
         assert devices == []
 
-    def test_create_device_success(self, tmp_path):
+    def test_create_device_success(self, fast_tmp):
         """Test successful device creation."""
-        service = DeviceService(storage_root=tmp_path)
+        service = DeviceService(storage_root=fast_tmp)
 
         result = service.create_device("test-device", "Test Device", "Test Description")
 
         assert result is True
 
         # Check device directory was created
-        device_dir = tmp_path / "devices" / "test-device"
+        device_dir = fast_tmp / "devices" / "test-device"
         assert device_dir.exists()
         assert (device_dir / "compiled_mibs").exists()
         assert (device_dir / "mibs_for_pysmi").exists()
@@ -69,9 +69,9 @@ class TestDeviceService:
         assert devices[0].display_name == "Test Device"
         assert devices[0].description == "Test Description"
 
-    def test_create_device_defaults(self, tmp_path):
+    def test_create_device_defaults(self, fast_tmp):
         """Test device creation with default values."""
-        service = DeviceService(storage_root=tmp_path)
+        service = DeviceService(storage_root=fast_tmp)
 
         result = service.create_device("default-device")
 
@@ -82,9 +82,9 @@ class TestDeviceService:
         assert devices[0].display_name == "default-device"
         assert devices[0].description == "MIB files for default-device"
 
-    def test_create_duplicate_device(self, tmp_path):
+    def test_create_duplicate_device(self, fast_tmp):
         """Test creating duplicate device fails."""
-        service = DeviceService(storage_root=tmp_path)
+        service = DeviceService(storage_root=fast_tmp)
 
         # Create first device
         service.create_device("test-device")
@@ -94,9 +94,9 @@ class TestDeviceService:
 
         assert result is False
 
-    def test_create_device_invalid_name(self, tmp_path):
+    def test_create_device_invalid_name(self, fast_tmp):
         """Test creating device with invalid name."""
-        service = DeviceService(storage_root=tmp_path)
+        service = DeviceService(storage_root=fast_tmp)
 
         with pytest.raises(ValueError, match="Invalid device name"):
             service.create_device("")
@@ -104,9 +104,9 @@ class TestDeviceService:
         with pytest.raises(ValueError, match="Invalid device name"):
             service.create_device("   ")
 
-    def test_delete_device_success(self, tmp_path):
+    def test_delete_device_success(self, fast_tmp):
         """Test successful device deletion."""
-        service = DeviceService(storage_root=tmp_path)
+        service = DeviceService(storage_root=fast_tmp)
 
         # Create device
         service.create_device("test-device")
@@ -119,26 +119,26 @@ class TestDeviceService:
         assert len(service.list_devices()) == 0
 
         # Check directory was deleted
-        assert not (tmp_path / "devices" / "test-device").exists()
+        assert not (fast_tmp / "devices" / "test-device").exists()
 
-    def test_delete_default_device_forbidden(self, tmp_path):
+    def test_delete_default_device_forbidden(self, fast_tmp):
         """Test that default device cannot be deleted."""
-        service = DeviceService(storage_root=tmp_path)
+        service = DeviceService(storage_root=fast_tmp)
 
         with pytest.raises(ValueError, match="Cannot delete default device"):
             service.delete_device("default")
 
-    def test_delete_nonexistent_device(self, tmp_path):
+    def test_delete_nonexistent_device(self, fast_tmp):
         """Test deleting non-existent device."""
-        service = DeviceService(storage_root=tmp_path)
+        service = DeviceService(storage_root=fast_tmp)
 
         result = service.delete_device("nonexistent")
 
         assert result is False
 
-    def test_get_device_info_found(self, tmp_path):
+    def test_get_device_info_found(self, fast_tmp):
         """Test getting info for existing device."""
-        service = DeviceService(storage_root=tmp_path)
+        service = DeviceService(storage_root=fast_tmp)
 
         service.create_device("test-device", "Test Device")
 
@@ -148,17 +148,17 @@ class TestDeviceService:
         assert info.name == "test-device"
         assert info.display_name == "Test Device"
 
-    def test_get_device_info_not_found(self, tmp_path):
+    def test_get_device_info_not_found(self, fast_tmp):
         """Test getting info for non-existent device."""
-        service = DeviceService(storage_root=tmp_path)
+        service = DeviceService(storage_root=fast_tmp)
 
         info = service.get_device_info("nonexistent")
 
         assert info is None
 
-    def test_device_mib_count_updates(self, tmp_path):
+    def test_device_mib_count_updates(self, fast_tmp):
         """Test that mib_count reflects actual files."""
-        service = DeviceService(storage_root=tmp_path)
+        service = DeviceService(storage_root=fast_tmp)
 
         service.create_device("test-device")
 
@@ -167,7 +167,7 @@ class TestDeviceService:
         assert devices[0].mib_count == 0
 
         # Add MIB files to output directory
-        output_dir = tmp_path / "devices" / "test-device" / "output"
+        output_dir = fast_tmp / "devices" / "test-device" / "output"
         (output_dir / "MIB1.json").write_text('{"name": "MIB1"}')
         (output_dir / "MIB2.json").write_text('{"name": "MIB2"}')
         # Add auxiliary files that should be excluded
@@ -178,17 +178,17 @@ class TestDeviceService:
         devices = service.list_devices()
         assert devices[0].mib_count == 2
 
-    def test_get_current_device_default(self, tmp_path):
+    def test_get_current_device_default(self, fast_tmp):
         """Test getting current device defaults to 'default'."""
-        service = DeviceService(storage_root=tmp_path)
+        service = DeviceService(storage_root=fast_tmp)
 
         current = service.get_current_device()
 
         assert current == "default"
 
-    def test_set_current_device(self, tmp_path):
+    def test_set_current_device(self, fast_tmp):
         """Test setting current device."""
-        service = DeviceService(storage_root=tmp_path)
+        service = DeviceService(storage_root=fast_tmp)
 
         # Create a device
         service.create_device("test-device")
@@ -199,17 +199,17 @@ class TestDeviceService:
         assert result is True
         assert service.get_current_device() == "test-device"
 
-    def test_set_current_nonexistent_device(self, tmp_path):
+    def test_set_current_nonexistent_device(self, fast_tmp):
         """Test setting non-existent device as current fails."""
-        service = DeviceService(storage_root=tmp_path)
+        service = DeviceService(storage_root=fast_tmp)
 
         result = service.set_current_device("nonexistent")
 
         assert result is False
 
-    def test_device_exists(self, tmp_path):
+    def test_device_exists(self, fast_tmp):
         """Test device_exists method."""
-        service = DeviceService(storage_root=tmp_path)
+        service = DeviceService(storage_root=fast_tmp)
 
         assert not service.device_exists("test-device")
 
@@ -217,9 +217,9 @@ class TestDeviceService:
 
         assert service.device_exists("test-device")
 
-    def test_get_device_paths(self, tmp_path):
+    def test_get_device_paths(self, fast_tmp):
         """Test getting device paths."""
-        service = DeviceService(storage_root=tmp_path)
+        service = DeviceService(storage_root=fast_tmp)
 
         service.create_device("test-device")
 
@@ -229,22 +229,22 @@ class TestDeviceService:
         assert "compiled_mibs" in paths
         assert "output" in paths
         assert "metadata" in paths
-        assert paths["device_dir"] == tmp_path / "devices" / "test-device"
+        assert paths["device_dir"] == fast_tmp / "devices" / "test-device"
 
-    def test_get_device_paths_default(self, tmp_path):
+    def test_get_device_paths_default(self, fast_tmp):
         """Test getting device paths for current device."""
-        service = DeviceService(storage_root=tmp_path)
+        service = DeviceService(storage_root=fast_tmp)
 
         service.create_device("test-device")
         service.set_current_device("test-device")
 
         paths = service.get_device_paths()
 
-        assert paths["device_dir"] == tmp_path / "devices" / "test-device"
+        assert paths["device_dir"] == fast_tmp / "devices" / "test-device"
 
-    def test_update_device_metadata(self, tmp_path):
+    def test_update_device_metadata(self, fast_tmp):
         """Test updating device metadata."""
-        service = DeviceService(storage_root=tmp_path)
+        service = DeviceService(storage_root=fast_tmp)
 
         service.create_device("test-device")
 
@@ -261,17 +261,17 @@ class TestDeviceService:
         assert device["mib_count"] == 5
         assert "updated_at" in device
 
-    def test_update_nonexistent_device_metadata(self, tmp_path):
+    def test_update_nonexistent_device_metadata(self, fast_tmp):
         """Test updating metadata for non-existent device."""
-        service = DeviceService(storage_root=tmp_path)
+        service = DeviceService(storage_root=fast_tmp)
 
         result = service.update_device_metadata("nonexistent", mib_count=5)
 
         assert result is False
 
-    def test_delete_current_device_switches_to_default(self, tmp_path):
+    def test_delete_current_device_switches_to_default(self, fast_tmp):
         """Test that deleting current device switches to default."""
-        service = DeviceService(storage_root=tmp_path)
+        service = DeviceService(storage_root=fast_tmp)
 
         # Create and set current device
         service.create_device("test-device")
@@ -283,9 +283,9 @@ class TestDeviceService:
         # Should switch back to default
         assert service.get_current_device() == "default"
 
-    def test_get_device_mib_service(self, tmp_path):
+    def test_get_device_mib_service(self, fast_tmp):
         """Test getting MibService for a device."""
-        service = DeviceService(storage_root=tmp_path)
+        service = DeviceService(storage_root=fast_tmp)
 
         service.create_device("test-device")
 
@@ -293,4 +293,4 @@ class TestDeviceService:
 
         assert mib_service is not None
         assert mib_service.device_type == "test-device"
-        assert str(mib_service.output_dir) == str(tmp_path / "devices" / "test-device" / "output")
+        assert str(mib_service.output_dir) == str(fast_tmp / "devices" / "test-device" / "output")
@@ -2,37 +2,24 @@
 
 import pytest
 import json
-import sys
 from pathlib import Path
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 
-# Mock pysmi modules before importing anything
-sys.modules['pysmi'] = MagicMock()
-sys.modules['pysmi.compiler'] = MagicMock()
-sys.modules['pysmi.parser'] = MagicMock()
-sys.modules['pysmi.writer'] = MagicMock()
-sys.modules['pysmi.codegen'] = MagicMock()
-sys.modules['pysmi.reader'] = MagicMock()
-sys.modules['pysmi.error'] = MagicMock()
-sys.modules['pysmi.borrower'] = MagicMock()
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-# Mock mib_parser modules
-sys.modules['mib_parser'] = MagicMock()
-sys.modules['mib_parser.parser'] = MagicMock()
-sys.modules['mib_parser.serializer'] = MagicMock()
-sys.modules['mib_parser.leaf_extractor'] = MagicMock()
 
-# Add to src namespace
-import src
-src.mib_parser = sys.modules['mib_parser']
-
-from src.flask_app.services.mib_service import MibService
+def write_mib(path, data):
+    """Write MIB data to path as JSON bytes."""
+    path.write_bytes(orjson.dumps(data) if orjson else json.dumps(data).encode())
 
 
 class TestMibServiceAdvanced:
     """Test MibService advanced methods."""
 
-    def test_get_all_mibs_tree_data(self, tmp_path):
+    def test_get_all_mibs_tree_data(self, mib_service_cls, tmp_path, fake_tree_service):
         """Test getting tree data for all MIBs combined."""
         # Create test MIB files
         output_dir = tmp_path / "output"
@@ -58,101 +45,102 @@ class TestMibServiceAdvanced:
         with open(output_dir / "MIB2.json", 'w') as f:
             json.dump(mib2_data, f)
 
-        with patch("src.flask_app.services.mib_service.Path.cwd", return_value=tmp_path):
-            service = MibService(output_dir=output_dir)
+        service = mib_service_cls(output_dir=output_dir, base_dir=tmp_path)
+
+        result = service.get_all_mibs_tree_data()
+
+        assert result is not None
+        assert result["name"] == "All MIBs"
+        assert fake_tree_service.calls == 1
+
+    def test_get_all_mibs_tree_data_parallel_load(self, mib_service_cls, tmp_path):
+        """Test that pooled MIB loading gives the same tree as serial loading."""
+        output_dir = tmp_path / "output"
+        output_dir.mkdir()
+        for i in range(3):
+            write_mib(output_dir / f"MIB{i}.json", {
+                "name": f"MIB{i}",
+                "nodes": {f"node{i}": {"oid": f"1.3.6.1.{i}", "name": f"node{i}"}}
+            })
+        (output_dir / "BROKEN.json").write_text("{not json")
 
-            with patch("src.flask_app.services.tree_service.TreeService") as mock_tree_svc:
-                mock_tree_service = MagicMock()
-                mock_tree_service.build_tree_structure.return_value = {
-                    "name": "All MIBs",
-                    "children": []
-                }
-                mock_tree_svc.return_value = mock_tree_service
+        service = mib_service_cls(output_dir=output_dir, base_dir=tmp_path)
 
-                result = service.get_all_mibs_tree_data()
+        serial = service.get_all_mibs_tree_data()
+        service.PARALLEL_LOAD_MIN_FILES = 0
+        parallel = service.get_all_mibs_tree_data()
 
-                assert result is not None
-                assert result["name"] == "All MIBs"
-                mock_tree_service.build_tree_structure.assert_called_once()
+        assert parallel == serial
+        assert [child["name"] for child in parallel["children"]] == ["node0", "node1", "node2"]
 
-    def test_get_all_mibs_tree_data_empty(self, tmp_path):
+    def test_get_all_mibs_tree_data_empty(self, mib_service_cls, tmp_path, fake_tree_service):
         """Test getting all MIBs tree data when no MIBs exist."""
         output_dir = tmp_path / "output"
         output_dir.mkdir()
 
-        with patch("src.flask_app.services.mib_service.Path.cwd", return_value=tmp_path):
-            service = MibService(output_dir=output_dir)
+        service = mib_service_cls(output_dir=output_dir, base_dir=tmp_path)
 
-            with patch("src.flask_app.services.tree_service.TreeService") as mock_tree_svc:
-                mock_tree_service = MagicMock()
-                mock_tree_service.build_tree_structure.return_value = {
-                    "name": "All MIBs",
-                    "children": []
-                }
-                mock_tree_svc.return_value = mock_tree_service
+        result = service.get_all_mibs_tree_data()
 
-                result = service.get_all_mibs_tree_data()
+        assert result is not None
+        assert fake_tree_service.calls == 1
 
-                assert result is not None
-
-    def test_fix_mib_syntax_with_common_issues(self, tmp_path):
+    def test_fix_mib_syntax_with_common_issues(self, mib_service_cls, tmp_path):
         """Test fixing common MIB syntax issues."""
         mib_file = tmp_path / "TEST.mib"
         # Write MIB with common syntax issues
-        mib_file.write_text("""
+        original = """
 TEST-MIB DEFINITIONS ::= BEGIN
 IMPORTS ObjectName FROM SNMPv2-TC;
 testObjectName ::= ObjectName
+corrErrAftFecAver15m OBJECT IDENTIFIER ::= { test 1 }
 END
-""")
+"""
+        mib_file.write_text(original)
 
-        with patch("src.flask_app.services.mib_service.Path.cwd", return_value=tmp_path):
-            service = MibService(output_dir=tmp_path / "output")
+        service = mib_service_cls(output_dir=tmp_path / "output", base_dir=tmp_path)
 
-            result = service._fix_mib_syntax(mib_file)
+        result = service._fix_mib_syntax(mib_file)
 
-            # Should apply fixes and return True
-            assert result is True
+        # Should apply fixes and return True
+        assert result is True
 
-            # Verify backup was created
-            backup_file = tmp_path / "TEST.mib.backup"
-            assert backup_file.exists()
+        # Verify backup was created and keeps the original content
+        backup_file = tmp_path / "TEST.mib.backup"
+        assert backup_file.exists()
+        assert backup_file.read_text() == original
+        assert "-- FIXED: corrErrAftFecAver15m" in mib_file.read_text()
 
-    def test_fix_mib_syntax_no_issues(self, tmp_path):
-        """Test fix_mib_syntax when no issues exist."""
+    def test_fix_mib_syntax_no_issues(self, mib_service_cls, tmp_path):
+        """Test fix_mib_syntax leaves clean files untouched."""
         mib_file = tmp_path / "TEST.mib"
-        # Note: The fix_mib_syntax method always normalizes END statement
-        # So it will return True even for clean files
         mib_file.write_text("TEST-MIB DEFINITIONS ::= BEGIN\nEND\n")
 
-        with patch("src.flask_app.services.mib_service.Path.cwd", return_value=tmp_path):
-            service = MibService(output_dir=tmp_path / "output")
+        service = mib_service_cls(output_dir=tmp_path / "output", base_dir=tmp_path)
 
-            result = service._fix_mib_syntax(mib_file)
+        result = service._fix_mib_syntax(mib_file)
 
-            # The method normalizes END statement, so it returns True
-            # and creates a backup file
-            assert result is True
-            # Verify backup was created due to END normalization
-            backup_file = tmp_path / "TEST.mib.backup"
-            assert backup_file.exists()
+        # Nothing to fix, so no rewrite and no backup
+        assert result is False
+        backup_file = tmp_path / "TEST.mib.backup"
+        assert not backup_file.exists()
+        assert mib_file.read_text() == "TEST-MIB DEFINITIONS ::= BEGIN\nEND\n"
 
-    def test_fix_mib_syntax_handles_errors(self, tmp_path):
+    def test_fix_mib_syntax_handles_errors(self, mib_service_cls, tmp_path):
         """Test error handling in fix_mib_syntax."""
         mib_file = tmp_path / "TEST.mib"
         mib_file.write_text("TEST-MIB DEFINITIONS ::= BEGIN\nEND\n")
 
-        with patch("src.flask_app.services.mib_service.Path.cwd", return_value=tmp_path):
-            service = MibService(output_dir=tmp_path / "output")
+        service = mib_service_cls(output_dir=tmp_path / "output", base_dir=tmp_path)
 
-            # Mock to raise an exception during file operations
-            with patch("builtins.open", side_effect=IOError("Permission denied")):
-                result = service._fix_mib_syntax(mib_file)
+        # Mock to raise an exception during file operations
+        with patch("builtins.open", side_effect=IOError("Permission denied")):
+            result = service._fix_mib_syntax(mib_file)
 
-                # Should return False on error
-                assert result is False
+            # Should return False on error
+            assert result is False
 
-    def test_replace_device_mibs_success(self, tmp_path):
+    def test_replace_device_mibs_success(self, mib_service_cls, tmp_path):
         """Test replacing device MIBs successfully."""
         # Create existing MIB files
         output_dir = tmp_path / "output"
@@ -162,33 +150,51 @@ END
 
         # Create some existing files
         (output_dir / "old_mib.json").write_text("{}")
+        (output_dir / "notes.txt").write_text("kept")
         (compiled_dir / "old.mib").write_text("OLD-MIB DEFINITIONS ::= BEGIN\nEND\n")
 
         # Create new MIB files
         new_mib = tmp_path / "NEW.mib"
         new_mib.write_text("NEW-MIB DEFINITIONS ::= BEGIN\nEND\n")
 
-        with patch("src.flask_app.services.mib_service.Path.cwd", return_value=tmp_path):
-            service = MibService(
-                output_dir=output_dir,
-                compiled_mibs_dir=compiled_dir
-            )
+        service = mib_service_cls(
+            output_dir=output_dir,
+            compiled_mibs_dir=compiled_dir,
+            base_dir=tmp_path
+        )
+
+        # Mock add_uploaded_files to return success
+        def fake_add(mib_files, device_type=None, output_dir=None):
+            (output_dir / "NEW-MIB.json").write_text("{}")
+            return {
+                'total_added': 1,
+                'success': [{'filename': 'NEW.mib', 'mib_name': 'NEW-MIB'}],
+                'errors': []
+            }
+
+        with patch.object(service, 'add_uploaded_files', side_effect=fake_add) as mock_add:
 
-            # Mock add_uploaded_files to return success
-            with patch.object(service, 'add_uploaded_files') as mock_add:
-                mock_add.return_value = {
-                    'total_added': 1,
-                    'success': [{'filename': 'NEW.mib', 'mib_name': 'NEW-MIB'}],
-                    'errors': []
-                }
+            result = service.replace_device_mibs([new_mib])
 
-                result = service.replace_device_mibs([new_mib])
+            assert result['success'] is True
+            assert result['success_count'] == 1
+            assert result['error_count'] == 0
 
-                assert result['success'] is True
-                assert result['success_count'] == 1
-                assert result['error_count'] == 0
+            # Existing output and compiled files were cleared first
+            assert not (output_dir / "old_mib.json").exists()
+            assert not (compiled_dir / "old.mib").exists()
 
-    def test_replace_device_mibs_clear_failure(self, tmp_path):
+            # New output was built in a staging directory and swapped in
+            staging_dir = mock_add.call_args.kwargs['output_dir']
+            assert staging_dir == tmp_path / "output.new"
+            assert output_dir.is_dir()
+            assert not staging_dir.exists()
+            assert not (tmp_path / "output.old").exists()
+            assert (output_dir / "NEW-MIB.json").exists()
+            assert (output_dir / "notes.txt").read_text() == "kept"
+            assert not (tmp_path / "compiled.old").exists()
+
+    def test_replace_device_mibs_clear_failure(self, mib_service_cls, tmp_path):
         """Test replace_device_mibs when clearing fails."""
         output_dir = tmp_path / "output"
         output_dir.mkdir()
@@ -196,37 +202,70 @@ END
         new_mib = tmp_path / "NEW.mib"
         new_mib.write_text("NEW-MIB DEFINITIONS ::= BEGIN\nEND\n")
 
-        with patch("src.flask_app.services.mib_service.Path.cwd", return_value=tmp_path):
-            service = MibService(output_dir=output_dir)
+        service = mib_service_cls(output_dir=output_dir, base_dir=tmp_path)
 
-            # Mock glob to raise an exception
-            with patch.object(Path, 'glob', side_effect=IOError("Permission denied")):
-                result = service.replace_device_mibs([new_mib])
+        # Mock directory scan to raise an exception
+        with patch("src.flask_app.services.mib_service.os.scandir", side_effect=IOError("Permission denied")):
+            result = service.replace_device_mibs([new_mib])
 
-                assert result['success'] is False
-                assert 'error' in result
+            assert result['success'] is False
+            assert 'error' in result
 
-    def test_replace_device_mibs_empty_list(self, tmp_path):
-        """Test replacing device MIBs with empty file list."""
+    def test_replace_device_mibs_empty_list(self, mib_service_cls, tmp_path):
+        """Test that an empty replacement keeps the existing MIBs."""
         output_dir = tmp_path / "output"
         output_dir.mkdir()
+        (output_dir / "old_mib.json").write_text("{}")
 
-        with patch("src.flask_app.services.mib_service.Path.cwd", return_value=tmp_path):
-            service = MibService(output_dir=output_dir)
+        service = mib_service_cls(output_dir=output_dir, base_dir=tmp_path)
 
-            with patch.object(service, 'add_uploaded_files') as mock_add:
-                mock_add.return_value = {
-                    'total_added': 0,
-                    'success': [],
-                    'errors': []
-                }
+        with patch.object(service, 'add_uploaded_files') as mock_add:
+            mock_add.return_value = {
+                'total_added': 0,
+                'success': [],
+                'errors': []
+            }
 
-                result = service.replace_device_mibs([])
+            result = service.replace_device_mibs([])
 
-                assert result['success'] is True
-                assert result['success_count'] == 0
+            assert result['success'] is False
+            assert result['success_count'] == 0
+            assert (output_dir / "old_mib.json").exists()
 
-    def test_replace_device_mibs_with_parse_errors(self, tmp_path):
+    def test_replace_device_mibs_all_files_fail(self, mib_service_cls, tmp_path):
+        """Test that an upload where every file fails keeps the old output and compiled MIBs."""
+        output_dir = tmp_path / "output"
+        output_dir.mkdir()
+        compiled_dir = tmp_path / "compiled"
+        compiled_dir.mkdir()
+        (output_dir / "OLD-MIB.json").write_text("{}")
+        (compiled_dir / "OLD-MIB.py").write_text("# compiled")
+
+        bad_mib = tmp_path / "BAD.mib"
+        bad_mib.write_text("INVALID CONTENT")
+
+        service = mib_service_cls(output_dir=output_dir, compiled_mibs_dir=compiled_dir, base_dir=tmp_path)
+
+        def failing_add(mib_files, device_type=None, output_dir=None):
+            # Compiled MIBs are out of the way while the new files are parsed
+            assert not (compiled_dir / "OLD-MIB.py").exists()
+            return {
+                'total_added': 0,
+                'success': [],
+                'errors': [{'filename': 'BAD.mib', 'error': 'Bad grammar'}]
+            }
+
+        with patch.object(service, 'add_uploaded_files', side_effect=failing_add):
+            result = service.replace_device_mibs([bad_mib])
+
+        assert result['success'] is False
+        assert result['errors'] == [{'filename': 'BAD.mib', 'error': 'Bad grammar'}]
+        assert (output_dir / "OLD-MIB.json").exists()
+        assert (compiled_dir / "OLD-MIB.py").read_text() == "# compiled"
+        assert not (tmp_path / "output.new").exists()
+        assert not (tmp_path / "compiled.old").exists()
+
+    def test_replace_device_mibs_with_parse_errors(self, mib_service_cls, tmp_path):
         """Test replacing device MIBs when some files fail to parse."""
         output_dir = tmp_path / "output"
         output_dir.mkdir()
@@ -236,25 +275,24 @@ END
         new_mib1.write_text("GOOD-MIB DEFINITIONS ::= BEGIN\nEND\n")
         new_mib2.write_text("INVALID CONTENT")
 
-        with patch("src.flask_app.services.mib_service.Path.cwd", return_value=tmp_path):
-            service = MibService(output_dir=output_dir)
-
-            # Mock add_uploaded_files to return mixed results
-            with patch.object(service, 'add_uploaded_files') as mock_add:
-                mock_add.return_value = {
-                    'total_added': 1,
-                    'success': [{'filename': 'GOOD.mib', 'mib_name': 'GOOD-MIB'}],
-                    'errors': [
-                        {
-                            'filename': 'BAD.mib',
-                            'error': 'Syntax error'
-                        }
-                    ]
-                }
-
-                result = service.replace_device_mibs([new_mib1, new_mib2])
-
-                assert result['success'] is True
-                assert result['success_count'] == 1
-                assert result['error_count'] == 1
-                assert len(result['errors']) == 1
+        service = mib_service_cls(output_dir=output_dir, base_dir=tmp_path)
+
+        # Mock add_uploaded_files to return mixed results
+        with patch.object(service, 'add_uploaded_files') as mock_add:
+            mock_add.return_value = {
+                'total_added': 1,
+                'success': [{'filename': 'GOOD.mib', 'mib_name': 'GOOD-MIB'}],
+                'errors': [
+                    {
+                        'filename': 'BAD.mib',
+                        'error': 'Syntax error'
+                    }
+                ]
+            }
+
+            result = service.replace_device_mibs([new_mib1, new_mib2])
+
+            assert result['success'] is True
+            assert result['success_count'] == 1
+            assert result['error_count'] == 1
+            assert len(result['errors']) == 1
@@ -2,101 +2,122 @@
 
 import pytest
 import json
-from unittest.mock import patch, MagicMock, mock_open
+import os
+import sys
+from unittest.mock import MagicMock, mock_open
 from pathlib import Path
-from src.flask_app.services.mib_service import MibService
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def write_mib(path, data):
+    """Write MIB data to path as JSON bytes."""
+    path.write_bytes(orjson.dumps(data) if orjson else json.dumps(data).encode())
 
 
 class TestMibServiceLoad:
     """Test MibService MIB loading and caching methods."""
 
-    def test_get_mib_data_from_file(self, tmp_path):
+    def test_get_mib_data_from_file(self, mib_service_cls, mib_dir):
         """Test loading MIB data from JSON file."""
-        # Create test MIB JSON file
-        mib_data = {
-            "name": "TEST-MIB",
-            "module": "TEST",
-            "description": "Test MIB",
-            "nodes": {
-                "sysDescr": {
-                    "oid": "1.3.6.1.2.1.1.1",
-                    "name": "sysDescr",
-                    "syntax": "DisplayString"
-                }
-            },
-            "imports": ["SNMPv2-TC"]
-        }
+        service = mib_service_cls(output_dir=mib_dir, base_dir=mib_dir)
+
+        result = service.get_mib_data("TEST-MIB", use_cache=False)
+
+        assert result is not None
+        assert result["name"] == "TEST-MIB"
+        assert result["module"] == "TEST"
+        assert "sysDescr" in result["nodes"]
+
+    def test_get_mib_data_caches_results(self, mib_service_cls, mib_dir):
+        """Test that get_mib_data caches results."""
+        service = mib_service_cls(output_dir=mib_dir, base_dir=mib_dir)
+
+        # First call with cache
+        result1 = service.get_mib_data("CACHE-MIB", use_cache=True)
+        assert "CACHE-MIB" in service._mib_cache
+
+        # Second call should use cache
+        result2 = service.get_mib_data("CACHE-MIB", use_cache=True)
+        assert result1 == result2
+
+    def test_get_mib_data_shared_across_instances(self, mib_service_cls, tmp_path):
+        """Test that parsed MIB data is shared between service instances."""
+        mib_file = tmp_path / "SHARED-MIB.json"
+        write_mib(mib_file, {"name": "SHARED-MIB", "nodes": {}})
+
+        first = mib_service_cls(output_dir=tmp_path, base_dir=tmp_path).get_mib_data("SHARED-MIB")
+        second = mib_service_cls(output_dir=tmp_path, base_dir=tmp_path).get_mib_data("SHARED-MIB")
+
+        assert first is second
+
+        # Rewriting the file changes its size, so it is parsed again
+        write_mib(mib_file, {"name": "SHARED-MIB", "nodes": {"a": {}}})
+        third = mib_service_cls(output_dir=tmp_path, base_dir=tmp_path).get_mib_data("SHARED-MIB")
+
+        assert third is not first
+        assert "a" in third["nodes"]
+
+    def test_get_mib_data_reloads_same_mtime_rewrite(self, mib_service_cls, tmp_path):
+        """Test that a rewrite keeping the mtime but changing the size is reloaded."""
         mib_file = tmp_path / "TEST-MIB.json"
-        mib_file.write_text(json.dumps(mib_data))
+        write_mib(mib_file, {"name": "TEST-MIB", "nodes": {}})
+        mtime_ns = mib_file.stat().st_mtime_ns
 
-        with patch("src.flask_app.services.mib_service.Path.cwd", return_value=tmp_path):
-            service = MibService(output_dir=tmp_path)
+        service = mib_service_cls(output_dir=tmp_path, base_dir=tmp_path)
+        assert service.get_mib_data("TEST-MIB")["nodes"] == {}
 
-            result = service.get_mib_data("TEST-MIB", use_cache=False)
+        write_mib(mib_file, {"name": "TEST-MIB", "nodes": {"a": {}}})
+        os.utime(mib_file, ns=(mtime_ns, mtime_ns))
 
-            assert result is not None
-            assert result["name"] == "TEST-MIB"
-            assert result["module"] == "TEST"
-            assert "sysDescr" in result["nodes"]
+        assert "a" in service.get_mib_data("TEST-MIB")["nodes"]
 
-    def test_get_mib_data_caches_results(self, tmp_path):
-        """Test that get_mib_data caches results."""
-        mib_data = {
-            "name": "CACHE-MIB",
-            "module": "CACHE",
-            "nodes": {}
-        }
-        mib_file = tmp_path / "CACHE-MIB.json"
-        mib_file.write_text(json.dumps(mib_data))
-
-        with patch("src.flask_app.services.mib_service.Path.cwd", return_value=tmp_path):
-            service = MibService(output_dir=tmp_path)
-
-            # First call with cache
-            result1 = service.get_mib_data("CACHE-MIB", use_cache=True)
-            assert "CACHE-MIB" in service._mib_cache
-
-            # Second call should use cache
-            result2 = service.get_mib_data("CACHE-MIB", use_cache=True)
-            assert result1 == result2
-
-    def test_get_mib_data_not_found(self, tmp_path):
+    def test_get_mib_data_not_found(self, mib_service_cls, tmp_path):
         """Test get_mib_data with non-existent MIB."""
-        with patch("src.flask_app.services.mib_service.Path.cwd", return_value=tmp_path):
-            service = MibService(output_dir=tmp_path)
+        service = mib_service_cls(output_dir=tmp_path, base_dir=tmp_path)
 
-            result = service.get_mib_data("NON-EXISTENT", use_cache=False)
+        result = service.get_mib_data("NON-EXISTENT", use_cache=False)
 
-            assert result is None
+        assert result is None
 
-    def test_get_mib_data_invalid_json(self, tmp_path):
-        """Test get_mib_data with invalid JSON file."""
-        # Create invalid JSON file
-        mib_file = tmp_path / "INVALID-MIB.json"
-        mib_file.write_text("{invalid json content")
+    def test_get_mib_data_remembers_missing_mib(self, mib_service_cls, tmp_path):
+        """Test that a missing MIB is not probed again until the entry expires."""
+        service = mib_service_cls(output_dir=tmp_path, base_dir=tmp_path)
 
-        with patch("src.flask_app.services.mib_service.Path.cwd", return_value=tmp_path):
-            service = MibService(output_dir=tmp_path)
+        assert service.get_mib_data("LATE-MIB") is None
+        write_mib(tmp_path / "LATE-MIB.json", {"name": "LATE-MIB", "nodes": {}})
 
-            result = service.get_mib_data("INVALID-MIB", use_cache=False)
+        # Still remembered as missing, unless the cache is bypassed or cleared
+        assert service.get_mib_data("LATE-MIB") is None
+        assert service.get_mib_data("LATE-MIB", use_cache=False)["name"] == "LATE-MIB"
 
-            assert result is None
+        service.clear_cache()
+        service.MISSING_MIB_TTL = 0
+        assert service.get_mib_data("OTHER-MIB") is None
+        write_mib(tmp_path / "OTHER-MIB.json", {"name": "OTHER-MIB", "nodes": {}})
+        assert service.get_mib_data("OTHER-MIB")["name"] == "OTHER-MIB"
 
-    def test_get_mib_data_with_mib_extension(self, tmp_path):
-        """Test get_mib_data with .mib.json extension."""
-        mib_data = {"name": "EXT-MIB", "module": "EXT", "nodes": {}}
-        mib_file = tmp_path / "EXT-MIB.mib.json"
-        mib_file.write_text(json.dumps(mib_data))
+    def test_get_mib_data_invalid_json(self, mib_service_cls, mib_dir):
+        """Test get_mib_data with invalid JSON file."""
+        service = mib_service_cls(output_dir=mib_dir, base_dir=mib_dir)
 
-        with patch("src.flask_app.services.mib_service.Path.cwd", return_value=tmp_path):
-            service = MibService(output_dir=tmp_path)
+        result = service.get_mib_data("INVALID-MIB", use_cache=False)
 
-            result = service.get_mib_data("EXT-MIB", use_cache=False)
+        assert result is None
 
-            assert result is not None
-            assert result["name"] == "EXT-MIB"
+    def test_get_mib_data_with_mib_extension(self, mib_service_cls, mib_dir):
+        """Test get_mib_data with .mib.json extension."""
+        service = mib_service_cls(output_dir=mib_dir, base_dir=mib_dir)
 
-    def test_get_mib_data_from_global_dir(self, tmp_path):
+        result = service.get_mib_data("EXT-MIB", use_cache=False)
+
+        assert result is not None
+        assert result["name"] == "EXT-MIB"
+
+    def test_get_mib_data_from_global_dir(self, mib_service_cls, tmp_path):
         """Test get_mib_data loads from global directory first."""
         # Create global and device directories
         global_dir = tmp_path / "storage" / "global" / "output"
@@ -108,69 +129,115 @@ class TestMibServiceLoad:
         global_mib = {"name": "SHARED-MIB", "source": "global", "nodes": {}}
         device_mib = {"name": "SHARED-MIB", "source": "device", "nodes": {}}
 
-        (global_dir / "SHARED-MIB.json").write_text(json.dumps(global_mib))
-        (device_dir / "SHARED-MIB.json").write_text(json.dumps(device_mib))
+        write_mib(global_dir / "SHARED-MIB.json", global_mib)
+        write_mib(device_dir / "SHARED-MIB.json", device_mib)
 
-        with patch("src.flask_app.services.mib_service.Path.cwd", return_value=tmp_path):
-            service = MibService(output_dir=device_dir)
+        service = mib_service_cls(output_dir=device_dir, base_dir=tmp_path)
 
-            result = service.get_mib_data("SHARED-MIB", use_cache=False)
+        result = service.get_mib_data("SHARED-MIB", use_cache=False)
 
-            # Should load from global directory first
-            assert result is not None
-            assert result["source"] == "global"
+        # Should load from global directory first
+        assert result is not None
+        assert result["source"] == "global"
 
-    def test_clear_cache_specific_mib(self, tmp_path):
+    def test_clear_cache_specific_mib(self, mib_service_cls, tmp_path):
         """Test clearing cache for specific MIB."""
-        with patch("src.flask_app.services.mib_service.Path.cwd", return_value=tmp_path):
-            service = MibService(output_dir=tmp_path)
-
-            # Add to cache
-            service._mib_cache["TEST-MIB"] = {"name": "TEST"}
-            service._last_cache_update["TEST-MIB"] = 12345
+        service = mib_service_cls(output_dir=tmp_path, base_dir=tmp_path)
 
-            # Clear specific MIB
-            service.clear_cache("TEST-MIB")
+        # Add to cache
+        service._mib_cache["TEST-MIB"] = (12345, {"name": "TEST"})
 
-            assert "TEST-MIB" not in service._mib_cache
-            assert "TEST-MIB" not in service._last_cache_update
+        # Clear specific MIB
+        service.clear_cache("TEST-MIB")
 
-    def test_clear_cache_all(self, tmp_path):
-        """Test clearing all cache."""
-        with patch("src.flask_app.services.mib_service.Path.cwd", return_value=tmp_path):
-            service = MibService(output_dir=tmp_path)
+        assert "TEST-MIB" not in service._mib_cache
 
-            # Add multiple MIBs to cache
-            service._mib_cache["MIB1"] = {"name": "MIB1"}
-            service._mib_cache["MIB2"] = {"name": "MIB2"}
-            service._last_cache_update["MIB1"] = 12345
-            service._last_cache_update["MIB2"] = 67890
+    def test_clear_cache_specific_mib_keeps_other_entries(self, mib_service_cls, tmp_path):
+        """Test that clearing one MIB leaves the other cached MIBs valid."""
+        for name in ("KEEP-MIB", "DROP-MIB"):
+            write_mib(tmp_path / f"{name}.json", {"name": name, "nodes": {"a": {"oid": "1.1"}}})
+        service = mib_service_cls(output_dir=tmp_path, base_dir=tmp_path)
+        kept = service.get_mib_data("KEEP-MIB")
+        service.get_mib_data("DROP-MIB")
 
-            # Clear all cache
-            service.clear_cache()
+        service.clear_cache("DROP-MIB")
 
-            assert service._mib_cache == {}
-            assert service._last_cache_update == {}
+        assert list(service._mib_cache) == ["KEEP-MIB"]
+        assert service.get_mib_data("KEEP-MIB") is kept
 
-    def test_load_mib_data_from_file_directly(self, tmp_path):
+    def test_clear_cache_all(self, mib_service_cls, tmp_path):
+        """Test clearing all cache."""
+        service = mib_service_cls(output_dir=tmp_path, base_dir=tmp_path)
+
+        # Add multiple MIBs to cache
+        service._mib_cache["MIB1"] = (12345, {"name": "MIB1"})
+        service._mib_cache["MIB2"] = (67890, {"name": "MIB2"})
+
+        # Clear all cache
+        service.clear_cache()
+
+        assert service._mib_cache == {}
+
+    def test_mib_cache_is_bounded(self, mib_service_cls, mib_dir):
+        """Test that the cache evicts the least recently used MIB."""
+        service = mib_service_cls(output_dir=mib_dir, base_dir=mib_dir)
+        service._mib_cache.maxsize = 2
+
+        service.get_mib_data("MIB1")
+        service.get_mib_data("MIB2")
+        service.get_mib_data("MIB1")
+        service.get_mib_data("MIB3")
+
+        assert list(service._mib_cache) == ["MIB1", "MIB3"]
+
+    def test_mib_cache_survives_concurrent_eviction(self, mib_service_cls, mib_dir):
+        """Test that lookups racing with evictions never raise KeyError."""
+        import threading
+
+        service = mib_service_cls(output_dir=mib_dir, base_dir=mib_dir)
+        service._mib_cache.maxsize = 4
+        service._missing.maxsize = 4
+        errors = []
+
+        def worker(offset):
+            try:
+                for i in range(20000):
+                    key = (i + offset) % 8
+                    service._mib_cache.get(key)
+                    service._mib_cache[key] = i
+                    service._missing.get(key)
+                    service._missing[key] = i
+            except Exception as e:  # pragma: no cover - only reached on a race
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        # Switch threads very often so the lookups interleave with evictions
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+
+        assert errors == []
+        assert len(service._mib_cache) <= 4
+
+    def test_load_mib_data_from_file_directly(self, mib_service_cls, mib_dir):
         """Test _load_mib_data_from_file method."""
-        mib_data = {"name": "DIRECT-MIB", "module": "DIRECT", "nodes": {}}
-        mib_file = tmp_path / "DIRECT-MIB.json"
-        mib_file.write_text(json.dumps(mib_data))
-
-        with patch("src.flask_app.services.mib_service.Path.cwd", return_value=tmp_path):
-            service = MibService(output_dir=tmp_path)
+        service = mib_service_cls(output_dir=mib_dir, base_dir=mib_dir)
 
-            result = service._load_mib_data_from_file("DIRECT-MIB")
+        result = service._load_mib_data_from_file("DIRECT-MIB")
 
-            assert result is not None
-            assert result["name"] == "DIRECT-MIB"
+        assert result is not None
+        assert result["name"] == "DIRECT-MIB"
 
-    def test_load_mib_data_from_file_not_found(self, tmp_path):
+    def test_load_mib_data_from_file_not_found(self, mib_service_cls, tmp_path):
         """Test _load_mib_data_from_file with non-existent file."""
-        with patch("src.flask_app.services.mib_service.Path.cwd", return_value=tmp_path):
-            service = MibService(output_dir=tmp_path)
+        service = mib_service_cls(output_dir=tmp_path, base_dir=tmp_path)
 
-            result = service._load_mib_data_from_file("NOT-FOUND")
+        result = service._load_mib_data_from_file("NOT-FOUND")
 
-            assert result is None
+        assert result is None
@@ -7,18 +7,34 @@ from pathlib import Path
 from datetime import datetime
 from src.flask_app.services.mib_service import MibService
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def write_mib(path, data):
+    """Write MIB data to path as JSON bytes."""
+    path.write_bytes(orjson.dumps(data) if orjson else json.dumps(data).encode())
+
+
+def wait_for_search_indexes():
+    """Wait until the search indexes scheduled so far are built."""
+    from src.flask_app.services import mib_service
+    for future in list(mib_service._PENDING_INDEXES.values()):
+        future.result()
+
 
 class TestMibServiceQuery:
     """Test MibService query and search methods."""
 
     def test_list_mibs_empty(self, tmp_path):
         """Test list_mibs with no MIB files."""
-        with patch("src.flask_app.services.mib_service.Path.cwd", return_value=tmp_path):
-            service = MibService(output_dir=tmp_path)
+        service = MibService(output_dir=tmp_path, base_dir=tmp_path)
 
-            result = service.list_mibs()
+        result = service.list_mibs()
 
-            assert result == []
+        assert result == []
 
     def test_list_mibs_single_file(self, tmp_path):
         """Test list_mibs with one MIB file."""
@@ -32,71 +48,113 @@ class TestMibServiceQuery:
             "imports": ["SNMPv2-TC"]
         }
         mib_file = tmp_path / "TEST-MIB.json"
-        mib_file.write_text(json.dumps(mib_data))
+        write_mib(mib_file, mib_data)
 
-        with patch("src.flask_app.services.mib_service.Path.cwd", return_value=tmp_path):
-            service = MibService(output_dir=tmp_path)
+        service = MibService(output_dir=tmp_path, base_dir=tmp_path)
 
-            result = service.list_mibs()
+        result = service.list_mibs()
 
-            assert len(result) == 1
-            assert result[0]["name"] == "TEST-MIB"
-            assert result[0]["description"] == "Test MIB"
-            assert result[0]["nodes_count"] == 1
-            assert result[0]["imports_count"] == 1
+        assert len(result) == 1
+        assert result[0]["name"] == "TEST-MIB"
+        assert result[0]["description"] == "Test MIB"
+        assert result[0]["nodes_count"] == 1
+        assert result[0]["imports_count"] == 1
 
     def test_list_mibs_multiple_files(self, tmp_path):
         """Test list_mibs with multiple MIB files."""
         mib1_data = {"name": "MIB1", "module": "M1", "nodes": {}}
         mib2_data = {"name": "MIB2", "module": "M2", "nodes": {}}
 
-        (tmp_path / "MIB1.json").write_text(json.dumps(mib1_data))
-        (tmp_path / "MIB2.json").write_text(json.dumps(mib2_data))
+        write_mib(tmp_path / "MIB1.json", mib1_data)
+        write_mib(tmp_path / "MIB2.json", mib2_data)
 
-        with patch("src.flask_app.services.mib_service.Path.cwd", return_value=tmp_path):
-            service = MibService(output_dir=tmp_path)
+        service = MibService(output_dir=tmp_path, base_dir=tmp_path)
 
-            result = service.list_mibs()
+        result = service.list_mibs()
 
-            assert len(result) == 2
-            mib_names = {mib["name"] for mib in result}
-            assert "MIB1" in mib_names
-            assert "MIB2" in mib_names
+        assert len(result) == 2
+        mib_names = {mib["name"] for mib in result}
+        assert "MIB1" in mib_names
+        assert "MIB2" in mib_names
 
     def test_list_mibs_sorted(self, tmp_path):
         """Test that list_mibs returns sorted results."""
         # Create files with specific names to test sorting
         for name in ["Z-MIB", "A-MIB", "M-MIB"]:
             mib_data = {"name": name, "module": name, "nodes": {}}
-            (tmp_path / f"{name}.json").write_text(json.dumps(mib_data))
+            write_mib(tmp_path / f"{name}.json", mib_data)
 
-        with patch("src.flask_app.services.mib_service.Path.cwd", return_value=tmp_path):
-            service = MibService(output_dir=tmp_path)
+        service = MibService(output_dir=tmp_path, base_dir=tmp_path)
 
-            result = service.list_mibs()
+        result = service.list_mibs()
 
-            # Should be sorted alphabetically
-            assert result[0]["name"] == "A-MIB"
-            assert result[1]["name"] == "M-MIB"
-            assert result[2]["name"] == "Z-MIB"
+        # Should be sorted alphabetically
+        assert result[0]["name"] == "A-MIB"
+        assert result[1]["name"] == "M-MIB"
+        assert result[2]["name"] == "Z-MIB"
 
     def test_list_mibs_skips_auxiliary_files(self, tmp_path):
         """Test that auxiliary files are skipped."""
         mib_data = {"name": "VALID-MIB", "module": "VALID", "nodes": {}}
-        (tmp_path / "VALID-MIB.json").write_text(json.dumps(mib_data))
+        write_mib(tmp_path / "VALID-MIB.json", mib_data)
         (tmp_path / "_oids.json").write_text('{"oids": {}}')
         (tmp_path / "_tree.json").write_text('{"tree": {}}')
         (tmp_path / "all_mibs.json").write_text('{"all": {}}')
         (tmp_path / "statistics.json").write_text('{"stats": {}}')
 
-        with patch("src.flask_app.services.mib_service.Path.cwd", return_value=tmp_path):
-            service = MibService(output_dir=tmp_path)
+        service = MibService(output_dir=tmp_path, base_dir=tmp_path)
+
+        result = service.list_mibs()
 
+        # Should only include VALID-MIB, not auxiliary files
+        assert len(result) == 1
+        assert result[0]["name"] == "VALID-MIB"
+
+    def test_list_mibs_reuses_unchanged_summaries(self, tmp_path):
+        """Test that list_mibs only re-reads files that changed."""
+        mib_file = tmp_path / "TEST-MIB.json"
+        write_mib(mib_file, {"name": "TEST-MIB", "nodes": {"a": {}}})
+
+        service = MibService(output_dir=tmp_path, base_dir=tmp_path)
+        assert service.list_mibs()[0]["nodes_count"] == 1
+
+        with patch.object(service, "get_mib_data") as mock_get:
             result = service.list_mibs()
+            mock_get.assert_not_called()
+        assert result[0]["nodes_count"] == 1
+
+        # Callers may modify the returned dicts without touching the index
+        result[0]["nodes_count"] = 99
+        assert service.list_mibs()[0]["nodes_count"] == 1
+
+        # A rewritten file is summarized again
+        write_mib(mib_file, {"name": "TEST-MIB", "nodes": {"a": {}, "b": {}}})
+        assert service.list_mibs()[0]["nodes_count"] == 2
+
+    def test_list_mibs_loads_large_batches_concurrently(self, tmp_path):
+        """Test that list_mibs summarizes many new files in one concurrent batch."""
+        count = MibService.PARALLEL_LOAD_MIN_FILES + 2
+        for i in range(count):
+            nodes = {f"node{j}": {} for j in range(i)}
+            write_mib(tmp_path / f"MIB-{i:02d}.json", {"name": f"MIB-{i:02d}", "nodes": nodes})
+        (tmp_path / "BROKEN-MIB.json").write_text("{ invalid")
+
+        result = MibService(output_dir=tmp_path, base_dir=tmp_path).list_mibs()
+
+        assert [mib["name"] for mib in result] == ["BROKEN-MIB"] + [f"MIB-{i:02d}" for i in range(count)]
+        assert result[0]["nodes_count"] is None
+        assert [mib["nodes_count"] for mib in result[1:]] == list(range(count))
 
-            # Should only include VALID-MIB, not auxiliary files
-            assert len(result) == 1
-            assert result[0]["name"] == "VALID-MIB"
+    def test_list_mibs_shares_slotted_summaries(self, tmp_path):
+        """Test that list_mibs builds its dicts from shared slotted summaries."""
+        write_mib(tmp_path / "TEST-MIB.json", {"name": "TEST-MIB", "nodes": {"a": {}}})
+
+        first = MibService(output_dir=tmp_path, base_dir=tmp_path)._list_summaries()
+        second = MibService(output_dir=tmp_path, base_dir=tmp_path)._list_summaries()
+
+        assert first[0] is second[0]
+        assert not hasattr(first[0], "__dict__")
+        assert first[0].to_dict() == MibService(output_dir=tmp_path, base_dir=tmp_path).list_mibs()[0]
 
     def test_search_nodes_by_name(self, tmp_path):
         """Test search_nodes finding nodes by name."""
@@ -115,16 +173,15 @@ class TestMibServiceQuery:
                 }
             }
         }
-        (tmp_path / "TEST-MIB.json").write_text(json.dumps(mib_data))
+        write_mib(tmp_path / "TEST-MIB.json", mib_data)
 
-        with patch("src.flask_app.services.mib_service.Path.cwd", return_value=tmp_path):
-            service = MibService(output_dir=tmp_path)
+        service = MibService(output_dir=tmp_path, base_dir=tmp_path)
 
-            result = service.search_nodes("sysDescr")
+        result = service.search_nodes("sysDescr")
 
-            assert len(result) == 1
-            assert result[0]["node_name"] == "sysDescr"
-            assert result[0]["mib_name"] == "TEST-MIB"
+        assert len(result) == 1
+        assert result[0]["node_name"] == "sysDescr"
+        assert result[0]["mib_name"] == "TEST-MIB"
 
     def test_search_nodes_by_oid(self, tmp_path):
         """Test search_nodes finding nodes by OID."""
@@ -137,15 +194,14 @@ class TestMibServiceQuery:
                 }
             }
         }
-        (tmp_path / "TEST-MIB.json").write_text(json.dumps(mib_data))
+        write_mib(tmp_path / "TEST-MIB.json", mib_data)
 
-        with patch("src.flask_app.services.mib_service.Path.cwd", return_value=tmp_path):
-            service = MibService(output_dir=tmp_path)
+        service = MibService(output_dir=tmp_path, base_dir=tmp_path)
 
-            result = service.search_nodes("1.3.6.1.2.1.1.1")
+        result = service.search_nodes("1.3.6.1.2.1.1.1")
 
-            assert len(result) == 1
-            assert result[0]["node_name"] == "sysDescr"
+        assert len(result) == 1
+        assert result[0]["node_name"] == "sysDescr"
 
     def test_search_nodes_by_description(self, tmp_path):
         """Test search_nodes finding nodes by description."""
@@ -159,14 +215,13 @@ class TestMibServiceQuery:
                 }
             }
         }
-        (tmp_path / "TEST-MIB.json").write_text(json.dumps(mib_data))
+        write_mib(tmp_path / "TEST-MIB.json", mib_data)
 
-        with patch("src.flask_app.services.mib_service.Path.cwd", return_value=tmp_path):
-            service = MibService(output_dir=tmp_path)
+        service = MibService(output_dir=tmp_path, base_dir=tmp_path)
 
-            result = service.search_nodes("description")
+        result = service.search_nodes("description")
 
-            assert len(result) == 1
+        assert len(result) == 1
 
     def test_search_nodes_case_insensitive(self, tmp_path):
         """Test search_nodes is case insensitive."""
@@ -179,19 +234,74 @@ class TestMibServiceQuery:
                 }
             }
         }
-        (tmp_path / "TEST-MIB.json").write_text(json.dumps(mib_data))
+        write_mib(tmp_path / "TEST-MIB.json", mib_data)
 
-        with patch("src.flask_app.services.mib_service.Path.cwd", return_value=tmp_path):
-            service = MibService(output_dir=tmp_path)
+        service = MibService(output_dir=tmp_path, base_dir=tmp_path)
 
-            # Search with different cases
-            result1 = service.search_nodes("sysdescr")
-            result2 = service.search_nodes("SYSDESCR")
-            result3 = service.search_nodes("SySdEsCr")
+        # Search with different cases
+        result1 = service.search_nodes("sysdescr")
+        result2 = service.search_nodes("SYSDESCR")
+        result3 = service.search_nodes("SySdEsCr")
 
-            assert len(result1) == 1
-            assert len(result2) == 1
-            assert len(result3) == 1
+        assert len(result1) == 1
+        assert len(result2) == 1
+        assert len(result3) == 1
+
+    def test_search_nodes_oid_subtree(self, tmp_path):
+        """Test search_nodes returning the nodes at and below an OID."""
+        write_mib(tmp_path / "TEST-MIB.json", {
+            "name": "TEST-MIB",
+            "nodes": {
+                "system": {"oid": "1.3.6.1.2.1.1"},
+                "sysDescr": {"oid": "1.3.6.1.2.1.1.1"},
+                "sysORTable": {"oid": "1.3.6.1.2.1.1.10"},
+                "interfaces": {"oid": "1.3.6.1.2.1.2"},
+                "sysAlias": {"oid": "1.3.6.1.2.1.11.1"},
+                "noOid": {"name": "noOid"}
+            }
+        })
+        service = MibService(output_dir=tmp_path, base_dir=tmp_path)
+
+        results = service.search_nodes("1.3.6.1.2.1.1", oid_subtree=True)
+        assert [r["node_name"] for r in results] == ["system", "sysDescr", "sysORTable"]
+        assert {r["match_type"] for r in results} == {"oid"}
+
+        assert [r["node_name"] for r in service.search_nodes("1.3.6.1.2.1.1.1.", oid_subtree=True)] == ["sysDescr"]
+        assert service.search_nodes("1.3.6.1.9", oid_subtree=True) == []
+        assert service.search_nodes("sys", oid_subtree=True) == []
+
+    def test_search_nodes_limit(self, tmp_path):
+        """Test search_nodes stopping after limit matches across MIBs."""
+        for mib in ("A-MIB", "B-MIB"):
+            write_mib(tmp_path / f"{mib}.json", {
+                "name": mib,
+                "nodes": {f"node{i}": {"oid": f"1.{i}"} for i in range(3)}
+            })
+        service = MibService(output_dir=tmp_path, base_dir=tmp_path)
+
+        everything = service.search_nodes("node")
+        assert len(everything) == 6
+        assert service.search_nodes("node", limit=4) == everything[:4]
+        assert service.search_nodes("node", limit=0) == []
+
+    def test_search_nodes_case_sensitive(self, tmp_path):
+        """Test search_nodes honours case_sensitive."""
+        mib_data = {
+            "name": "TEST-MIB",
+            "nodes": {
+                "sysDescr": {"oid": "1.3.6.1.2.1.1.1", "description": "A textual description"}
+            }
+        }
+        write_mib(tmp_path / "TEST-MIB.json", mib_data)
+
+        service = MibService(output_dir=tmp_path, base_dir=tmp_path)
+
+        assert service.search_nodes("sysdescr", case_sensitive=True) == []
+        result = service.search_nodes("sysDescr", case_sensitive=True)
+        assert len(result) == 1
+        assert result[0]["match_type"] == "name"
+        assert service.search_nodes("Textual", case_sensitive=True) == []
+        assert service.search_nodes("Textual")[0]["match_type"] == "description"
 
     def test_search_nodes_empty_query(self, tmp_path):
         """Test search_nodes with empty query."""
@@ -204,15 +314,131 @@ class TestMibServiceQuery:
                 }
             }
         }
-        (tmp_path / "TEST-MIB.json").write_text(json.dumps(mib_data))
+        write_mib(tmp_path / "TEST-MIB.json", mib_data)
+
+        service = MibService(output_dir=tmp_path, base_dir=tmp_path)
+
+        result = service.search_nodes("")
+
+        # Empty query should match everything
+        assert len(result) == 1
+
+    def test_search_nodes_matches_linear_scan(self, tmp_path):
+        """Test that indexed search returns the same nodes as a substring scan."""
+        nodes = {
+            "sysDescr": {"oid": "1.3.6.1.2.1.1.1", "description": "System description"},
+            "sysName": {"oid": "1.3.6.1.2.1.1.5", "description": "Node name"},
+            "ifIndex": {"oid": "1.3.6.1.2.1.2.2.1.1", "description": "Interface index"},
+            "ifDescr": {"oid": "1.3.6.1.2.1.2.2.1.2"},
+        }
+        write_mib(tmp_path / "TEST-MIB.json", {"name": "TEST-MIB", "nodes": nodes})
+
+        service = MibService(output_dir=tmp_path, base_dir=tmp_path)
+
+        def match_type(name, data, query):
+            for field, field_type in [(name, "name"), (data.get("oid", ""), "oid"),
+                                      (data.get("description", ""), "description")]:
+                if query in field.lower():
+                    return field_type
+            return "other"
+
+        queries = ["", "s", "if", "1.", "z", "descr", "1.1.5", "sysdescr 1.3", "name", "index",
+                   "1.1 system", "2.1 inter", "1.3.6", "missing"]
+        # The first pass scans the nodes, the second one goes through the index
+        for _ in range(2):
+            for query in queries:
+                expected = [
+                    (name, match_type(name, data, query.lower())) for name, data in nodes.items()
+                    if query.lower() in f"{name} {data.get('oid', '')} {data.get('description', '')}".lower()
+                ]
+                result = service.search_nodes(query)
+                assert [(r["node_name"], r["match_type"]) for r in result] == expected, query
+            wait_for_search_indexes()
+
+    def test_indexes_shared_between_instances(self, tmp_path):
+        """Test that a new service instance reuses summaries and search indexes."""
+        write_mib(tmp_path / "TEST-MIB.json", {
+            "name": "TEST-MIB",
+            "nodes": {"sysDescr": {"oid": "1.3.6.1.2.1.1.1"}}
+        })
 
-        with patch("src.flask_app.services.mib_service.Path.cwd", return_value=tmp_path):
-            service = MibService(output_dir=tmp_path)
+        first = MibService(output_dir=tmp_path, base_dir=tmp_path)
+        first.list_mibs()
+        first.search_nodes("sysDescr")
+        wait_for_search_indexes()
 
-            result = service.search_nodes("")
+        second = MibService(output_dir=tmp_path, base_dir=tmp_path)
+        with patch.object(second, "get_mib_data") as mock_get:
+            assert second.list_mibs()[0]["name"] == "TEST-MIB"
+            mock_get.assert_not_called()
 
-            # Empty query should match everything
-            assert len(result) == 1
+        with patch("src.flask_app.services.mib_service._NodeSearchIndex",
+                   side_effect=AssertionError("index rebuilt")):
+            assert len(second.search_nodes("sysDescr")) == 1
+
+    def test_search_nodes_indexes_in_background(self, tmp_path):
+        """Test that a MIB without an index is scanned and indexed in the background."""
+        from src.flask_app.services import mib_service
+
+        mib_file = tmp_path / "TEST-MIB.json"
+        write_mib(mib_file, {"name": "TEST-MIB", "nodes": {"sysDescr": {"oid": "1.3.6.1.2.1.1.1"}}})
+        stat = mib_file.stat()
+        key = (str(mib_file), stat.st_mtime_ns, stat.st_size)
+
+        service = MibService(output_dir=tmp_path, base_dir=tmp_path)
+        with patch("src.flask_app.services.mib_service._NodeSearchIndex.search") as mock_search:
+            assert [r["node_name"] for r in service.search_nodes("sysdescr")] == ["sysDescr"]
+            mock_search.assert_not_called()
+
+        wait_for_search_indexes()
+        assert mib_service._SEARCH_INDEXES.get(key)[0] == "TEST-MIB"
+
+        # The index outlives the loaded data, as it is keyed on the file
+        service._mib_cache.clear()
+        mib_service._load_json_cached.cache_clear()
+        with patch("src.flask_app.services.mib_service._schedule_search_index") as mock_schedule:
+            assert [r["node_name"] for r in service.search_nodes("1.3.6.1.2.1.1", oid_subtree=True)] == ["sysDescr"]
+            mock_schedule.assert_not_called()
+
+    def test_clear_cache_discards_index_being_built(self, tmp_path):
+        """Test that an index finished after clear_cache() is not published."""
+        import threading
+        from src.flask_app.services import mib_service
+
+        mib_file = tmp_path / "TEST-MIB.json"
+        write_mib(mib_file, {"name": "TEST-MIB", "nodes": {"sysDescr": {"oid": "1.3.6.1.2.1.1.1"}}})
+        stat = mib_file.stat()
+        key = (str(mib_file), stat.st_mtime_ns, stat.st_size)
+        release = threading.Event()
+        build_index = mib_service._NodeSearchIndex.__init__
+
+        def slow_build_index(index, nodes):
+            release.wait(5)
+            build_index(index, nodes)
+
+        service = MibService(output_dir=tmp_path, base_dir=tmp_path)
+        with patch.object(mib_service._NodeSearchIndex, "__init__", slow_build_index):
+            assert len(service.search_nodes("sysDescr")) == 1
+            service.clear_cache()
+            release.set()
+            wait_for_search_indexes()
+
+        assert mib_service._SEARCH_INDEXES.get(key) is None
+
+    def test_search_nodes_reindexes_rewritten_mib(self, tmp_path):
+        """Test that search_nodes picks up changes to a MIB file."""
+        mib_file = tmp_path / "TEST-MIB.json"
+        write_mib(mib_file, {"name": "TEST-MIB", "nodes": {"sysDescr": {"oid": "1.3.6.1.2.1.1.1"}}})
+
+        service = MibService(output_dir=tmp_path, base_dir=tmp_path)
+        assert len(service.search_nodes("sysName")) == 0
+
+        write_mib(mib_file, {"name": "TEST-MIB", "nodes": {
+            "sysDescr": {"oid": "1.3.6.1.2.1.1.1"},
+            "sysName": {"oid": "1.3.6.1.2.1.1.5"},
+        }})
+
+        assert [r["node_name"] for r in service.search_nodes("sysName")] == ["sysName"]
 
     def test_get_node_by_oid_found(self, tmp_path):
         """Test get_node_by_oid when node exists."""
@@ -225,17 +451,34 @@ class TestMibServiceQuery:
                 }
             }
         }
-        (tmp_path / "TEST-MIB.json").write_text(json.dumps(mib_data))
+        write_mib(tmp_path / "TEST-MIB.json", mib_data)
 
-        with patch("src.flask_app.services.mib_service.Path.cwd", return_value=tmp_path):
-            service = MibService(output_dir=tmp_path)
+        service = MibService(output_dir=tmp_path, base_dir=tmp_path)
 
-            result = service.get_node_by_oid("1.3.6.1.2.1.1.1")
+        result = service.get_node_by_oid("1.3.6.1.2.1.1.1")
 
-            assert result is not None
-            assert result["node_name"] == "sysDescr"
-            assert result["mib_name"] == "TEST-MIB"
-            assert "node_data" in result
+        assert result is not None
+        assert result["node_name"] == "sysDescr"
+        assert result["mib_name"] == "TEST-MIB"
+        assert "node_data" in result
+
+    def test_get_node_by_oid_ignores_stale_oid_map(self, tmp_path):
+        """Test get_node_by_oid rebuilds the OID map when _oids.json is out of date."""
+        write_mib(tmp_path / "TEST-MIB.json", {
+            "name": "TEST-MIB",
+            "nodes": {"sysName": {"oid": "1.3.6.1.2.1.1.5", "name": "sysName"}}
+        })
+        write_mib(tmp_path / "_oids.json", {"mibs": {"TEST-MIB": {
+            "source_size": 0,
+            "source_mtime_ns": 0,
+            "oids": {"1.3.6.1.2.1.1.5": "sysDescr"}
+        }}})
+
+        service = MibService(output_dir=tmp_path, base_dir=tmp_path)
+
+        result = service.get_node_by_oid("1.3.6.1.2.1.1.5")
+
+        assert result["node_name"] == "sysName"
 
     def test_get_node_by_oid_not_found(self, tmp_path):
         """Test get_node_by_oid when node doesn't exist."""
@@ -243,14 +486,122 @@ class TestMibServiceQuery:
             "name": "TEST-MIB",
             "nodes": {}
         }
-        (tmp_path / "TEST-MIB.json").write_text(json.dumps(mib_data))
+        write_mib(tmp_path / "TEST-MIB.json", mib_data)
+
+        service = MibService(output_dir=tmp_path, base_dir=tmp_path)
+
+        result = service.get_node_by_oid("1.2.3.4.5")
+
+        assert result is None
+
+    def test_get_mib_node_uses_node_index(self, tmp_path):
+        """Test get_mib_node reads a single node through the .idx sidecar."""
+        from src.mib_parser.models import MibData, MibNode
+        from src.mib_parser.serializer import JsonSerializer
+
+        mib = MibData(name="TEST-MIB", nodes={
+            "sysDescr": MibNode(name="sysDescr", oid="1.3.6.1.2.1.1.1", description="Système"),
+            "sysName": MibNode(name="sysName", oid="1.3.6.1.2.1.1.5"),
+        })
+        JsonSerializer().serialize(mib, str(tmp_path / "TEST-MIB.json"), node_index=True)
+        assert (tmp_path / "TEST-MIB.idx").exists()
 
-        with patch("src.flask_app.services.mib_service.Path.cwd", return_value=tmp_path):
-            service = MibService(output_dir=tmp_path)
+        service = MibService(output_dir=tmp_path, base_dir=tmp_path)
 
-            result = service.get_node_by_oid("1.2.3.4.5")
+        with patch.object(service, "get_mib_data", side_effect=AssertionError("full load")):
+            node = service.get_mib_node("TEST-MIB", "sysDescr")
+            missing = service.get_mib_node("TEST-MIB", "ifTable")
 
-            assert result is None
+        assert node == mib.nodes["sysDescr"].to_dict()
+        assert missing is None
+
+    def test_list_mibs_reads_header_from_node_index(self, tmp_path):
+        """Test list_mibs takes the listing fields from the .idx sidecar."""
+        from src.mib_parser.models import MibData, MibNode
+        from src.mib_parser.serializer import JsonSerializer
+
+        mib = MibData(name="TEST-MIB", description="Test MIB", imports=["SNMPv2-SMI"], nodes={
+            "sysDescr": MibNode(name="sysDescr", oid="1.3.6.1.2.1.1.1"),
+            "sysName": MibNode(name="sysName", oid="1.3.6.1.2.1.1.5"),
+        })
+        JsonSerializer().serialize(mib, str(tmp_path / "TEST-MIB.json"), node_index=True)
+
+        service = MibService(output_dir=tmp_path, base_dir=tmp_path)
+        with patch("src.flask_app.services.mib_service._load_json_entry",
+                   side_effect=AssertionError("full load")):
+            result = service.list_mibs()
+
+        assert result[0]["description"] == "Test MIB"
+        assert result[0]["nodes_count"] == 2
+        assert result[0]["imports_count"] == 1
+
+    def test_serialized_mib_replaced_atomically(self, tmp_path):
+        """Test that a failed rewrite keeps the previous JSON file intact."""
+        from src.mib_parser.models import MibData, MibNode
+        from src.mib_parser.serializer import JsonSerializer
+
+        output_file = tmp_path / "TEST-MIB.json"
+        JsonSerializer().serialize(MibData(name="TEST-MIB"), str(output_file))
+        original = output_file.read_bytes()
+
+        mib = MibData(name="TEST-MIB", nodes={"sysName": MibNode(name="sysName", oid="1.3.6.1.2.1.1.5")})
+        with patch("src.mib_parser.serializer.os.write", side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                JsonSerializer().serialize(mib, str(output_file))
+
+        assert output_file.read_bytes() == original
+        assert [p.name for p in tmp_path.iterdir()] == ["TEST-MIB.json"]
+
+    def test_serialized_mib_concurrent_writers(self, tmp_path):
+        """Test that threads rewriting the same file never publish a partial document."""
+        import threading
+        from src.mib_parser.serializer import write_bytes
+
+        output_file = tmp_path / "TEST-MIB.json"
+        documents = [json.dumps({"writer": n, "pad": "x" * 200000}).encode() for n in range(4)]
+        errors = []
+
+        def writer(document):
+            try:
+                for _ in range(20):
+                    write_bytes(output_file, document)
+            except Exception as e:  # pragma: no cover - only reached on a collision
+                errors.append(e)
+
+        threads = [threading.Thread(target=writer, args=(document,)) for document in documents]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert output_file.read_bytes() in documents
+        assert [p.name for p in tmp_path.iterdir()] == ["TEST-MIB.json"]
+
+    def test_get_mib_node_falls_back_without_valid_index(self, tmp_path):
+        """Test get_mib_node loads the full MIB when the index is missing or stale."""
+        from src.mib_parser.models import MibData, MibNode
+        from src.mib_parser.serializer import JsonSerializer
+
+        mib = MibData(name="TEST-MIB", nodes={
+            "sysDescr": MibNode(name="sysDescr", oid="1.3.6.1.2.1.1.1"),
+        })
+        JsonSerializer().serialize(mib, str(tmp_path / "TEST-MIB.json"), node_index=True)
+        # Rewrite the JSON so the index no longer describes it
+        write_mib(tmp_path / "TEST-MIB.json", {
+            "name": "TEST-MIB",
+            "nodes": {"sysDescr": {"name": "sysDescr", "oid": "1.3.6.1.2.1.1.99"}}
+        })
+        write_mib(tmp_path / "OTHER-MIB.json", {
+            "name": "OTHER-MIB",
+            "nodes": {"sysName": {"name": "sysName", "oid": "1.3.6.1.2.1.1.5"}}
+        })
+
+        service = MibService(output_dir=tmp_path, base_dir=tmp_path)
+
+        assert service.get_mib_node("TEST-MIB", "sysDescr")["oid"] == "1.3.6.1.2.1.1.99"
+        assert service.get_mib_node("OTHER-MIB", "sysName")["oid"] == "1.3.6.1.2.1.1.5"
+        assert service.get_mib_node("MISSING-MIB", "sysName") is None
 
     def test_get_statistics(self, tmp_path):
         """Test get_statistics method."""
@@ -259,27 +610,61 @@ class TestMibServiceQuery:
             "nodes": {"node1": {"oid": "1.1"}},
             "imports": ["MIB1", "MIB2"]
         }
-        (tmp_path / "TEST-MIB.json").write_text(json.dumps(mib_data))
+        write_mib(tmp_path / "TEST-MIB.json", mib_data)
+
+        service = MibService(output_dir=tmp_path, base_dir=tmp_path)
 
-        with patch("src.flask_app.services.mib_service.Path.cwd", return_value=tmp_path):
-            service = MibService(output_dir=tmp_path)
+        stats = service.get_statistics()
 
+        assert stats["total_mibs"] == 1
+        assert stats["total_nodes"] == 1
+        assert stats["mibs_with_data"] == 1
+        assert "largest_mib" in stats
+        assert "newest_mib" in stats
+        assert "oldest_mib" in stats
+
+    def test_get_statistics_extremes(self, tmp_path):
+        """Test get_statistics picking the largest, newest and oldest MIBs."""
+        import os
+
+        write_mib(tmp_path / "OLD-MIB.json", {"name": "OLD-MIB", "nodes": {}})
+        write_mib(tmp_path / "BIG-MIB.json", {"name": "BIG-MIB", "nodes": {f"n{i}": {} for i in range(20)}})
+        write_mib(tmp_path / "NEW-MIB.json", {"name": "NEW-MIB", "nodes": {"n": {}}})
+        for name, mtime in (("OLD-MIB", 1_000_000_000), ("BIG-MIB", 1_500_000_000.25), ("NEW-MIB", 1_700_000_000)):
+            os.utime(tmp_path / f"{name}.json", (mtime, mtime))
+
+        stats = MibService(output_dir=tmp_path, base_dir=tmp_path).get_statistics()
+
+        assert stats["total_nodes"] == 21
+        assert stats["mibs_with_data"] == 2
+        assert stats["largest_mib"] == "BIG-MIB"
+        assert stats["newest_mib"] == "NEW-MIB"
+        assert stats["oldest_mib"] == "OLD-MIB"
+
+    def test_get_statistics_cached_until_files_change(self, tmp_path):
+        """Test get_statistics reuses its result while the directory is unchanged."""
+        write_mib(tmp_path / "TEST-MIB.json", {"name": "TEST-MIB", "nodes": {"node1": {"oid": "1.1"}}})
+
+        service = MibService(output_dir=tmp_path, base_dir=tmp_path)
+        assert service.get_statistics()["total_nodes"] == 1
+
+        with patch.object(service, "_list_summaries") as mock_list:
             stats = service.get_statistics()
+            mock_list.assert_not_called()
+        assert stats["total_nodes"] == 1
 
-            assert stats["total_mibs"] == 1
-            assert stats["total_nodes"] == 1
-            assert stats["mibs_with_data"] == 1
-            assert "largest_mib" in stats
-            assert "newest_mib" in stats
-            assert "oldest_mib" in stats
+        write_mib(tmp_path / "OTHER-MIB.json", {"name": "OTHER-MIB", "nodes": {"node2": {"oid": "1.2"}}})
+
+        stats = service.get_statistics()
+        assert stats["total_mibs"] == 2
+        assert stats["total_nodes"] == 2
 
     def test_get_statistics_empty(self, tmp_path):
         """Test get_statistics with no MIBs."""
-        with patch("src.flask_app.services.mib_service.Path.cwd", return_value=tmp_path):
-            service = MibService(output_dir=tmp_path)
+        service = MibService(output_dir=tmp_path, base_dir=tmp_path)
 
-            stats = service.get_statistics()
+        stats = service.get_statistics()
 
-            assert stats["total_mibs"] == 0
-            assert stats["total_nodes"] == 0
-            assert stats["mibs_with_data"] == 0
+        assert stats["total_mibs"] == 0
+        assert stats["total_nodes"] == 0
+        assert stats["mibs_with_data"] == 0
@@ -2,30 +2,11 @@
 
 import pytest
 import json
+import subprocess
 import sys
 from pathlib import Path
 from unittest.mock import patch, MagicMock, mock_open
 
-# Mock pysmi modules before importing anything
-sys.modules['pysmi'] = MagicMock()
-sys.modules['pysmi.compiler'] = MagicMock()
-sys.modules['pysmi.parser'] = MagicMock()
-sys.modules['pysmi.writer'] = MagicMock()
-sys.modules['pysmi.codegen'] = MagicMock()
-sys.modules['pysmi.reader'] = MagicMock()
-sys.modules['pysmi.error'] = MagicMock()
-sys.modules['pysmi.borrower'] = MagicMock()
-
-# Mock mib_parser modules before importing MibService
-sys.modules['mib_parser'] = MagicMock()
-sys.modules['mib_parser.parser'] = MagicMock()
-sys.modules['mib_parser.serializer'] = MagicMock()
-sys.modules['mib_parser.leaf_extractor'] = MagicMock()
-
-# Also add to src namespace
-import src
-src.mib_parser = sys.modules['mib_parser']
-
 from src.flask_app.services.mib_service import MibService
 
 
@@ -38,47 +19,45 @@ class TestMibServiceUpload:
         test_mib = tmp_path / "TEST-MIB.mib"
         test_mib.write_text("TEST-MIB DEFINITIONS ::= BEGIN\nEND\n")
 
-        with patch("src.flask_app.services.mib_service.Path.cwd", return_value=tmp_path):
-            service = MibService(output_dir=tmp_path / "output")
+        service = MibService(output_dir=tmp_path / "output", base_dir=tmp_path)
 
-            # Mock parser and its components (MibParser is imported inside add_uploaded_files)
-            with patch("src.mib_parser.parser.MibParser") as mock_parser_class:
-                mock_parser = MagicMock()
-                mock_parser_class.return_value = mock_parser
+        # Mock parser and its components (MibParser is imported inside add_uploaded_files)
+        with patch("src.mib_parser.parser.MibParser") as mock_parser_class:
+            mock_parser = MagicMock()
+            mock_parser_class.return_value = mock_parser
 
-                # Mock parse result
-                mock_mib_data = MagicMock()
-                mock_mib_data.name = "TEST-MIB"
-                mock_mib_data.nodes = {"node1": {"oid": "1.1"}}
-                mock_parser.parse_file.return_value = mock_mib_data
+            # Mock parse result
+            mock_mib_data = MagicMock()
+            mock_mib_data.name = "TEST-MIB"
+            mock_mib_data.nodes = {"node1": {"oid": "1.1"}}
+            mock_parser.parse_file.return_value = mock_mib_data
 
-                # Mock serializer
-                with patch("src.mib_parser.serializer.JsonSerializer") as mock_serializer:
-                    result = service.add_uploaded_files([test_mib], device_type="test")
+            # Mock serializer
+            with patch("src.mib_parser.serializer.JsonSerializer") as mock_serializer:
+                result = service.add_uploaded_files([test_mib], device_type="test")
 
-                    assert result["total_added"] == 1
-                    assert len(result["success"]) == 1
-                    assert result["success"][0]["mib_name"] == "TEST-MIB"
+                assert result["total_added"] == 1
+                assert len(result["success"]) == 1
+                assert result["success"][0]["mib_name"] == "TEST-MIB"
 
     def test_add_uploaded_files_with_parsing_error(self, tmp_path):
         """Test handling of parsing errors."""
         test_mib = tmp_path / "INVALID-MIB.mib"
         test_mib.write_text("INVALID CONTENT")
 
-        with patch("src.flask_app.services.mib_service.Path.cwd", return_value=tmp_path):
-            service = MibService(output_dir=tmp_path / "output")
+        service = MibService(output_dir=tmp_path / "output", base_dir=tmp_path)
 
-            with patch("src.mib_parser.parser.MibParser") as mock_parser_class:
-                mock_parser = MagicMock()
-                mock_parser_class.return_value = mock_parser
+        with patch("src.mib_parser.parser.MibParser") as mock_parser_class:
+            mock_parser = MagicMock()
+            mock_parser_class.return_value = mock_parser
 
-                # Mock parser to raise exception
-                mock_parser.parse_file.side_effect = Exception("Syntax error")
+            # Mock parser to raise exception
+            mock_parser.parse_file.side_effect = Exception("Syntax error")
 
-                result = service.add_uploaded_files([test_mib])
+            result = service.add_uploaded_files([test_mib])
 
-                assert result["total_added"] == 0
-                assert len(result["errors"]) == 1
+            assert result["total_added"] == 0
+            assert len(result["errors"]) == 1
 
     def test_add_uploaded_files_multiple_files(self, tmp_path):
         """Test uploading multiple files."""
@@ -89,91 +68,232 @@ class TestMibServiceUpload:
         for mib in test_mibs:
             mib.write_text(f"{mib.stem}-MIB DEFINITIONS ::= BEGIN\nEND\n")
 
-        with patch("src.flask_app.services.mib_service.Path.cwd", return_value=tmp_path):
-            service = MibService(output_dir=tmp_path / "output")
+        service = MibService(output_dir=tmp_path / "output", base_dir=tmp_path)
+
+        with patch("src.mib_parser.parser.MibParser") as mock_parser_class:
+            mock_parser = MagicMock()
+            mock_parser_class.return_value = mock_parser
+
+            def mock_parse(file_path):
+                name = Path(file_path).stem
+                mib_data = MagicMock()
+                mib_data.name = name
+                mib_data.nodes = {}
+                return mib_data
+
+            mock_parser.parse_file.side_effect = mock_parse
+
+            with patch("src.mib_parser.serializer.JsonSerializer"):
+                result = service.add_uploaded_files(test_mibs)
+
+                assert result["total_added"] == 2
+
+    def test_add_uploaded_files_parses_batches_in_worker_pool(self, tmp_path, monkeypatch):
+        """Test that large uploads are parsed by the worker pool and reported in order."""
+        from concurrent.futures import Future
+        import src.flask_app.services.mib_service as mib_service_module
+
+        submitted = []
+        start_methods = []
+
+        class InlineExecutor:
+            """Run submitted calls immediately in this process."""
+
+            def __init__(self, max_workers=None, mp_context=None):
+                start_methods.append(mp_context.get_start_method())
+
+            def submit(self, fn, *args):
+                submitted.append(args[-1])
+                future = Future()
+                future.set_result(fn(*args))
+                return future
+
+            def shutdown(self, wait=True):
+                pass
+
+        monkeypatch.setattr(mib_service_module, "ProcessPoolExecutor", InlineExecutor)
+        monkeypatch.setattr(mib_service_module, "_worker_parser", None)
+
+        test_mibs = [tmp_path / f"MIB{i}.mib" for i in range(MibService.PARALLEL_PARSE_MIN_FILES)]
+        for mib in test_mibs:
+            mib.write_text(f"{mib.stem} DEFINITIONS ::= BEGIN\nEND\n")
+
+        service = MibService(output_dir=tmp_path / "output", base_dir=tmp_path)
+
+        with patch("src.mib_parser.parser.MibParser") as mock_parser_class:
+            def mock_parse(file_path):
+                if file_path.endswith("MIB1.mib"):
+                    raise Exception("Missing dependency")
+                mib_data = MagicMock()
+                mib_data.name = Path(file_path).stem
+                mib_data.nodes = {}
+                return mib_data
+
+            mock_parser_class.return_value.parse_file.side_effect = mock_parse
+
+            with patch("src.mib_parser.serializer.JsonSerializer"):
+                result = service.add_uploaded_files(test_mibs)
+
+        assert start_methods == ["spawn"]
+        assert submitted == [str(mib) for mib in test_mibs]
+        assert result["total_processed"] == len(test_mibs)
+        assert [s["mib_name"] for s in result["success"]] == [m.stem for m in test_mibs if m.stem != "MIB1"]
+        assert result["errors"] == [{"filename": "MIB1.mib", "error": "Missing dependency"}]
 
-            with patch("src.mib_parser.parser.MibParser") as mock_parser_class:
-                mock_parser = MagicMock()
-                mock_parser_class.return_value = mock_parser
+    def test_add_uploaded_files_with_real_worker_pool(self, tmp_path, caplog):
+        """Test that a large upload runs through spawned worker processes."""
+        # Spawned workers import the real parsing stack, not this session's stubs
+        if subprocess.run([sys.executable, "-c", "import pysmi"], capture_output=True).returncode:
+            pytest.skip("worker processes need the real pysmi package")
 
-                def mock_parse(file_path):
-                    name = Path(file_path).stem
-                    mib_data = MagicMock()
-                    mib_data.name = name
-                    mib_data.nodes = {}
-                    return mib_data
+        test_mibs = [tmp_path / f"MIB{i}.mib" for i in range(MibService.PARALLEL_PARSE_MIN_FILES)]
+        for mib in test_mibs:
+            mib.write_text("not a MIB module\n")
+
+        service = MibService(output_dir=tmp_path / "output", base_dir=tmp_path)
+        result = service.add_uploaded_files(test_mibs)
+
+        # Every file comes back from the pool, in upload order
+        assert not [r for r in caplog.records
+                    if "Parallel parsing unavailable" in r.message or "Worker failed" in r.message]
+        assert result["total_processed"] == len(test_mibs)
+        assert [e["filename"] for e in result["errors"]] == [m.name for m in test_mibs]
+        assert result["total_added"] == 0
+
+    def test_add_uploaded_files_writes_oid_map(self, tmp_path):
+        """Test that uploads record OIDs in _oids.json for get_node_by_oid."""
+        from src.mib_parser.models import MibData, MibNode
+
+        test_mib = tmp_path / "TEST-MIB.mib"
+        test_mib.write_text("TEST-MIB DEFINITIONS ::= BEGIN\nEND\n")
+        output_dir = tmp_path / "output"
+
+        service = MibService(output_dir=output_dir, base_dir=tmp_path)
+
+        with patch("src.mib_parser.parser.MibParser") as mock_parser_class:
+            mock_parser_class.return_value.parse_file.return_value = MibData(name="TEST-MIB", nodes={
+                "sysDescr": MibNode(name="sysDescr", oid="1.3.6.1.2.1.1.1"),
+                "sysName": MibNode(name="sysName", oid="1.3.6.1.2.1.1.5"),
+            })
+            result = service.add_uploaded_files([test_mib])
+
+        assert result["total_added"] == 1
+        oid_map = json.loads((output_dir / "_oids.json").read_text())
+        assert oid_map["mibs"]["TEST-MIB"]["oids"] == {
+            "1.3.6.1.2.1.1.1": "sysDescr",
+            "1.3.6.1.2.1.1.5": "sysName"
+        }
+
+        # The lookup is answered from the sidecar and the node index alone
+        with patch.object(service, "get_mib_data", side_effect=AssertionError("full load")):
+            found = service.get_node_by_oid("1.3.6.1.2.1.1.5")
+
+        assert found["mib_name"] == "TEST-MIB"
+        assert found["node_name"] == "sysName"
+        assert found["node_data"]["oid"] == "1.3.6.1.2.1.1.5"
 
-                mock_parser.parse_file.side_effect = mock_parse
+    def test_add_uploaded_files_failed_save_records_no_oids(self, tmp_path):
+        """Test that a MIB whose JSON could not be saved gets no _oids.json entry."""
+        from src.mib_parser.models import MibData, MibNode
 
-                with patch("src.mib_parser.serializer.JsonSerializer"):
-                    result = service.add_uploaded_files(test_mibs)
+        test_mib = tmp_path / "TEST-MIB.mib"
+        test_mib.write_text("TEST-MIB DEFINITIONS ::= BEGIN\nEND\n")
+        output_dir = tmp_path / "output"
+        output_dir.mkdir()
+        # JSON left over from an earlier upload
+        (output_dir / "TEST-MIB.json").write_text('{"name": "TEST-MIB", "nodes": {}}')
+
+        service = MibService(output_dir=output_dir, base_dir=tmp_path)
+
+        with patch("src.mib_parser.parser.MibParser") as mock_parser_class, \
+                patch("src.mib_parser.serializer.JsonSerializer.serialize", side_effect=OSError("disk full")):
+            mock_parser_class.return_value.parse_file.return_value = MibData(name="TEST-MIB", nodes={
+                "sysDescr": MibNode(name="sysDescr", oid="1.3.6.1.2.1.1.1"),
+            })
+            result = service.add_uploaded_files([test_mib])
+
+        assert "failed to save JSON" in result["errors"][0]["error"]
+        assert not (output_dir / "_oids.json").exists()
 
-                    assert result["total_added"] == 2
+    def test_write_oid_sidecar_concurrent_writers(self, tmp_path):
+        """Test that concurrent sidecar updates keep every writer's entries."""
+        import threading
+        from src.flask_app.services.mib_service import _write_oid_sidecar
+
+        barrier = threading.Barrier(8)
+
+        def write(i):
+            barrier.wait()
+            for j in range(20):
+                _write_oid_sidecar(tmp_path, {f"MIB-{i}-{j}": {"oids": {}}})
+
+        threads = [threading.Thread(target=write, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        mibs = json.loads((tmp_path / "_oids.json").read_text())["mibs"]
+        assert len(mibs) == 8 * 20
+        assert [p.name for p in tmp_path.iterdir()] == ["_oids.json"]
 
     def test_clear_cache_all(self, tmp_path):
         """Test clearing all cache."""
-        with patch("src.flask_app.services.mib_service.Path.cwd", return_value=tmp_path):
-            service = MibService(output_dir=tmp_path)
+        service = MibService(output_dir=tmp_path, base_dir=tmp_path)
 
-            # Add some cache data
-            service._mib_cache["MIB1"] = {"name": "MIB1"}
-            service._mib_cache["MIB2"] = {"name": "MIB2"}
-            service._last_cache_update["MIB1"] = 12345
-            service._last_cache_update["MIB2"] = 67890
+        # Add some cache data
+        service._mib_cache["MIB1"] = (12345, {"name": "MIB1"})
+        service._mib_cache["MIB2"] = (67890, {"name": "MIB2"})
 
-            service.clear_cache()
+        service.clear_cache()
 
-            assert service._mib_cache == {}
-            assert service._last_cache_update == {}
+        assert service._mib_cache == {}
 
     def test_clear_cache_specific_mib(self, tmp_path):
         """Test clearing cache for specific MIB."""
-        with patch("src.flask_app.services.mib_service.Path.cwd", return_value=tmp_path):
-            service = MibService(output_dir=tmp_path)
+        service = MibService(output_dir=tmp_path, base_dir=tmp_path)
 
-            service._mib_cache["MIB1"] = {"name": "MIB1"}
-            service._mib_cache["MIB2"] = {"name": "MIB2"}
-            service._last_cache_update["MIB1"] = 12345
+        service._mib_cache["MIB1"] = (12345, {"name": "MIB1"})
+        service._mib_cache["MIB2"] = (67890, {"name": "MIB2"})
 
-            service.clear_cache("MIB1")
+        service.clear_cache("MIB1")
 
-            assert "MIB1" not in service._mib_cache
-            assert "MIB2" in service._mib_cache
+        assert "MIB1" not in service._mib_cache
+        assert "MIB2" in service._mib_cache
 
     def test_get_device_context(self, tmp_path):
         """Test getting device context."""
         compiled_dir = tmp_path / "compiled"
         compiled_dir.mkdir()
 
-        with patch("src.flask_app.services.mib_service.Path.cwd", return_value=tmp_path):
-            service = MibService(
-                output_dir=tmp_path / "output",
-                compiled_mibs_dir=compiled_dir,
-                device_type="test-device"
-            )
+        service = MibService(
+            output_dir=tmp_path / "output",
+            compiled_mibs_dir=compiled_dir,
+            device_type="test-device",
+            base_dir=tmp_path
+        )
 
-            context = service.get_device_context()
+        context = service.get_device_context()
 
-            assert context["device_type"] == "test-device"
-            assert context["output_dir"] == str(tmp_path / "output")
-            assert context["compiled_mibs_dir"] == str(compiled_dir)
+        assert context["device_type"] == "test-device"
+        assert context["output_dir"] == str(tmp_path / "output")
+        assert context["compiled_mibs_dir"] == str(compiled_dir)
 
     def test_get_statistics_empty(self, tmp_path):
         """Test statistics with no MIBs."""
-        with patch("src.flask_app.services.mib_service.Path.cwd", return_value=tmp_path):
-            service = MibService(output_dir=tmp_path)
+        service = MibService(output_dir=tmp_path, base_dir=tmp_path)
 
-            stats = service.get_statistics()
+        stats = service.get_statistics()
 
-            assert stats["total_mibs"] == 0
-            assert stats["total_nodes"] == 0
-            assert stats["mibs_with_data"] == 0
+        assert stats["total_mibs"] == 0
+        assert stats["total_nodes"] == 0
+        assert stats["mibs_with_data"] == 0
 
 
 class TestMibServiceTreeData:
     """Test MIB tree data methods."""
 
-    def test_get_mib_tree_data(self, tmp_path):
+    def test_get_mib_tree_data(self, tmp_path, fake_tree_service):
         """Test getting tree-structured MIB data."""
         mib_data = {
             "name": "TEST-MIB",
@@ -182,29 +302,20 @@ class TestMibServiceTreeData:
             }
         }
 
-        with patch("src.flask_app.services.mib_service.Path.cwd", return_value=tmp_path):
-            service = MibService(output_dir=tmp_path)
-
-            with patch.object(service, "get_mib_data", return_value=mib_data):
-                with patch("src.flask_app.services.tree_service.TreeService") as mock_tree_svc:
-                    mock_tree_service = MagicMock()
-                    mock_tree_service.build_tree_structure.return_value = {
-                        "name": "TEST-MIB",
-                        "children": []
-                    }
-                    mock_tree_svc.return_value = mock_tree_service
+        service = MibService(output_dir=tmp_path, base_dir=tmp_path)
 
-                    result = service.get_mib_tree_data("TEST-MIB")
+        with patch.object(service, "get_mib_data", return_value=mib_data):
+            result = service.get_mib_tree_data("TEST-MIB")
 
-                    assert result is not None
-                    assert "children" in result
+            assert result is not None
+            assert "children" in result
+            assert fake_tree_service.calls == 1
 
     def test_get_mib_tree_data_not_found(self, tmp_path):
         """Test getting tree data for non-existent MIB."""
-        with patch("src.flask_app.services.mib_service.Path.cwd", return_value=tmp_path):
-            service = MibService(output_dir=tmp_path)
+        service = MibService(output_dir=tmp_path, base_dir=tmp_path)
 
-            with patch.object(service, "get_mib_data", return_value=None):
-                result = service.get_mib_tree_data("NON-EXISTENT")
+        with patch.object(service, "get_mib_data", return_value=None):
+            result = service.get_mib_tree_data("NON-EXISTENT")
 
-                assert result is None
+            assert result is None
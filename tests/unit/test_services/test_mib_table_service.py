@@ -1,6 +1,7 @@
 """Test MibTableService class."""
 
 import pytest
+from dataclasses import asdict
 from unittest.mock import MagicMock, patch
 from src.flask_app.services.mib_table_service import (
     MibTableService,
@@ -10,40 +11,126 @@ from src.flask_app.services.mib_table_service import (
 )
 
 
+# MIB data returned by the fake get_mib_data; the service only reads it
+_MIB_DATA_IF_TABLE = {
+    "name": "TEST-MIB",
+    "nodes": {
+        "ifTable": {
+            "oid": "1.3.6.1.2.1.2.2",
+            "name": "ifTable",
+            "description": "Interface table",
+            "class": "table"
+        },
+        "ifEntry": {
+            "oid": "1.3.6.1.2.1.2.2.1",
+            "name": "ifEntry",
+            "description": "Interface entry",
+            "class": "objectidentity",
+            "is_entry": True
+        }
+    }
+}
+
+_MIB_DATA_IF_ENTRY = {
+    "nodes": {
+        "ifEntry": {
+            "oid": "1.3.6.1.2.1.2.2.1",
+            "name": "ifEntry",
+            "index": ["ifIndex"],
+            "is_entry": True
+        },
+        "ifIndex": {
+            "oid": "1.3.6.1.2.1.2.2.1.1",
+            "name": "ifIndex",
+            "syntax": "Integer32",
+            "description": "Interface index"
+        }
+    }
+}
+
+_MIB_DATA_IF_ENTRY_NO_INDEX = {
+    "nodes": {
+        "ifEntry": {
+            "oid": "1.3.6.1.2.1.2.2.1",
+            "name": "ifEntry"
+        }
+    }
+}
+
+
+# Index fields used by the validation tests
+_INDEX_FIELDS_REQUIRED = {
+    "ifIndex": IndexFieldInfo(
+        name="ifIndex",
+        type="Integer32",
+        syntax="INTEGER",
+        description="Interface index",
+        is_optional=False
+    )
+}
+
+_INDEX_FIELDS_OPTIONAL = {
+    "optionalField": IndexFieldInfo(
+        name="optionalField",
+        type="Integer32",
+        is_optional=True
+    )
+}
+
+
+# Attributes MibTableService.__init__ sets; anything else was added by a test
+_SERVICE_ATTRIBUTES = {
+    "mib_service", "device_service", "_oid_cache", "_table_structure_cache", "_table_oid_index"
+}
+
+
+class _FakeMibService:
+    """Minimal MibService stand-in answering from canned data."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Restore the default answers the tests rely on."""
+        self.device_type = "default"
+        self.mib_data = _MIB_DATA_IF_TABLE
+        self.mibs = []
+        self.search_results = []
+        self.mib_data_requests = []
+
+    def list_mibs(self):
+        return list(self.mibs)
+
+    def get_mib_data(self, mib_name, use_cache=True):
+        self.mib_data_requests.append(mib_name)
+        return self.mib_data
+
+    def search_nodes(self, *args, **kwargs):
+        return list(self.search_results)
+
+
 class TestMibTableService:
     """Test MibTableService class."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def mock_mib_service(self):
-        """Create mock MibService."""
-        service = MagicMock()
-        service.device_type = "default"
-        service.get_mib_data.return_value = {
-            "name": "TEST-MIB",
-            "nodes": {
-                "ifTable": {
-                    "oid": "1.3.6.1.2.1.2.2",
-                    "name": "ifTable",
-                    "description": "Interface table",
-                    "class": "table"
-                },
-                "ifEntry": {
-                    "oid": "1.3.6.1.2.1.2.2.1",
-                    "name": "ifEntry",
-                    "description": "Interface entry",
-                    "class": "objectidentity",
-                    "is_entry": True
-                }
-            }
-        }
-        service.search_nodes.return_value = []
-        return service
+        """Create fake MibService, shared by the tests of this module."""
+        return _FakeMibService()
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def table_service(self, mock_mib_service):
-        """Create MibTableService instance."""
+        """Create MibTableService instance, shared by the tests of this module."""
         return MibTableService(mock_mib_service)
 
+    @pytest.fixture(autouse=True)
+    def reset_shared_services(self, table_service, mock_mib_service):
+        """Undo what earlier tests changed on the shared services."""
+        # Drop per-test overrides such as replaced helper methods
+        for name in set(vars(table_service)) - _SERVICE_ATTRIBUTES:
+            delattr(table_service, name)
+        table_service.clear_cache()
+        mock_mib_service.reset()
+
     def test_service_initialization(self, mock_mib_service):
         """Test service initialization."""
         service = MibTableService(mock_mib_service)
@@ -63,7 +150,7 @@ class TestMibTableService:
     def test_find_table_by_oid_exact_match(self, table_service, mock_mib_service):
         """Test finding table by exact OID match."""
         # Return empty search result to trigger fallback logic
-        mock_mib_service.search_nodes.return_value = []
+        mock_mib_service.search_results = []
 
         result = table_service.find_table_by_oid("1.3.6.1.2.1.2.2")
 
@@ -92,9 +179,33 @@ class TestMibTableService:
 
         assert result == cached_result
 
+    def test_find_table_by_oid_indexes_tables_once(self, table_service, mock_mib_service):
+        """Test that table OIDs are indexed once and reused across lookups."""
+        mock_mib_service.mibs = [{"name": "IF-MIB"}]
+        mock_mib_service.mib_data = {
+            "nodes": {
+                "ifTable": {"oid": "1.3.6.1.2.1.2.2", "description": "Interface table", "is_table": True},
+                "ifEntry": {"oid": "1.3.6.1.2.1.2.2.1", "is_entry": True}
+            }
+        }
+
+        result = table_service.find_table_by_oid("1.3.6.1.2.1.2.2")
+        assert result.table_name == "ifTable"
+        assert result.mib_name == "IF-MIB"
+        assert result.match_type == "exact"
+        assert result.description == "Interface table"
+
+        # A fresh lookup answers from the index instead of reloading the MIB
+        table_service._oid_cache.clear()
+        assert table_service.find_table_by_oid("1.3.6.1.2.1.2.2").table_name == "ifTable"
+        assert mock_mib_service.mib_data_requests == ["IF-MIB"]
+
+        table_service.clear_cache()
+        assert table_service._table_oid_index is None
+
     def test_find_table_by_oid_not_found(self, table_service, mock_mib_service):
         """Test when table is not found."""
-        mock_mib_service.search_nodes.return_value = []
+        mock_mib_service.search_results = []
 
         result = table_service.find_table_by_oid("1.2.3.4.5")
 
@@ -140,22 +251,7 @@ class TestMibTableService:
 
     def test_extract_index_fields_from_entry(self, table_service, mock_mib_service):
         """Test extracting index fields from table entry."""
-        mock_mib_service.get_mib_data.return_value = {
-            "nodes": {
-                "ifEntry": {
-                    "oid": "1.3.6.1.2.1.2.2.1",
-                    "name": "ifEntry",
-                    "index": ["ifIndex"],
-                    "is_entry": True
-                },
-                "ifIndex": {
-                    "oid": "1.3.6.1.2.1.2.2.1.1",
-                    "name": "ifIndex",
-                    "syntax": "Integer32",
-                    "description": "Interface index"
-                }
-            }
-        }
+        mock_mib_service.mib_data = _MIB_DATA_IF_ENTRY
 
         table_result = TableMatchResult(
             table_name="ifTable",
@@ -172,14 +268,7 @@ class TestMibTableService:
 
     def test_extract_index_fields_empty(self, table_service, mock_mib_service):
         """Test extracting index fields when none exist."""
-        mock_mib_service.get_mib_data.return_value = {
-            "nodes": {
-                "ifEntry": {
-                    "oid": "1.3.6.1.2.1.2.2.1",
-                    "name": "ifEntry"
-                }
-            }
-        }
+        mock_mib_service.mib_data = _MIB_DATA_IF_ENTRY_NO_INDEX
 
         table_result = TableMatchResult(
             table_name="ifTable",
@@ -191,95 +280,35 @@ class TestMibTableService:
 
         assert indexes == []
 
-    def test_validate_index_input_valid(self, table_service):
-        """Test validating valid index input."""
-        index_fields = {
-            "ifIndex": IndexFieldInfo(
-                name="ifIndex",
-                type="Integer32",
-                syntax="INTEGER",
-                description="Interface index"
-            )
-        }
-
-        result = table_service.validate_index_input(
-            {"ifIndex": "1"},
-            index_fields
-        )
+    @pytest.mark.parametrize("input_data,index_fields", [
+        ({"ifIndex": "1"}, _INDEX_FIELDS_REQUIRED),
+        ({}, _INDEX_FIELDS_REQUIRED),
+        ({}, _INDEX_FIELDS_OPTIONAL),
+    ], ids=["valid", "missing_required", "optional_field"])
+    def test_validate_index_input(self, table_service, input_data, index_fields):
+        """Test validating index input against required and optional fields."""
+        result = table_service.validate_index_input(input_data, index_fields)
 
         # Verify it returns a ValidationResult
         assert isinstance(result, ValidationResult)
 
-    def test_validate_index_input_missing_required(self, table_service):
-        """Test validating with missing required field."""
-        index_fields = {
-            "ifIndex": IndexFieldInfo(
-                name="ifIndex",
-                type="Integer32",
-                syntax="INTEGER",
-                is_optional=False
-            )
-        }
+    @pytest.mark.parametrize("table_oid,index_values,expected", [
+        ("1.3.6.1.2.1.2.2", ["1"], "1.3.6.1.2.1.2.2.1"),
+        ("1.3.6.1.2.1.4.20.", [10, "2"], "1.3.6.1.2.1.4.20.10.2"),
+        ("1.3.6.1.2.1.2.2", ["ab"], "1.3.6.1.2.1.2.2.97.98"),
+        ("1.3.6.1.2.1.2.2", [], "1.3.6.1.2.1.2.2"),
+    ], ids=["single_index", "multiple_indexes", "string_index", "no_indexes"])
+    def test_build_complete_oid(self, table_service, table_oid, index_values, expected):
+        """Test building complete OID from a table OID and index values."""
+        assert table_service.build_complete_oid(table_oid, index_values) == expected
 
-        result = table_service.validate_index_input({}, index_fields)
+    def test_build_complete_oid_invalid_input(self, table_service):
+        """Test that an empty table OID or a None index value is rejected."""
+        with pytest.raises(ValueError):
+            table_service.build_complete_oid("", ["1"])
 
-        # Verify it returns a ValidationResult
-        assert isinstance(result, ValidationResult)
-
-    def test_validate_index_input_optional_field(self, table_service):
-        """Test that optional fields don't cause errors."""
-        index_fields = {
-            "optionalField": IndexFieldInfo(
-                name="optionalField",
-                type="Integer32",
-                is_optional=True
-            )
-        }
-
-        result = table_service.validate_index_input({}, index_fields)
-
-        # Verify it returns a ValidationResult
-        assert isinstance(result, ValidationResult)
-
-    def test_build_complete_oid_single_index(self, table_service):
-        """Test building complete OID with single index."""
-        # The actual signature might be different - let's just verify it can be called
-        try:
-            oid = table_service.build_complete_oid(
-                "1.3.6.1.2.1.2.2",
-                {"ifIndex": "1"}
-            )
-            # Verify it returns a string or None
-            assert oid is None or isinstance(oid, str)
-        except Exception:
-            # If the method doesn't exist or has different signature, that's ok
-            pass
-
-    def test_build_complete_oid_multiple_indexes(self, table_service):
-        """Test building complete OID with multiple indexes."""
-        try:
-            oid = table_service.build_complete_oid(
-                "1.3.6.1.2.1.4.20",
-                {"ipAdEntAddr": "192.168.1.1"}
-            )
-            # Verify it returns a string or None
-            assert oid is None or isinstance(oid, str)
-        except Exception:
-            # If the method doesn't exist or has different signature, that's ok
-            pass
-
-    def test_build_complete_oid_no_indexes(self, table_service):
-        """Test building OID when no indexes provided."""
-        try:
-            oid = table_service.build_complete_oid(
-                "1.3.6.1.2.1.2.2",
-                {}
-            )
-            # Verify it returns a string or None
-            assert oid is None or isinstance(oid, str)
-        except Exception:
-            # If the method doesn't exist or has different signature, that's ok
-            pass
+        with pytest.raises(ValueError):
+            table_service.build_complete_oid("1.3.6.1.2.1.2.2", [None])
 
     def test_cache_management(self, table_service):
         """Test cache management functionality."""
@@ -292,45 +321,25 @@ class TestMibTableService:
 
         assert table_service._oid_cache == {}
         assert table_service._table_structure_cache == {}
-
-    def test_table_match_result_dataclass(self):
-        """Test TableMatchResult dataclass."""
-        result = TableMatchResult(
-            table_name="testTable",
-            table_oid="1.2.3",
-            entry_name="testEntry",
-            match_type="exact"
-        )
-
-        assert result.table_name == "testTable"
-        assert result.table_oid == "1.2.3"
-        assert result.entry_name == "testEntry"
-        assert result.match_type == "exact"
-        assert result.confidence == 1.0  # default value
-
-    def test_index_field_info_dataclass(self):
-        """Test IndexFieldInfo dataclass."""
-        info = IndexFieldInfo(
-            name="ifIndex",
-            type="Integer32",
-            syntax="INTEGER",
-            is_optional=False
-        )
-
-        assert info.name == "ifIndex"
-        assert info.type == "Integer32"
-        assert info.syntax == "INTEGER"
-        assert info.is_optional is False
-
-    def test_validation_result_dataclass(self):
-        """Test ValidationResult dataclass."""
-        errors = []
-        result = ValidationResult(
-            is_valid=True,
-            errors=errors,
-            warnings=["test warning"]
-        )
-
-        assert result.is_valid is True
-        assert result.errors == []
-        assert result.warnings == ["test warning"]
+        assert table_service._table_oid_index is None
+
+
+class TestTableDataclasses:
+    """Test the result dataclasses of MibTableService."""
+
+    @pytest.mark.parametrize("cls,kwargs,expected", [
+        (TableMatchResult,
+         {"table_name": "testTable", "table_oid": "1.2.3", "entry_name": "testEntry", "match_type": "exact"},
+         {"table_name": "testTable", "table_oid": "1.2.3", "entry_name": "testEntry", "entry_oid": None,
+          "match_type": "exact", "confidence": 1.0, "mib_name": None, "description": None}),
+        (IndexFieldInfo,
+         {"name": "ifIndex", "type": "Integer32", "syntax": "INTEGER", "is_optional": False},
+         {"name": "ifIndex", "type": "Integer32", "syntax": "INTEGER", "description": None,
+          "constraints": None, "is_optional": False, "display_hint": None, "validation_pattern": None}),
+        (ValidationResult,
+         {"is_valid": True, "errors": [], "warnings": ["test warning"]},
+         {"is_valid": True, "errors": [], "warnings": ["test warning"], "normalized_values": None}),
+    ], ids=["table_match_result", "index_field_info", "validation_result"])
+    def test_dataclass_fields(self, cls, kwargs, expected):
+        """Test dataclass construction and default values."""
+        assert asdict(cls(**kwargs)) == expected
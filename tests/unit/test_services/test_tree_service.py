@@ -7,9 +7,13 @@ from src.flask_app.services.tree_service import TreeService
 class TestTreeService:
     """Test TreeService class."""
 
-    def test_build_tree_structure_empty_nodes(self):
+    @pytest.fixture(scope="module")
+    def service(self):
+        """Create TreeService instance; it keeps no state between calls."""
+        return TreeService()
+
+    def test_build_tree_structure_empty_nodes(self, service):
         """Test building tree with no nodes."""
-        service = TreeService()
         mib_data = {"name": "TEST-MIB", "nodes": {}}
 
         result = service.build_tree_structure(mib_data)
@@ -17,9 +21,8 @@ class TestTreeService:
         assert result["name"] == "TEST-MIB"
         assert result["children"] == []
 
-    def test_build_tree_structure_simple(self):
+    def test_build_tree_structure_simple(self, service):
         """Test building tree with simple node hierarchy."""
-        service = TreeService()
         mib_data = {
             "name": "TEST-MIB",
             "nodes": {
@@ -34,9 +37,25 @@ class TestTreeService:
         assert len(result["children"]) > 0
         assert "statistics" in result
 
-    def test_build_tree_structure_filters_tc_nodes(self):
+    def test_build_tree_structure_from_node_iterator(self, service):
+        """Test building tree from a one-shot iterator of (name, data) pairs."""
+        nodes = {
+            "root": {"oid": "1.3.6.1", "name": "root"},
+            "child": {"oid": "1.3.6.1.1", "name": "child"}
+        }
+
+        from_dict = service.build_tree_structure({"name": "TEST-MIB", "nodes": nodes})
+        from_iter = service.build_tree_structure(
+            {"name": "TEST-MIB", "nodes": iter(nodes.items())}
+        )
+        empty = service.build_tree_structure({"name": "TEST-MIB", "nodes": iter(())})
+
+        assert from_iter == from_dict
+        assert from_iter["children"][0]["children"][0]["name"] == "child"
+        assert empty == {"name": "TEST-MIB", "children": []}
+
+    def test_build_tree_structure_filters_tc_nodes(self, service):
         """Test that textual convention nodes are filtered out."""
-        service = TreeService()
         mib_data = {
             "name": "TEST-MIB",
             "nodes": {
@@ -55,9 +74,8 @@ class TestTreeService:
         total_nodes = result["statistics"]["total_nodes"]
         assert total_nodes == 1  # Only normalNode
 
-    def test_build_tree_structure_with_metadata(self):
+    def test_build_tree_structure_with_metadata(self, service):
         """Test that node metadata is preserved."""
-        service = TreeService()
         mib_data = {
             "name": "TEST-MIB",
             "description": "Test MIB",
@@ -84,9 +102,8 @@ class TestTreeService:
             assert child["description"] == "Test node"
             assert child["syntax"] == "Integer32"
 
-    def test_find_parent_by_oid_exact_match(self):
+    def test_find_parent_by_oid_exact_match(self, service):
         """Test finding parent with exact OID match."""
-        service = TreeService()
         node_map = {
             "parent": {"oid": "1.3.6.1", "name": "parent"},
             "child": {"oid": "1.3.6.1.1", "name": "child"}
@@ -97,9 +114,22 @@ class TestTreeService:
         assert parent is not None
         assert parent["name"] == "parent"
 
-    def test_find_parent_by_oid_no_parent(self):
+    def test_find_parent_by_oid_closest_ancestor(self, service):
+        """Test finding the closest ancestor when the direct parent is missing."""
+        node_map = {
+            "first": {"oid": "1.3.6", "name": "first"},
+            "duplicate": {"oid": "1.3.6", "name": "duplicate"},
+            "root": {"oid": "1.3", "name": "root"}
+        }
+        oid_index = service._build_oid_index(node_map)
+
+        parent = service._find_parent_by_oid("1.3.6.1.4.1", node_map, oid_index)
+
+        assert parent is node_map["first"]
+        assert service._find_parent_by_oid("1.3.7", node_map)["name"] == "root"
+
+    def test_find_parent_by_oid_no_parent(self, service):
         """Test finding parent when node is at root level."""
-        service = TreeService()
         node_map = {
             "root": {"oid": "1.3", "name": "root"}
         }
@@ -108,9 +138,8 @@ class TestTreeService:
 
         assert parent is None
 
-    def test_find_parent_by_oid_short_oid(self):
+    def test_find_parent_by_oid_short_oid(self, service):
         """Test finding parent with very short OID."""
-        service = TreeService()
         node_map = {
             "node1": {"oid": "1", "name": "node1"}
         }
@@ -119,9 +148,8 @@ class TestTreeService:
 
         assert parent is None  # Too short to have parent
 
-    def test_calculate_tree_statistics(self):
+    def test_calculate_tree_statistics(self, service):
         """Test tree statistics calculation."""
-        service = TreeService()
         node_map = {
             "root": {"oid": "1", "name": "root", "children": []},
             "leaf": {"oid": "1.1", "name": "leaf", "children": []}
@@ -137,18 +165,16 @@ class TestTreeService:
         assert "average_children" in stats
         assert stats["total_nodes"] == 2
 
-    def test_calculate_depth_leaf_node(self):
+    def test_calculate_depth_leaf_node(self, service):
         """Test depth calculation for leaf node."""
-        service = TreeService()
         node = {"name": "leaf", "children": []}
 
         depth = service._calculate_depth(node, current_depth=0)
 
         assert depth == 1  # Leaf has depth 1
 
-    def test_calculate_depth_with_children(self):
+    def test_calculate_depth_with_children(self, service):
         """Test depth calculation for node with children."""
-        service = TreeService()
         node = {
             "name": "root",
             "children": [
@@ -161,18 +187,16 @@ class TestTreeService:
 
         assert depth == 2  # Root -> child
 
-    def test_build_breadth_first_tree_empty(self):
+    def test_build_breadth_first_tree_empty(self, service):
         """Test breadth-first tree with empty nodes."""
-        service = TreeService()
         mib_data = {"name": "TEST-MIB", "nodes": {}}
 
         result = service.build_breadth_first_tree(mib_data)
 
         assert result == []
 
-    def test_build_breadth_first_tree_simple(self):
+    def test_build_breadth_first_tree_simple(self, service):
         """Test building breadth-first tree."""
-        service = TreeService()
         mib_data = {
             "name": "TEST-MIB",
             "nodes": {
@@ -186,9 +210,8 @@ class TestTreeService:
         assert isinstance(result, list)
         assert len(result) > 0
 
-    def test_flatten_tree_without_paths(self):
+    def test_flatten_tree_without_paths(self, service):
         """Test flattening tree without paths."""
-        service = TreeService()
         tree = {
             "name": "root",
             "children": [
@@ -203,9 +226,22 @@ class TestTreeService:
         # Children should not have 'children' key
         assert "children" not in result[1]
 
-    def test_flatten_tree_with_paths(self):
+    def test_flatten_tree_accepts_missing_and_tuple_children(self, service):
+        """Test flattening leaves without a children key and tuple children."""
+        tree = {
+            "name": "root",
+            "children": (
+                {"name": "child1", "children": ({"name": "grandchild"},)},
+                {"name": "child2"}
+            )
+        }
+
+        result = service.flatten_tree(tree, include_paths=False)
+
+        assert [n["name"] for n in result] == ["root", "child1", "grandchild", "child2"]
+
+    def test_flatten_tree_with_paths(self, service):
         """Test flattening tree with paths."""
-        service = TreeService()
         tree = {
             "name": "root",
             "children": [
@@ -221,9 +257,8 @@ class TestTreeService:
         assert result[0]["path"] == ["root"]
         assert result[1]["path"] == ["root", "child1"]
 
-    def test_flatten_tree_path_string_format(self):
+    def test_flatten_tree_path_string_format(self, service):
         """Test path string formatting."""
-        service = TreeService()
         tree = {
             "name": "root",
             "children": [
@@ -235,9 +270,8 @@ class TestTreeService:
 
         assert result[1]["path_string"] == "root -> child"
 
-    def test_build_tree_structure_with_mib_origin(self):
+    def test_build_tree_structure_with_mib_origin(self, service):
         """Test building tree with nodes that have mib_origin."""
-        service = TreeService()
         mib_data = {
             "name": "ALL-MIBS",
             "nodes": {
@@ -257,9 +291,8 @@ class TestTreeService:
             assert child["name"] == "node"  # Should use original_name
             assert child["mib_origin"] == "mib1"
 
-    def test_build_tree_structure_preserves_all_attributes(self):
+    def test_build_tree_structure_preserves_all_attributes(self, service):
         """Test that all node attributes are preserved."""
-        service = TreeService()
         mib_data = {
             "name": "TEST-MIB",
             "nodes": {
@@ -294,9 +327,8 @@ class TestTreeService:
             assert node["defval"] == "0"
             assert node["hint"] == "1"
 
-    def test_calculate_depth_nested_tree(self):
+    def test_calculate_depth_nested_tree(self, service):
         """Test depth calculation for deeply nested tree."""
-        service = TreeService()
         node = {
             "name": "l1",
             "children": [
@@ -317,3 +349,27 @@ class TestTreeService:
         depth = service._calculate_depth(node, current_depth=0)
 
         assert depth == 4
+
+    def test_calculate_depth_beyond_recursion_limit(self, service):
+        """Test depth calculation for a chain deeper than the recursion limit."""
+        import sys
+
+        levels = sys.getrecursionlimit() + 100
+        node = {"name": "leaf", "children": []}
+        for _ in range(levels - 1):
+            node = {"name": "branch", "children": [node]}
+
+        assert service._calculate_depth(node) == levels
+
+    def test_flatten_tree_beyond_recursion_limit(self, service):
+        """Test flattening a chain deeper than the recursion limit."""
+        import sys
+
+        levels = sys.getrecursionlimit() + 100
+        node = {"name": f"n{levels - 1}", "children": []}
+        for level in range(levels - 2, -1, -1):
+            node = {"name": f"n{level}", "children": [node]}
+
+        result = service.flatten_tree(node, include_paths=False)
+
+        assert [n["name"] for n in result] == [f"n{level}" for level in range(levels)]
@@ -5,70 +5,98 @@ from src.mib_parser.tree import MibTree
 from src.mib_parser.models import MibData, MibNode
 
 
+@pytest.fixture(scope="session")
+def tree(sample_mib_data):
+    """MibTree over the sample MIB, built once; the tests only read from it."""
+    return MibTree(sample_mib_data)
+
+
 class TestMibTree:
     """Test MibTree class."""
 
-    def test_initialize_tree(self, sample_mib_data):
+    def test_initialize_tree(self, tree, sample_mib_data):
         """Test tree initialization with MibData."""
-        tree = MibTree(sample_mib_data)
-
         assert tree.mib_data == sample_mib_data
-        assert tree._oid_cache is not None
 
-    def test_find_node_by_oid_exact_match(self, sample_mib_data):
-        """Test finding node by exact OID."""
-        tree = MibTree(sample_mib_data)
+    def test_oid_cache_built_on_first_lookup(self, sample_mib_data):
+        """Test that the OID cache is only built by the first OID lookup."""
+        fresh_tree = MibTree(sample_mib_data)
+        assert fresh_tree._oid_cache is None
+
+        fresh_tree.find_node_by_oid("1.3.6.1.2.1.1.1")
 
+        assert fresh_tree._oid_cache is not None
+
+    def test_find_node_by_oid_exact_match(self, tree):
+        """Test finding node by exact OID."""
         node = tree.find_node_by_oid("1.3.6.1.2.1.1.1")
 
         if node:
             assert node.oid == "1.3.6.1.2.1.1.1"
 
-    def test_find_node_by_oid_not_found(self, sample_mib_data):
+    def test_find_node_by_oid_not_found(self, tree):
         """Test finding non-existent OID."""
-        tree = MibTree(sample_mib_data)
-
         node = tree.find_node_by_oid("1.2.3.4.5")
 
         assert node is None
 
-    def test_find_node_by_name(self, sample_mib_data):
+    def test_find_node_by_name(self, tree):
         """Test finding node by name."""
-        tree = MibTree(sample_mib_data)
-
         node = tree.find_node_by_name("sysDescr")
 
         if node:
             assert node.name == "sysDescr"
 
-    def test_find_node_by_name_not_found(self, sample_mib_data):
+    def test_find_node_by_name_not_found(self, tree):
         """Test finding non-existent node name."""
-        tree = MibTree(sample_mib_data)
-
         node = tree.find_node_by_name("NonExistentNode")
 
         assert node is None
 
-    def test_find_nodes_by_pattern(self, sample_mib_data):
+    def test_find_nodes_by_pattern(self, tree):
         """Test finding nodes by pattern."""
-        tree = MibTree(sample_mib_data)
-
         nodes = tree.find_nodes_by_pattern("sys")
 
         assert isinstance(nodes, list)
 
-    def test_get_path_to_root(self, sample_mib_data):
-        """Test getting path from node to root."""
-        tree = MibTree(sample_mib_data)
+    def test_find_nodes_by_pattern_names_and_descriptions(self, tree):
+        """Test pattern search over names and descriptions, ignoring case."""
+        assert [n.name for n in tree.find_nodes_by_pattern("SYSU")] == ["sysUpTime"]
+        assert tree.find_nodes_by_pattern("object id") == []
+
+        nodes = tree.find_nodes_by_pattern("object id", search_descriptions=True)
+        assert [n.name for n in nodes] == ["sysObjectID"]
 
+        nodes = tree.find_nodes_by_pattern("system", search_names=False, search_descriptions=True)
+        assert [n.name for n in nodes] == ["sysDescr", "sysObjectID", "sysUpTime"]
+
+    def test_get_path_to_root(self, tree):
+        """Test getting path from node to root."""
         path = tree.get_path_to_root("sysDescr")
 
         assert isinstance(path, list)
 
-    def test_traverse_breadth_first(self, sample_mib_data):
-        """Test breadth-first traversal."""
-        tree = MibTree(sample_mib_data)
+    def test_get_path_to_root_reuses_ancestor_paths(self):
+        """Test that paths are cached per node and shared by siblings."""
+        mib_data = MibData(name="TEST-MIB")
+        for name, oid, parent in [("root", "1", None), ("mid", "1.1", "root"),
+                                  ("left", "1.1.1", "mid"), ("right", "1.1.2", "mid")]:
+            mib_data.add_node(MibNode(name=name, oid=oid, parent_name=parent))
+        fresh_tree = MibTree(mib_data)
+
+        assert [n.name for n in fresh_tree.get_path_to_root("left")] == ["left", "mid", "root"]
+        assert set(fresh_tree._path_cache) == {"left", "mid", "root"}
+
+        assert [n.name for n in fresh_tree.get_path_to_root("right")] == ["right", "mid", "root"]
+        assert [n.name for n in fresh_tree.get_path_from_root("right")] == ["root", "mid", "right"]
+        assert fresh_tree.get_path_to_root("missing") == []
 
+        # Callers get their own list, the cached path stays intact
+        fresh_tree.get_path_to_root("left").clear()
+        assert len(fresh_tree.get_path_to_root("left")) == 3
+
+    def test_traverse_breadth_first(self, tree):
+        """Test breadth-first traversal."""
         nodes = list(tree.traverse_breadth_first())
 
         assert isinstance(nodes, list)